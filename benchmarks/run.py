@@ -0,0 +1,280 @@
+"""Benchmarks of the public methods of `RouterOS` against a simulated link.
+
+Every method runs against a `FakeRouter` that waits `--rtt` seconds per
+round trip, and is measured for wall time, Python CPU time, round trips
+and bytes transferred. Results are written as JSON and can be compared with
+a previous run to catch regressions:
+
+    python -m benchmarks.run --rtt 0.02 --output current.json
+    python -m benchmarks.run --baseline current.json
+
+The exit status is 1 when a method got slower than the tolerance allows or
+needs more round trips or bytes than in the baseline.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from netmikro import RouterOS
+from netmikro.transports import FakeRouter
+
+HOST = '192.0.2.1'
+USERNAME = 'netmikro'
+PASSWORD = 'nulliusinverba'
+
+# Measurements compared between runs, and whether they are timings (which
+# vary between runs) or counters (which must never grow)
+TIMINGS = ('wall', 'cpu')
+COUNTERS = ('round_trips', 'bytes_sent', 'bytes_received')
+
+
+class Case(NamedTuple):
+    """Method to be benchmarked.
+
+    Attributes:
+        name (str): Name of the case in the results.
+        run (Callable): Function that calls the method on a router.
+        setup (Callable): Function called before each run, out of the
+            measurement (e.g. to drop a lazy attribute).
+    """
+
+    name: str
+    run: Callable[[RouterOS], Any]
+    setup: Callable[[RouterOS], Any] | None = None
+
+
+def _connect(router: RouterOS) -> None:
+    RouterOS(
+        HOST, USERNAME, PASSWORD, transport=router._transport
+    ).disconnect()
+
+
+def _lazy(name: str) -> Case:
+    """Case of a lazy attribute, which is dropped before each run."""
+    return Case(
+        name,
+        lambda router: getattr(router, name),
+        lambda router: router.cache_clear(name),
+    )
+
+
+def _method(name: str, *args: Any, **kwargs: Any) -> Case:
+    return Case(name, lambda router: getattr(router, name)(*args, **kwargs))
+
+
+CASES = [
+    Case('__init__', _connect),
+    _lazy('identity'),
+    _lazy('routerboard'),
+    _lazy('license'),
+    _lazy('note'),
+    _lazy('resources'),
+    _lazy('service'),
+    _method('clock_time_get'),
+    _method('clock_date_get'),
+    _method('clock_time_zone_get'),
+    _method('clock_gmt_offset_get'),
+    _method('clock_dst_active_get'),
+    _method('clock_time_zone_autodetect_get'),
+    _method('health_voltage'),
+    _method('health_temperature'),
+    _method('health_sample', ['ether1', 'ether2']),
+    _method('history_system_get'),
+    _method('is_routerboard'),
+    _method('ntp_client_get'),
+    _method('ntp_server_get'),
+    _method('snapshot'),
+    _method('config'),
+    _method(
+        'apply_config',
+        {
+            '/system ntp client': {'enabled': True},
+            '/ip service': {'api': {'port': 8728}},
+        },
+    ),
+    _method('identity_set', 'Netmikro'),
+    _method('note_set', 'Benchmark', show_at_login=False),
+    _method('ntp_client_set', ['200.160.7.186', '201.49.148.135']),
+    _method('ip_port_set', 'api', 8728),
+    _method('cmd', '/system identity print'),
+    Case(
+        'cmd_multiline',
+        lambda router: router.cmd_multiline(
+            '/system identity print', '/system note print'
+        ),
+    ),
+    Case(
+        'cmd_pipeline',
+        lambda router: router.cmd_pipeline(
+            '/system identity print', '/system note print'
+        ),
+    ),
+]
+
+
+def run_suite(
+    rtt: float = 0.02,
+    jitter: float = 0.0,
+    repeat: int = 5,
+    cases: list[Case] | None = None,
+) -> dict[str, Any]:
+    """Runs the benchmarks and returns their results.
+
+    Args:
+        rtt (float): Seconds of each round trip to the simulated router.
+        jitter (float): Maximum random variation of `rtt`, in seconds.
+        repeat (int): Number of measured runs of each case, the median of
+            the timings is reported.
+        cases (list[Case]): Cases to be run, `CASES` by default.
+
+    Returns:
+        dict: Parameters of the run and the measurements of each case.
+    """
+    fake = FakeRouter(latency=rtt, jitter=jitter, connect_latency=rtt, seed=0)
+    router = RouterOS(HOST, USERNAME, PASSWORD, transport=fake)
+
+    results = {}
+    for case in cases or CASES:
+        walls, cpus = [], []
+        for _ in range(repeat):
+            if case.setup is not None:
+                case.setup(router)
+            fake.reset_stats()
+            wall, cpu = time.perf_counter(), time.process_time()
+            case.run(router)
+            walls.append(time.perf_counter() - wall)
+            cpus.append(time.process_time() - cpu)
+
+        results[case.name] = {
+            'wall': statistics.median(walls),
+            'cpu': statistics.median(cpus),
+            'round_trips': fake.round_trips,
+            'bytes_sent': fake.bytes_sent,
+            'bytes_received': fake.bytes_received,
+        }
+
+    router.disconnect()
+    return {
+        'created': datetime.now(UTC).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'rtt': rtt,
+        'jitter': jitter,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def compare(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    tolerance: float = 0.2,
+    min_delta: float = 0.001,
+) -> list[str]:
+    """Lists the regressions of a run in relation to a baseline.
+
+    Args:
+        current (dict): Results of `run_suite`.
+        baseline (dict): Results of a previous run.
+        tolerance (float): Fraction a timing may grow before it counts as a
+            regression.
+        min_delta (float): Seconds a timing may grow regardless of the
+            tolerance, to ignore the noise of very fast methods.
+
+    Returns:
+        list[str]: Description of each regression, empty if there is none.
+    """
+    # Timings of runs on links with a different latency can not be compared
+    timings = TIMINGS
+    if (current['rtt'], current['jitter']) != (
+        baseline['rtt'],
+        baseline['jitter'],
+    ):
+        timings = ()
+
+    regressions = []
+    for name, result in current['results'].items():
+        previous = baseline['results'].get(name)
+        if previous is None:
+            continue
+
+        for key in COUNTERS:
+            if result[key] > previous[key]:
+                regressions.append(
+                    f'{name}: {key} {previous[key]} -> {result[key]}'
+                )
+        for key in timings:
+            limit = max(
+                previous[key] * (1 + tolerance), previous[key] + min_delta
+            )
+            if result[key] > limit:
+                regressions.append(
+                    f'{name}: {key} {previous[key] * 1000:.2f}ms -> '
+                    f'{result[key] * 1000:.2f}ms'
+                )
+    return regressions
+
+
+def _report(results: dict[str, Any]) -> str:
+    """Formats the results as a table."""
+    lines = [
+        f'{"method":<32}{"wall ms":>10}{"cpu ms":>10}'
+        f'{"trips":>7}{"sent":>8}{"received":>10}'
+    ]
+    for name, result in results['results'].items():
+        lines.append(
+            f'{name:<32}{result["wall"] * 1000:>10.2f}'
+            f'{result["cpu"] * 1000:>10.2f}{result["round_trips"]:>7}'
+            f'{result["bytes_sent"]:>8}{result["bytes_received"]:>10}'
+        )
+    return '\n'.join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Runs the benchmarks from the command line.
+
+    Args:
+        argv (list[str]): Command line arguments, `sys.argv` by default.
+
+    Returns:
+        int: Exit status, 1 if there are regressions.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rtt', type=float, default=0.02)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', type=Path, help='write results as JSON')
+    parser.add_argument(
+        '--history', type=Path, help='append results as a JSON line'
+    )
+    parser.add_argument('--baseline', type=Path, help='results to compare')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.rtt, args.jitter, args.repeat)
+    print(_report(results), file=sys.stderr)
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2) + '\n')
+    if args.history is not None:
+        with args.history.open('a') as history:
+            history.write(json.dumps(results) + '\n')
+
+    if args.baseline is None:
+        return 0
+    baseline = json.loads(args.baseline.read_text())
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f'REGRESSION {regression}', file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
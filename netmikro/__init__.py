@@ -1 +1,9 @@
-from netmikro.routeros import RouterOS
+from netmikro.async_routeros import AsyncRouterOS
+from netmikro.dataset import FleetDataset
+from netmikro.facts import FactCache
+from netmikro.fleet import FleetResult, RouterFleet
+from netmikro.poller import HealthPoller
+from netmikro.routeros import CommandOutput, RouterOS
+from netmikro.shards import ShardedFleet
+from netmikro.transports import ConnectionPool
+from netmikro.utils import CommandEvent, MetricsCollector
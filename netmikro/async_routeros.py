@@ -0,0 +1,391 @@
+from collections.abc import Iterable
+from datetime import UTC, date, datetime, time
+from ipaddress import IPv4Address
+from typing import Any, List, TypeVar
+
+from netmikro.modules.base import (
+    BatchCommand,
+    batch_script,
+    batch_values,
+    join_groups,
+    make_record,
+    split_groups,
+)
+from netmikro.modules.ip import SERVICE_COMMANDS, IpService, service_records
+from netmikro.modules.system import (
+    CLOCK_COMMANDS,
+    HEALTH_COMMANDS,
+    LICENSE_COMMANDS,
+    NTP_CLIENT_COMMANDS,
+    NTP_SERVER_COMMANDS,
+    RESOURCES_COMMANDS,
+    ROUTERBOARD_COMMANDS,
+    SNAPSHOT_BOARD_COMMANDS,
+    SNAPSHOT_COMMANDS,
+    health_commands,
+    health_values,
+    ntp_client_command,
+    snapshot_record,
+)
+from netmikro.transports import (
+    DEFAULT_PORTS,
+    AsyncConnection,
+    AsyncTransport,
+    create_async_connection,
+)
+from netmikro.transports.api import API_PORT
+from netmikro.utils import boolean
+from netmikro.validators import (
+    Auth,
+    IfRouterboard,
+    License,
+    NTPClient,
+    NTPServer,
+    Port,
+    Resources,
+    Snapshot,
+)
+
+T = TypeVar('T')
+
+
+# noinspection PyUnresolvedReferences
+class AsyncRouterOS:  # noqa: PLR0904
+    """Asyncio client for a MikroTik router.
+
+    Every `System` and `Ip` method of `RouterOS` is available as a
+    coroutine, with the same commands and records. The router is reached
+    through an asyncio transport, by default the RouterOS API, whose
+    socket is read and written by the event loop itself: no thread is used,
+    so one loop can hold the sessions of thousands of routers. Calls to the
+    same router are sent one at a time.
+
+    The attributes loaded on first access by `RouterOS` (e.g. `identity`,
+    `service`) are coroutines that read the router on every call, and
+    nothing is cached.
+
+    Examples:
+        >>> from netmikro import AsyncRouterOS
+        >>> router = await AsyncRouterOS.connect(
+        ...     '192.168.3.3',
+        ...     'user',
+        ...     'password',
+        ... )
+        >>> await router.cmd('/system identity print')
+        'name: Netmikro'
+        >>> await router.identity()
+        'Netmikro'
+        >>> await router.disconnect()
+    """
+
+    def __init__(
+        self, connection: AsyncConnection, auth: Auth, trusted: bool = False
+    ):
+        """Asyncio client for an already open connection.
+
+        Args:
+            connection (AsyncConnection): Connection with the router.
+            auth (Auth): Credentials used to open the connection.
+            trusted (bool): Build the records read from the router without
+                validating them again where it is cheaper.
+        """
+        self._connection = connection
+        self._auth = auth
+        self._trusted = trusted
+        self._routerboard: bool | None = None
+
+    @classmethod
+    async def connect(  # noqa: PLR0913
+        cls,
+        host: str,
+        username: str,
+        password: str,
+        port: int | None = None,
+        *,
+        transport: AsyncTransport = 'api',
+        trusted: bool = False,
+    ) -> 'AsyncRouterOS':
+        """Creates the connection with a MikroTik router.
+
+        Args:
+            host (str): IP address of the router you want to connect to.
+            username (str): Username to be used in the connection.
+            password (str): Password to be used in the connection.
+            port (int): Port of the service, by default the port of the
+                chosen API service (8728 or 8729).
+            transport (AsyncTransport): How to talk to the router: 'api' or
+                'api-ssl' (RouterOS API), 'fake' (in-process simulator) or
+                a coroutine function that opens the connection (e.g.
+                `FakeRouter.connect_async`).
+            trusted (bool): Build the records read from the router without
+                validating them again where it is cheaper. Values given to
+                setters are always validated.
+
+        Returns:
+            AsyncRouterOS: Asyncio client for the router.
+        """
+        if port is None:
+            port = DEFAULT_PORTS.get(transport, API_PORT)
+        auth = Auth(
+            host=host,
+            username=username,
+            password=password,
+            port=Port(port=port).port,
+        )
+        connection = await create_async_connection(transport, auth)
+        return cls(connection, auth, trusted)
+
+    async def __aenter__(self) -> 'AsyncRouterOS':
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.disconnect()
+
+    def _record(self, model: type[T], /, **values: Any) -> T:
+        """Builds a record with values read from the router, see `make_record`."""
+        return make_record(model, self._trusted, **values)
+
+    async def _get(self, command: str) -> str:
+        """Returns the output of a command as a string."""
+        output = await self._connection.send_command(f'return [{command}]')
+        return output.strip()
+
+    async def _get_value(self, command: BatchCommand) -> Any:
+        """Returns the output of a command in the format of `_get_batch`."""
+        if isinstance(command, str):
+            return await self._get(command)
+        command, convert = command
+        return convert(await self._get(command))
+
+    async def _get_batch(
+        self, commands: dict[str, BatchCommand]
+    ) -> dict[str, Any]:
+        """Reads many values in a single round trip, see `Base._get_batch`."""
+        if not commands:
+            return {}
+        output = await self._connection.send_command(batch_script(commands))
+        return batch_values(commands, output)
+
+    async def _get_batch_groups(
+        self, groups: dict[str, dict[str, BatchCommand]]
+    ) -> dict[str, dict[str, Any]]:
+        """Reads many groups of values at once, see `Base._get_batch_groups`."""
+        values = await self._get_batch(join_groups(groups))
+        return split_groups(groups, values)
+
+    async def disconnect(self) -> None:
+        """Disconnects the connection with the router.
+
+        Examples:
+            >>> await router.disconnect()
+        """
+        await self._connection.disconnect()
+
+    async def cmd(self, command: str) -> str:
+        """Runs a command in the router's terminal.
+
+        Args:
+            command (str): Command to be executed.
+
+        Returns:
+            str: Output of the command
+
+        Examples:
+            >>> await router.cmd('/system identity print')
+            'name: Netmikro'
+        """
+        return await self._connection.send_command(command)
+
+    async def cmd_multiline(self, *args: str) -> str:
+        """Runs multiple commands in the router's terminal.
+
+        Args:
+            *args (str): List of commands to be executed.
+
+        Returns:
+            str: Output of the commands.
+        """
+        return await self._connection.send_multiline(list(args))
+
+    async def identity(self) -> str:
+        """Returns the name of the router."""
+        return await self._get('/system identity get name')
+
+    async def note(self) -> str:
+        """Returns the notes about the router."""
+        return await self._get('/system note get note')
+
+    async def resources(self) -> Resources:
+        """Returns the hardware information of the router."""
+        return self._record(
+            Resources, **await self._get_batch(RESOURCES_COMMANDS)
+        )
+
+    async def routerboard(self) -> IfRouterboard | None:
+        """Returns the RouterBoard information.
+
+        Returns:
+            IfRouterboard | None: Board information, or None if the router is not a RouterBoard.
+        """
+        if not await self.is_routerboard():
+            return None
+        return self._record(
+            IfRouterboard, **await self._get_batch(ROUTERBOARD_COMMANDS)
+        )
+
+    async def license(self) -> License | None:
+        """Returns the license information.
+
+        Returns:
+            License | None: License information, or None if the router is not a RouterBoard.
+        """
+        if not await self.is_routerboard():
+            return None
+        return self._record(License, **await self._get_batch(LICENSE_COMMANDS))
+
+    async def is_routerboard(self) -> bool:
+        """Returns True if the router is a RouterBoard, if not, returns False.
+
+        The answer is kept, it does not change while the router runs.
+        """
+        if self._routerboard is None:
+            self._routerboard = bool(
+                await self._get_value((
+                    '/system routerboard get routerboard',
+                    boolean,
+                ))
+            )
+        return self._routerboard
+
+    async def clock_time_get(self) -> time:
+        """Returns the router's system time."""
+        return await self._get_value(CLOCK_COMMANDS['time'])
+
+    async def clock_date_get(self) -> date:
+        """Returns the router's system date."""
+        return await self._get_value(CLOCK_COMMANDS['date'])
+
+    async def clock_time_zone_get(self) -> str:
+        """Returns the router's time zone."""
+        return await self._get_value(CLOCK_COMMANDS['time_zone'])
+
+    async def clock_gmt_offset_get(self) -> str:
+        """Returns the router's GMT offset."""
+        return await self._get_value(CLOCK_COMMANDS['gmt_offset'])
+
+    async def clock_dst_active_get(self) -> bool:
+        """Returns True if DST is enabled, if not enabled, returns False."""
+        return await self._get_value(CLOCK_COMMANDS['dst_active'])
+
+    async def clock_time_zone_autodetect_get(self) -> bool:
+        """Returns True if time-zone-autodetect is enabled, if not, returns False."""
+        return await self._get_value(CLOCK_COMMANDS['time_zone_autodetect'])
+
+    async def health_voltage(self) -> float:
+        """Returns the current voltage at the router, in Volts."""
+        return await self._get_value(HEALTH_COMMANDS['voltage'])
+
+    async def health_temperature(self) -> float:
+        """Returns the current temperature at the router, in Celsius."""
+        return await self._get_value(HEALTH_COMMANDS['temperature'])
+
+    async def health_sample(
+        self, interfaces: Iterable[str] = ()
+    ) -> dict[str, float]:
+        """Reads the load, health and traffic counters in a single round trip.
+
+        Args:
+            interfaces (Iterable[str]): Names of the interfaces whose traffic
+                counters are read.
+
+        Returns:
+            dict: Sample in the format of `System.health_sample`.
+        """
+        commands = health_commands(interfaces, await self.is_routerboard())
+        return health_values(await self._get_batch(commands))
+
+    async def history_system_get(self) -> str:
+        """Returns the history of changes made to the router's system settings."""
+        return await self.cmd('/system history print')
+
+    async def identity_set(self, new_identity: str) -> None:
+        """Sets the router's identity.
+
+        Args:
+            new_identity (str): New identity to be set.
+        """
+        new_identity = new_identity.strip()
+        await self.cmd(f'/system identity set name={new_identity}')
+
+    async def note_set(self, note: str, show_at_login: bool = False) -> None:
+        """Sets the router's note.
+
+        Args:
+            note (str): New note to be set.
+            show_at_login (bool): Tells whether the user should see the note when logging in.
+        """
+        show_at_login_command = 'yes' if show_at_login else 'no'
+        await self.cmd(
+            f'/system note set note="{note}" show-at-login={show_at_login_command}'
+        )
+
+    async def ntp_client_get(self) -> NTPClient:
+        """Returns the NTP client configuration."""
+        return self._record(
+            NTPClient, **await self._get_batch(NTP_CLIENT_COMMANDS)
+        )
+
+    async def ntp_client_set(
+        self,
+        servers: List[IPv4Address],
+        enabled: bool = True,
+        mode: str = 'unicast',
+        vrf: str = 'main',
+    ) -> None:
+        """Sets the NTP client configuration.
+
+        Args:
+            servers (list): List of NTP servers.
+            enabled (bool): Specifies whether the NTP client should be enabled.
+            mode (str): Specifies the NTP client mode.
+            vrf (str): Specifies the VRF to be used by the NTP client.
+        """
+        await self.cmd(ntp_client_command(servers, enabled, mode, vrf))
+
+    async def ntp_server_get(self) -> NTPServer:
+        """Returns the NTP server configuration."""
+        return self._record(
+            NTPServer, **await self._get_batch(NTP_SERVER_COMMANDS)
+        )
+
+    async def snapshot(self) -> Snapshot:
+        """Returns everything known about the router in a single record.
+
+        Reads the same values as `System.snapshot`, in one round trip, or
+        two on RouterBoards.
+        """
+        collected_at = datetime.now(UTC)
+        values = await self._get_batch_groups(SNAPSHOT_COMMANDS)
+        self._routerboard = bool(values['system']['routerboard'])
+        board = None
+        if self._routerboard:
+            board = await self._get_batch_groups(SNAPSHOT_BOARD_COMMANDS)
+        return snapshot_record(
+            self._record, str(self._auth.host), collected_at, values, board
+        )
+
+    async def service(self) -> dict[str, IpService]:
+        """Returns the services available on the router, in one round trip."""
+        return service_records(
+            self._record, await self._get_batch(SERVICE_COMMANDS)
+        )
+
+    async def ip_port_set(self, service_name: str, port: int) -> None:
+        """Set the port number of a service.
+
+        Args:
+            service_name: The service to be changed.
+            port: The new port number.
+        """
+        port = Port(port=port).port
+        await self.cmd(f'/ip service set {service_name} port={port}')
@@ -0,0 +1,348 @@
+import math
+import operator
+from array import array
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from itertools import compress, repeat
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel
+
+from netmikro.utils import Aggregate, percentile, summarize
+from netmikro.validators import Snapshot
+
+if TYPE_CHECKING:
+    # `RouterFleet.dataset()` builds datasets, so it is only a type here
+    from netmikro.fleet import FleetResult
+
+Column = array | list[str | None]
+
+_OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+
+def _flatten(record: BaseModel | dict, prefix: str = '') -> dict[str, Any]:
+    """Flattens nested records into `'group.name'` keys."""
+    if isinstance(record, BaseModel):
+        record = record.model_dump(mode='json')
+    values = {}
+    for name, value in record.items():
+        if isinstance(value, dict):
+            values.update(_flatten(value, f'{prefix}{name}.'))
+        elif isinstance(value, list):
+            values[f'{prefix}{name}'] = ','.join(str(item) for item in value)
+        else:
+            values[f'{prefix}{name}'] = value
+    return values
+
+
+def _text(value: float) -> str | None:
+    """Converts a value of a numeric column to the text of a text column."""
+    if math.isnan(value):
+        return None
+    return str(int(value)) if value.is_integer() else str(value)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, int | float)
+
+
+def _present(value: Any) -> Any:
+    """Returns None for NaN, so missing numbers are counted as one value."""
+    # NaN is the only value not equal to itself
+    return None if value != value else value  # noqa: PLR0124
+
+
+class FleetDataset:
+    """Columnar table of data collected from many routers.
+
+    Each field is stored once for the whole fleet: numbers (and booleans,
+    as 0 or 1) in an `array` of doubles, with NaN for missing values, and
+    text in a list. Queries run over whole columns instead of looping over
+    the records of each router, which keeps them fast for fleets of
+    hundreds of thousands of routers without extra dependencies.
+
+    Nested records are flattened, so the columns of a `Snapshot` are named
+    like 'resources.version' or 'ntp_client.system_offset'.
+
+    Args:
+        rows (Iterable[dict | BaseModel]): Records of each router, with a
+            'host' field.
+
+    Examples:
+        >>> dataset = fleet.dataset()
+        >>> dataset.where('ntp_client.system_offset', '>', 50).hosts
+        ['192.168.3.7']
+        >>> dataset.count_by('resources.version')
+        {'7.12 (stable)': 1840, '7.11.2 (stable)': 160}
+        >>> dataset.percentile('resources.memory', 5)
+        67108864.0
+    """
+
+    def __init__(self, rows: Iterable[dict[str, Any] | BaseModel] = ()):
+        rows = [_flatten(row) for row in rows]
+        names = {name: None for row in rows for name in row}
+        self.columns: dict[str, Column] = {}
+        for name in names:
+            values = [row.get(name) for row in rows]
+            present = [value for value in values if value is not None]
+            if present and all(_is_number(value) for value in present):
+                self.columns[name] = array(
+                    'd',
+                    (math.nan if value is None else value for value in values),
+                )
+            else:
+                self.columns[name] = [
+                    None if value is None else str(value) for value in values
+                ]
+
+    @classmethod
+    def _from_columns(cls, columns: dict[str, Column]) -> 'FleetDataset':
+        dataset = cls()
+        dataset.columns = columns
+        return dataset
+
+    @classmethod
+    def concat(cls, datasets: Iterable['FleetDataset']) -> 'FleetDataset':
+        """Joins the rows of many datasets, e.g. of the shards of a fleet.
+
+        Columns missing from a dataset are filled with missing values, and
+        columns that are numeric in some datasets and text in others become
+        text.
+
+        Args:
+            datasets (Iterable[FleetDataset]): Datasets to be joined.
+
+        Returns:
+            FleetDataset: Rows of all datasets, in the given order.
+        """
+        datasets = list(datasets)
+        names = {
+            name: None for dataset in datasets for name in dataset.columns
+        }
+        columns = {}
+        for name in names:
+            parts = [
+                (len(dataset), dataset.columns.get(name))
+                for dataset in datasets
+            ]
+            if all(
+                column is None or isinstance(column, array)
+                for _, column in parts
+            ):
+                merged = array('d')
+                for size, column in parts:
+                    merged.extend(
+                        repeat(math.nan, size) if column is None else column
+                    )
+            else:
+                merged = []
+                for size, column in parts:
+                    if column is None:
+                        merged.extend(repeat(None, size))
+                    elif isinstance(column, array):
+                        merged.extend(map(_text, column))
+                    else:
+                        merged.extend(column)
+            columns[name] = merged
+        return cls._from_columns(columns)
+
+    @classmethod
+    def from_snapshots(cls, snapshots: Iterable[Snapshot]) -> 'FleetDataset':
+        """Builds the dataset from the snapshots of the routers.
+
+        Args:
+            snapshots (Iterable[Snapshot]): Snapshots of the routers.
+
+        Returns:
+            FleetDataset: One row per snapshot.
+        """
+        return cls(snapshots)
+
+    @classmethod
+    def from_results(cls, results: Iterable['FleetResult']) -> 'FleetDataset':
+        """Builds the dataset from the results of a fleet operation.
+
+        Results with errors are left out. Rows have the 'host', 'port' and
+        'username' of their router, which tell apart routers behind the
+        same address.
+
+        Args:
+            results (Iterable[FleetResult]): Results whose values are records
+                (e.g. of `fleet.run('ntp_client_get')`) or dicts.
+
+        Returns:
+            FleetDataset: One row per router that succeeded.
+
+        Examples:
+            >>> FleetDataset.from_results(fleet.run('ntp_client_get'))
+        """
+        rows = []
+        for result in results:
+            if not result.ok:
+                continue
+            host, port, username = result.key
+            row = {'host': host, 'port': port, 'username': username}
+            for name, value in _flatten(result.value).items():
+                row.setdefault(name, value)
+            rows.append(row)
+        return cls(rows)
+
+    def __len__(self) -> int:
+        return len(self.columns.get('host', ()))
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        """Yields each row as a dict, NaN numbers are returned as None."""
+        for index in range(len(self)):
+            yield {
+                name: (
+                    None
+                    if isinstance(values[index], float)
+                    and math.isnan(values[index])
+                    else values[index]
+                )
+                for name, values in self.columns.items()
+            }
+
+    @property
+    def hosts(self) -> list[str]:
+        """Hosts of the routers in the dataset."""
+        return list(self.columns.get('host', []))
+
+    def column(self, name: str) -> Column:
+        """Returns the values of a column.
+
+        Args:
+            name (str): Name of the column (e.g. 'resources.memory').
+
+        Returns:
+            array | list: `array` of doubles for numbers, list for text.
+        """
+        return self.columns[name]
+
+    def mask(self, name: str, op: str, value: Any) -> list[bool]:
+        """Compares every value of a column with a value.
+
+        Args:
+            name (str): Name of the column.
+            op (str): One of '<', '<=', '>', '>=', '==' and '!='.
+            value (Any): Value compared with the column.
+
+        Returns:
+            list[bool]: Result of the comparison of each row, False for
+                missing values.
+        """
+        column = self.columns[name]
+        compare = _OPERATORS[op]
+        if isinstance(column, array):
+            # NaN compares as False for everything but `!=`
+            result = list(map(compare, column, repeat(value)))
+            if op == '!=':
+                present = map(operator.eq, column, column)
+                result = list(map(operator.and_, result, present))
+            return result
+        return [item is not None and compare(item, value) for item in column]
+
+    def filter(self, mask: Iterable[bool]) -> 'FleetDataset':
+        """Returns the rows selected by a mask.
+
+        Args:
+            mask (Iterable[bool]): Whether each row is kept, e.g. from
+                `mask()`.
+
+        Returns:
+            FleetDataset: Selected rows.
+        """
+        mask = list(mask)
+        return self._from_columns({
+            name: (
+                array('d', compress(values, mask))
+                if isinstance(values, array)
+                else list(compress(values, mask))
+            )
+            for name, values in self.columns.items()
+        })
+
+    def where(self, name: str, op: str, value: Any) -> 'FleetDataset':
+        """Returns the rows whose column compares true with a value.
+
+        Args:
+            name (str): Name of the column.
+            op (str): One of '<', '<=', '>', '>=', '==' and '!='.
+            value (Any): Value compared with the column.
+
+        Returns:
+            FleetDataset: Selected rows.
+
+        Examples:
+            >>> dataset.where('ntp_client.status', '!=', 'synchronized')
+        """
+        return self.filter(self.mask(name, op, value))
+
+    def count_by(self, name: str) -> dict[Any, int]:
+        """Counts the rows of each value of a column.
+
+        Args:
+            name (str): Name of the column (e.g. 'resources.version').
+
+        Returns:
+            dict: Number of rows of each value, the most common first, with
+                the missing values counted as None.
+        """
+        return dict(Counter(map(_present, self.columns[name])).most_common())
+
+    def group_by(self, name: str) -> dict[Any, 'FleetDataset']:
+        """Splits the rows by the values of a column.
+
+        Args:
+            name (str): Name of the column.
+
+        Returns:
+            dict: Rows of each value of the column, the rows with missing
+                values under None.
+        """
+        column = list(map(_present, self.columns[name]))
+        return {
+            value: self.filter(map(operator.eq, column, repeat(value)))
+            for value in dict.fromkeys(column)
+        }
+
+    def _numbers(self, name: str) -> list[float]:
+        """Returns the sorted values of a numeric column, without NaN."""
+        column = self.columns[name]
+        if not isinstance(column, array):
+            raise TypeError(f'Column {name} is not numeric')
+        # NaN is the only value not equal to itself
+        return sorted(compress(column, map(operator.eq, column, column)))
+
+    def percentile(self, name: str, q: float) -> float | None:
+        """Returns a percentile of a numeric column (nearest rank).
+
+        Args:
+            name (str): Name of the column.
+            q (float): Percentile, from 0 to 100.
+
+        Returns:
+            float | None: Value of the percentile, None if there are no
+                values.
+        """
+        values = self._numbers(name)
+        return percentile(values, q) if values else None
+
+    def describe(self, name: str) -> Aggregate | None:
+        """Summarizes a numeric column.
+
+        Args:
+            name (str): Name of the column.
+
+        Returns:
+            Aggregate | None: Count, min, max, mean and p95 of the values,
+                None if there are none.
+        """
+        return summarize(self._numbers(name))
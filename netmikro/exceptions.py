@@ -8,3 +8,23 @@ class InvalidNtpMode(Exception):  # noqa: D101
 
 class UndefinedBooleanValue(Exception):  # noqa: D101
     pass
+
+
+class InvalidBatchOutput(Exception):  # noqa: D101
+    pass
+
+
+class InvalidTransport(Exception):  # noqa: D101
+    pass
+
+
+class ApiError(Exception):  # noqa: D101
+    pass
+
+
+class ConfigError(Exception):  # noqa: D101
+    pass
+
+
+class WorkerError(Exception):  # noqa: D101
+    pass
@@ -0,0 +1,190 @@
+import json
+import sqlite3
+import time
+from pathlib import Path
+from threading import Lock
+from typing import NamedTuple
+
+from pydantic import BaseModel
+
+from netmikro.validators import IfRouterboard, License, Resources
+
+# Records kept by the cache, by the name of their lazy attribute
+FACT_MODELS: dict[str, type[BaseModel]] = {
+    'resources': Resources,
+    'routerboard': IfRouterboard,
+    'license': License,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS facts (
+    host TEXT NOT NULL,
+    port INTEGER NOT NULL,
+    version TEXT NOT NULL,
+    board_name TEXT NOT NULL,
+    boot_time REAL NOT NULL,
+    records TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    PRIMARY KEY (host, port)
+)
+"""
+
+
+class Fingerprint(NamedTuple):
+    """Values that change when the static facts of a router may change.
+
+    Attributes:
+        version (str): RouterOS version, changed by upgrades.
+        board_name (str): Model of the board, changed by a replacement.
+        boot_time (float): Unix time the router was booted, computed from
+            its uptime, so it changes after every reboot.
+    """
+
+    version: str
+    board_name: str
+    boot_time: float
+
+    @classmethod
+    def from_uptime(
+        cls, version: str, board_name: str, uptime: float
+    ) -> 'Fingerprint':
+        """Builds the fingerprint of values just read from the router.
+
+        Args:
+            version (str): RouterOS version.
+            board_name (str): Model of the board.
+            uptime (float): Seconds since the router was booted.
+
+        Returns:
+            Fingerprint: Fingerprint with the boot time seen from here.
+        """
+        return cls(version, board_name, time.time() - uptime)
+
+
+class FactCache:
+    """Persistent store of the records of routers that rarely change.
+
+    The `resources`, `routerboard` and `license` of each router are kept in
+    a SQLite database with the `Fingerprint` they were read with. A router
+    connected again reads only its fingerprint, in a single command, and
+    its records are taken from the cache while the fingerprint matches, so
+    restarting a collector does not read them again from every router.
+
+    The cache can be shared by many routers and threads, e.g. by all
+    routers of a `RouterFleet`. Routers are told apart by host and port, so
+    routers behind the same address (e.g. a NAT with one port per router)
+    keep their own records.
+
+    Args:
+        path (str | Path): Database file, created if missing. In memory by
+            default, which only lasts while the process runs.
+        boot_tolerance (float): Seconds the boot time may differ between
+            two reads, which absorbs the latency and the rounding of the
+            uptime to seconds.
+
+    Examples:
+        >>> facts = FactCache('facts.db')
+        >>> router = RouterOS('192.168.3.3', 'user', 'password', facts=facts)
+        >>> router.routerboard.serial_number  # read from the cache
+        'HE108GV1S3D'
+    """
+
+    def __init__(
+        self, path: str | Path = ':memory:', boot_tolerance: float = 30.0
+    ):
+        self._boot_tolerance = boot_tolerance
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = Lock()
+        with self._lock, self._db:
+            columns = {
+                row[1] for row in self._db.execute('PRAGMA table_info(facts)')
+            }
+            if columns and 'port' not in columns:
+                # Keyed by host only in older versions, it is read again
+                self._db.execute('DROP TABLE facts')
+            self._db.execute(_SCHEMA)
+
+    def get(
+        self, host: str, port: int, fingerprint: Fingerprint
+    ) -> dict[str, BaseModel | None] | None:
+        """Returns the records of a router, if its fingerprint still matches.
+
+        Args:
+            host (str): Host of the router.
+            port (int): Port the router is reached on.
+            fingerprint (Fingerprint): Fingerprint just read from the router.
+
+        Returns:
+            dict | None: Records by attribute name, None if there are none
+                or they are outdated.
+        """
+        with self._lock:
+            row = self._db.execute(
+                'SELECT version, board_name, boot_time, records '
+                'FROM facts WHERE host = ? AND port = ?',
+                (host, port),
+            ).fetchone()
+        if row is None:
+            return None
+
+        version, board_name, boot_time, records = row
+        if (version, board_name) != fingerprint[:2] or abs(
+            boot_time - fingerprint.boot_time
+        ) > self._boot_tolerance:
+            return None
+        return {
+            name: None
+            if values is None
+            else FACT_MODELS[name].model_validate(values)
+            for name, values in json.loads(records).items()
+        }
+
+    def set(
+        self,
+        host: str,
+        port: int,
+        fingerprint: Fingerprint,
+        records: dict[str, BaseModel | None],
+    ) -> None:
+        """Stores the records of a router with their fingerprint.
+
+        Args:
+            host (str): Host of the router.
+            port (int): Port the router is reached on.
+            fingerprint (Fingerprint): Fingerprint read with the records.
+            records (dict): Records by attribute name, None for the records
+                a router does not have (e.g. `routerboard` of a CHR).
+        """
+        data = json.dumps({
+            name: None if record is None else record.model_dump(mode='json')
+            for name, record in records.items()
+        })
+        with self._lock, self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO facts VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (host, port, *fingerprint, data, time.time()),
+            )
+
+    def invalidate(self, *hosts: str) -> None:
+        """Drops the records of some hosts, or of all if none given.
+
+        Args:
+            *hosts (str): Hosts of the routers, with all their ports.
+        """
+        with self._lock, self._db:
+            if not hosts:
+                self._db.execute('DELETE FROM facts')
+            else:
+                self._db.executemany(
+                    'DELETE FROM facts WHERE host = ?',
+                    [(host,) for host in hosts],
+                )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM facts').fetchone()[0]
+
+    def close(self) -> None:
+        """Closes the database."""
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,307 @@
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+from netmikro.dataset import FleetDataset
+from netmikro.routeros import RouterOS
+from netmikro.transports import DEFAULT_PORTS
+
+Operation = str | Callable[..., Any]
+# Identifies a router of the inventory: host, port and username
+DeviceKey = tuple[str, int, str]
+
+
+def device_key(device: dict) -> DeviceKey:
+    """Returns the host, port and username a device is reached with.
+
+    Two devices behind the same address (e.g. a NAT with one port per
+    router), or the same router reached by different users, are different
+    entries of the fleet.
+
+    Args:
+        device (dict): Arguments used to create the `RouterOS`.
+
+    Returns:
+        tuple: Host, port of the chosen transport and username.
+    """
+    transport = device.get('transport', 'ssh')
+    port = device.get('ssh_port', 22)
+    if transport != 'ssh':
+        port = device.get('api_port') or DEFAULT_PORTS.get(transport, port)
+    return str(device['host']), port, device['username']
+
+
+@dataclass
+class FleetResult:
+    """Result of an operation executed on one router of the fleet.
+
+    Attributes:
+        host (str): Host of the router the operation was executed on.
+        value (Any): Value returned by the operation.
+        error (Exception): Exception raised by the operation, if any.
+        port (int): Port the router was reached on.
+        username (str): User the router was reached with.
+    """
+
+    host: str
+    value: Any = None
+    error: Exception | None = None
+    port: int | None = None
+    username: str | None = None
+
+    @property
+    def key(self) -> DeviceKey:
+        """Host, port and username of the router, see `device_key`."""
+        return self.host, self.port, self.username
+
+    @property
+    def ok(self) -> bool:
+        """True if the operation was executed without errors."""
+        return self.error is None
+
+
+class RouterFleet:
+    """Runs the same operation on many MikroTik routers concurrently.
+
+    Each router gets its own `RouterOS` connection, opened the first time an
+    operation needs it and kept open until `disconnect()` is called.
+
+    Args:
+        inventory (Iterable[dict]): Arguments used to create the `RouterOS`
+            of each router (host, username, password, ssh_port, delay).
+        max_workers (int): Maximum number of routers handled at the same time.
+
+    Examples:
+        >>> from netmikro import RouterFleet
+        >>> fleet = RouterFleet([
+        ...     {'host': '192.168.3.3', 'username': 'user', 'password': 'pass'},
+        ...     {'host': '192.168.3.4', 'username': 'user', 'password': 'pass'},
+        ... ])
+        >>> for result in fleet.run('clock_time_zone_get'):
+        ...     print(result.host, result.value, result.error)
+        192.168.3.4 America/Cuiaba None
+        192.168.3.3 America/Cuiaba None
+    """
+
+    def __init__(self, inventory: Iterable[dict], max_workers: int = 32):
+        self._inventory = [dict(device) for device in inventory]
+        self._max_workers = max_workers
+        self._routers: dict[DeviceKey, RouterOS] = {}
+        self._lock = Lock()
+        self._connecting: dict[DeviceKey, Lock] = {}
+
+    def __enter__(self) -> 'RouterFleet':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.disconnect()
+
+    @property
+    def hosts(self) -> list[str]:
+        """Hosts of all routers in the inventory."""
+        return [device['host'] for device in self._inventory]
+
+    @property
+    def keys(self) -> list[DeviceKey]:
+        """Host, port and username of all routers, see `device_key`."""
+        return [device_key(device) for device in self._inventory]
+
+    def _connect(self, device: dict) -> RouterOS:
+        """Returns the open connection with a router, creating it if needed.
+
+        Args:
+            device (dict): Arguments used to create the `RouterOS`.
+
+        Returns:
+            RouterOS: Connection with the router.
+        """
+        key = device_key(device)
+        with self._lock:
+            device_lock = self._connecting.setdefault(key, Lock())
+        with device_lock:
+            if key not in self._routers:
+                self._routers[key] = RouterOS(**device)
+            return self._routers[key]
+
+    def _execute(
+        self, device: dict, operation: Operation, args: tuple, kwargs: dict
+    ) -> FleetResult:
+        """Executes an operation on a single router.
+
+        Args:
+            device (dict): Arguments used to create the `RouterOS`.
+            operation (str | Callable): Name of a `RouterOS` method, or a
+                function that receives the `RouterOS` as first argument.
+            args (tuple): Positional arguments of the operation.
+            kwargs (dict): Keyword arguments of the operation.
+
+        Returns:
+            FleetResult: Value returned or exception raised by the operation.
+        """
+        host, port, username = device_key(device)
+        try:
+            router = self._connect(device)
+            if isinstance(operation, str):
+                value = getattr(router, operation)(*args, **kwargs)
+            else:
+                value = operation(router, *args, **kwargs)
+        except Exception as error:
+            return FleetResult(host, error=error, port=port, username=username)
+        return FleetResult(host, value, port=port, username=username)
+
+    def run(
+        self, operation: Operation, *args, **kwargs
+    ) -> Iterator[FleetResult]:
+        """Runs an operation on every router of the fleet.
+
+        Results are yielded as soon as each router finishes, so the order
+        is not the same as the inventory. An error on one router does not
+        stop the others, it is returned in its `FleetResult`.
+
+        Args:
+            operation (str | Callable): Name of a `RouterOS` method, or a
+                function that receives the `RouterOS` as first argument.
+            *args: Positional arguments of the operation.
+            **kwargs: Keyword arguments of the operation.
+
+        Yields:
+            FleetResult: Result of the operation on each router.
+
+        Examples:
+            >>> for result in fleet.run(
+            ...     'ntp_client_set', servers=['200.160.7.186']
+            ... ):
+            ...     if not result.ok:
+            ...         print(result.host, result.error)
+        """
+        executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        try:
+            futures = [
+                executor.submit(self._execute, device, operation, args, kwargs)
+                for device in self._inventory
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def cmd(self, command: str) -> Iterator[FleetResult]:
+        """Runs a command in the terminal of every router of the fleet.
+
+        Args:
+            command (str): Command to be executed.
+
+        Yields:
+            FleetResult: Output of the command on each router.
+        """
+        return self.run('cmd', command)
+
+    def apply_config(
+        self, desired: dict[str, dict[str, Any]]
+    ) -> Iterator[FleetResult]:
+        """Brings every router of the fleet to the same desired state.
+
+        Routers that are already in the desired state receive no changes.
+
+        Args:
+            desired (dict): Desired state of each menu by path, see
+                `RouterOS.apply_config`.
+
+        Yields:
+            FleetResult: Commands run on each router.
+        """
+        return self.run('apply_config', desired)
+
+    def snapshots(self) -> Iterator[FleetResult]:
+        """Collects the `Snapshot` of every router of the fleet.
+
+        Yields:
+            FleetResult: Snapshot of each router.
+        """
+        return self.run('snapshot')
+
+    def dataset(self) -> FleetDataset:
+        """Collects the snapshots of the fleet as a columnar dataset.
+
+        Routers whose snapshot failed are left out of the dataset.
+
+        Returns:
+            FleetDataset: One row per router.
+        """
+        return FleetDataset.from_results(self.snapshots())
+
+    def write_snapshots(
+        self, path: str | Path, file_format: str | None = None
+    ) -> list[FleetResult]:
+        """Collects the snapshots of the fleet and writes them to a file.
+
+        With NDJSON (one JSON record per line) each snapshot is written as
+        soon as its router finishes, so the memory used does not grow with
+        the size of the fleet. Parquet requires `pyarrow` and keeps the
+        records in memory until all routers finish.
+
+        Args:
+            path (str | Path): File to be written.
+            file_format (str): 'ndjson' or 'parquet', by default 'parquet'
+                if the file name ends with '.parquet', otherwise 'ndjson'.
+
+        Returns:
+            list[FleetResult]: Routers whose snapshot failed, with the
+                error of each one.
+
+        Raises:
+            ImportError: If Parquet is requested and `pyarrow` is missing.
+            ValueError: If the format is not supported.
+
+        Examples:
+            >>> failed = fleet.write_snapshots('inventory.ndjson')
+            >>> [(result.host, result.error) for result in failed]
+            [('192.168.3.4', NetmikoTimeoutException(...))]
+        """
+        path = Path(path)
+        if file_format is None:
+            file_format = 'parquet' if path.suffix == '.parquet' else 'ndjson'
+
+        if file_format == 'ndjson':
+            return self._write_ndjson(path)
+        if file_format == 'parquet':
+            return self._write_parquet(path)
+        raise ValueError(f'Unsupported format: {file_format}')
+
+    def _write_ndjson(self, path: Path) -> list[FleetResult]:
+        failed = []
+        with path.open('w', encoding='utf-8') as file:
+            for result in self.snapshots():
+                if result.ok:
+                    file.write(result.value.model_dump_json() + '\n')
+                else:
+                    failed.append(result)
+        return failed
+
+    def _write_parquet(self, path: Path) -> list[FleetResult]:
+        try:
+            import pyarrow as pa  # noqa: PLC0415
+            import pyarrow.parquet as pq  # noqa: PLC0415
+        except ImportError as error:
+            raise ImportError(
+                'Writing Parquet files requires pyarrow (pip install pyarrow)'
+            ) from error
+
+        records, failed = [], []
+        for result in self.snapshots():
+            if result.ok:
+                records.append(result.value.model_dump(mode='json'))
+            else:
+                failed.append(result)
+        pq.write_table(pa.Table.from_pylist(records), path)
+        return failed
+
+    def disconnect(self) -> None:
+        """Disconnects all routers of the fleet."""
+        with self._lock:
+            routers, self._routers = self._routers, {}
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            executor.map(RouterOS.disconnect, routers.values())
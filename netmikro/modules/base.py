@@ -1,49 +1,524 @@
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
 from ipaddress import IPv4Address
+from threading import BoundedSemaphore, RLock
+from typing import TYPE_CHECKING, Any, TypeVar
 
-from netmiko.mikrotik.mikrotik_ssh import MikrotikRouterOsSSH
+from netmiko.exceptions import ReadTimeout
+from pydantic import BaseModel
 
+from netmikro.exceptions import InvalidBatchOutput
+from netmikro.transports import (
+    DEFAULT_PORTS,
+    Connection,
+    ConnectionPool,
+    Transport,
+    create_connection,
+)
+from netmikro.utils import (
+    AdaptiveTiming,
+    ChannelMeter,
+    CommandEvent,
+    Generations,
+    Hook,
+    SingleFlight,
+    TTLCache,
+    decimal,
+    ip_list,
+    measure,
+    number,
+)
 from netmikro.validators import Auth, Port
 
+if TYPE_CHECKING:
+    from netmikro.facts import FactCache
+
+# Token placed between the values of a batched read, it is built by
+# concatenation on the router so it never appears in the echoed command
+BATCH_SEPARATOR = '<netmikro>'
+_BATCH_SEPARATOR_EXPRESSION = '"<net" . "mikro>"'
+
+BatchCommand = str | tuple[str, Callable[[str], Any]]
+# Seconds a thread waits for the connection held by another one, e.g. by a
+# stream its caller is still reading
+LOCK_TIMEOUT = 300.0
+T = TypeVar('T')
+
+
+def make_record(model: type[T], trusted: bool, /, **values: Any) -> T:
+    """Builds a record with values read and converted from the router.
+
+    In trusted mode pydantic dataclasses (e.g. `IpService`) are filled
+    directly, skipping their validation: the values already have their
+    types, given by the converters of `batch_values`. Pydantic models are
+    always validated, their compiled validator is faster than
+    `model_construct`.
+
+    Args:
+        model (type): Pydantic model or dataclass of the record.
+        trusted (bool): Skip the validation where it is cheaper.
+        **values: Fields of the record.
+
+    Returns:
+        Record with the values.
+    """
+    if not trusted or issubclass(model, BaseModel):
+        return model(**values)
+    record = object.__new__(model)
+    record.__dict__.update(values)
+    return record
+
+
+def batch_script(commands: dict[str, BatchCommand]) -> str:
+    """Joins commands into one expression that the router evaluates at once.
+
+    Args:
+        commands (dict): Commands in the format of `Base._get_batch`.
+
+    Returns:
+        str: Command that returns the values separated by `BATCH_SEPARATOR`.
+    """
+    expression = f' . {_BATCH_SEPARATOR_EXPRESSION} . '.join(
+        f'[:tostr [{command if isinstance(command, str) else command[0]}]]'
+        for command in commands.values()
+    )
+    return f'return ({expression})'
+
+
+def batch_values(
+    commands: dict[str, BatchCommand], output: str
+) -> dict[str, Any]:
+    """Splits and converts the output of a `batch_script` command.
+
+    Args:
+        commands (dict): Commands in the format of `Base._get_batch`.
+        output (str): Output of the command.
+
+    Returns:
+        dict: Mapping of each name to the converted output of its command.
+
+    Raises:
+        InvalidBatchOutput: If there is not one value per command.
+    """
+    values = output.strip().split(BATCH_SEPARATOR)
+    if len(values) != len(commands):
+        raise InvalidBatchOutput(
+            f'Expected {len(commands)} values, got {len(values)}: {output}'
+        )
+
+    return {
+        name: value.strip()
+        if isinstance(command, str)
+        else command[1](value.strip())
+        for (name, command), value in zip(commands.items(), values)
+    }
+
+
+def join_groups(
+    groups: dict[str, dict[str, BatchCommand]],
+) -> dict[str, BatchCommand]:
+    """Joins groups of commands into the commands of a single batch.
+
+    Args:
+        groups (dict): Mapping of a group name to its commands.
+
+    Returns:
+        dict: Commands named `<group>.<name>`, see `split_groups`.
+    """
+    return {
+        f'{group}.{name}': command
+        for group, commands in groups.items()
+        for name, command in commands.items()
+    }
+
+
+def split_groups(
+    groups: dict[str, dict[str, BatchCommand]], values: dict[str, Any]
+) -> dict[str, dict[str, Any]]:
+    """Splits the values of a batch made by `join_groups` by group.
+
+    Args:
+        groups (dict): Mapping of a group name to its commands.
+        values (dict): Values of the batch.
+
+    Returns:
+        dict: Mapping of each group name to the values of its commands.
+    """
+    output: dict[str, dict[str, Any]] = {group: {} for group in groups}
+    for key, value in values.items():
+        group, _, name = key.partition('.')
+        output[group][name] = value
+    return output
+
 
 class Base:
     """Class that generates the connection with a MikroTik router.
 
+    The instance can be shared between threads: commands are sent over the
+    connection one at a time, and concurrent calls of the same cached (or
+    coalesced, e.g. `health_temperature`) getter with the same arguments
+    send a single command, whose result is returned to all of them.
+
     Args:
         host (str): IP address of the router you want to connect to.
         username (str): Username to be used in the connection.
         password (str): Password to be used in the connection.
         ssh_port (int): SSH port to be used in the connection.
-        delay (float): Time delay between command executions on the router.
+        delay (float | str): Time delay between command executions on the
+            router, or 'auto' to stretch the read timeout of slow commands
+            and back off after timeouts (see `AdaptiveTiming`). It does not
+            make commands faster.
+        transport (Transport): How to talk to the router: 'ssh' (terminal),
+            'api' or 'api-ssl' (RouterOS API), 'fake' (in-process simulator)
+            or a function that opens the connection (e.g. a `FakeRouter`).
+        api_port (int): Port of the API service, by default the port of the
+            chosen API service (8728 or 8729). Ignored by the 'ssh' transport.
+        pool (ConnectionPool): Pool to borrow the connection from, it is
+            given back to the pool on `disconnect()`.
+        cache_ttl (float | dict): Seconds the result of read-only getters is
+            cached, or a mapping of getter names to seconds to cache only
+            those getters. Nothing is cached by default.
+        cache_size (int): Maximum number of cached results.
+        hooks (Iterable[Hook]): Functions called with the `CommandEvent` of
+            every connection and command, e.g. a `MetricsCollector`.
+        trusted (bool): Build the records read from the router without
+            validating them again where it is cheaper, see `_record`. Values
+            given to setters are always validated.
 
     Attributes:
         _auth (Auth): Credenciais necessárias para realizar conexão como roteador.
-        _connection (MikrotikRouterOsSSH): Conexão com o dispositivo.
+        _connection (Connection): Conexão com o dispositivo.
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         host: str,
         username: str,
         password: str,
         ssh_port: int = 22,
-        delay: float = 0,
+        delay: float | str = 0,
+        *,
+        transport: Transport = 'ssh',
+        api_port: int | None = None,
+        pool: ConnectionPool | None = None,
+        cache_ttl: float | dict[str, float] | None = None,
+        cache_size: int = 128,
+        hooks: Iterable[Hook] = (),
+        trusted: bool = False,
+        channels: int = 1,
+        facts: 'FactCache | None' = None,
     ):
-        _auth = Auth(
+        self._trusted = trusted
+        self._channels = channels
+        self._facts = facts
+        self._timing = AdaptiveTiming() if delay == 'auto' else None
+        if self._timing is not None:
+            delay = 0
+
+        port = ssh_port
+        if transport != 'ssh':
+            port = api_port or DEFAULT_PORTS.get(transport, ssh_port)
+
+        self._auth = Auth(
             host=host,
             username=username,
             password=password,
-            port=Port(port=ssh_port).port,
+            port=Port(port=port).port,
             global_delay_factor=delay,
         )
+        self._transport = transport
+        self._pool = pool
+        self._cache = TTLCache(cache_ttl, cache_size) if cache_ttl else None
+        self._hooks = list(hooks)
+        # Reentrant, so a command may be sent while a stream is being read
+        # by the same thread (e.g. the fallback of `_iter_lines`)
+        self._lock = RLock()
+        self._flights = SingleFlight()
+        self._generations = Generations()
+        self._exec = BoundedSemaphore(channels) if channels > 1 else None
+        self._connection: Connection | None = self._open_connection()
+
+    def _record(self, model: type[T], /, **values: Any) -> T:
+        """Builds a record with values read and converted from the router.
+
+        Args:
+            model (type): Pydantic model or dataclass of the record.
+            **values: Fields of the record.
 
-        self._connection = MikrotikRouterOsSSH(
-            device_type='mikrotik_routeros',
-            host=str(_auth.host),
-            username=_auth.username,
-            password=_auth.password,
-            port=_auth.port,
-            global_delay_factor=_auth.global_delay_factor,
+        Returns:
+            Record with the values, see `make_record`.
+        """
+        return make_record(model, self._trusted, **values)
+
+    def _emit(
+        self,
+        phase: str,
+        command: str,
+        started: float,
+        meter: ChannelMeter | None,
+        error: Exception | None = None,
+    ) -> CommandEvent:
+        """Calls the hooks with the measurements of a finished command.
+
+        Args:
+            phase (str): Phase of the connection (e.g. 'command').
+            command (str): Command that was executed.
+            started (float): `time.perf_counter()` when it was sent.
+            meter (ChannelMeter): Data counted while the command ran, from
+                the connection or from the exec channel that ran it.
+            error (Exception): Error raised by the command, if any.
+
+        Returns:
+            CommandEvent: Measurements of the command.
+        """
+        transport = self._transport
+        if not isinstance(transport, str):
+            transport = type(transport).__name__
+        event = measure(
+            str(self._auth.host),
+            transport,
+            phase,
+            command,
+            started,
+            meter,
+            error,
         )
+        for hook in self._hooks:
+            hook(event)
+        return event
+
+    def _open_connection(self, phase: str = 'connect') -> Connection:
+        """Opens a connection with the router, or borrows one from the pool.
+
+        Args:
+            phase (str): Phase reported to the hooks.
+
+        Returns:
+            Connection: Open connection with the router.
+        """
+        started = time.perf_counter()
+        if self._pool is not None:
+            connection = self._pool.acquire(self._transport, self._auth)
+        else:
+            connection = create_connection(self._transport, self._auth)
+
+        if self._hooks:
+            self._emit(phase, '', started, getattr(connection, 'meter', None))
+        return connection
+
+    def _close_connection(self) -> None:
+        """Closes the connection, or gives it back to the pool.
+
+        A connection given back to the pool may be lent to another router
+        right away, so it is forgotten: closing again does nothing and
+        sending commands raises `ConnectionError`.
+        """
+        with self._locked():
+            if self._pool is None:
+                self._connection.disconnect()
+            elif self._connection is not None:
+                connection, self._connection = self._connection, None
+                self._pool.release(self._transport, self._auth, connection)
+
+    def _reconnect(self) -> None:
+        """Replaces a broken connection with a new one."""
+        if self._pool is not None:
+            self._pool.discard(self._connection)
+        else:
+            try:
+                self._connection.disconnect()
+            except Exception:  # noqa: S110
+                pass
+        self._connection = self._open_connection('reconnect')
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Holds the connection, waiting at most `LOCK_TIMEOUT` for it.
+
+        Raises:
+            TimeoutError: If another thread holds the connection for longer,
+                e.g. a stream that is neither read to the end nor closed.
+        """
+        if not self._lock.acquire(timeout=LOCK_TIMEOUT):
+            raise TimeoutError(
+                'The connection with the router is held by another thread'
+            )
+        try:
+            yield
+        finally:
+            self._lock.release()
+
+    def _check_open(self) -> None:
+        """Raises `ConnectionError` if the connection was given back."""
+        if self._connection is None:
+            raise ConnectionError('The connection with the router is closed')
+
+    def _send(
+        self, method: str, *args, idempotent: bool = False, **kwargs
+    ) -> str:
+        """Calls a method of the connection, reconnecting if it is broken.
+
+        If the call fails and the connection is no longer alive, a new
+        connection is opened. Idempotent calls (reads) are then repeated
+        once. Other calls may have changed the router before the link
+        dropped, so their error is raised to avoid applying them twice, and
+        the instance can be used again. Errors on a connection that is still
+        alive are raised as they are.
+
+        With `channels` above 1, idempotent commands of one line are run on
+        exec channels of their own, concurrently with other threads, instead
+        of waiting for the terminal. Other commands hold the terminal, so
+        changes are applied one at a time in the order they were sent.
+
+        Args:
+            method (str): Method of the connection ('send_command' or
+                'send_multiline').
+            *args: Positional arguments of the method.
+            idempotent (bool): Whether the call can be repeated safely,
+                i.e. it does not change the router.
+            **kwargs: Keyword arguments of the method.
+
+        Returns:
+            str: Output of the method.
+        """
+        self._check_open()
+        if idempotent and self._can_exec(method, *args, **kwargs):
+            return self._send_exec(*args, **kwargs)
+
+        with self._locked():
+            try:
+                return self._call(method, *args, **kwargs)
+            except Exception:
+                if self._connection.is_alive():
+                    raise
+                self._reconnect()
+                if not idempotent:
+                    raise
+            return self._call(method, *args, **kwargs)
+
+    def _can_exec(self, method: str, *args, **kwargs) -> bool:
+        """Returns True if a read can be run on an exec channel."""
+        if self._exec is None:
+            return False
+        if method != 'send_command' or kwargs.get('expect_string'):
+            return False
+        if not hasattr(self._connection, 'exec_command'):
+            return False
+        command = args[0] if args else kwargs.get('command_string', '')
+        return '\n' not in command.strip()
+
+    def _send_exec(self, *args, **kwargs) -> str:
+        """Runs a read on an exec channel, reconnecting if it is broken.
+
+        Only idempotent calls are sent here, so a failed call is repeated
+        once on the new connection, like in `_send`.
+        """
+        with self._exec:
+            try:
+                return self._call('exec_command', *args, **kwargs)
+            except Exception:
+                if self._connection.is_alive():
+                    raise
+                with self._locked():
+                    # Another channel may have reconnected already
+                    if not self._connection.is_alive():
+                        self._reconnect()
+            return self._call('exec_command', *args, **kwargs)
+
+    def _call(self, method: str, *args, **kwargs) -> str:
+        """Calls a method of the connection and reports it to the hooks.
+
+        With `delay='auto'`, the read timeout is given to the connection and
+        the measurements of the command tune the timeout of the next ones.
+
+        Args:
+            method (str): Method of the connection.
+            *args: Positional arguments of the method.
+            **kwargs: Keyword arguments of the method.
+
+        Returns:
+            str: Output of the method.
+        """
+        connection = self._connection
+        timing = self._timing
+        if timing is not None:
+            kwargs.setdefault('read_timeout', timing.read_timeout())
+        elif not self._hooks:
+            return getattr(connection, method)(*args, **kwargs)
+
+        command = args[0] if args else kwargs.get('command_string', '')
+        if not isinstance(command, str):
+            command = '\n'.join(command)
+        if method == 'exec_command':
+            # Channels run concurrently, each one is measured on its own
+            meter = kwargs['meter'] = ChannelMeter()
+        else:
+            meter = getattr(connection, 'meter', None)
+            if meter is not None:
+                meter.reset()
+
+        started = time.perf_counter()
+        try:
+            output = getattr(connection, method)(*args, **kwargs)
+        except Exception as error:
+            if timing is not None and isinstance(
+                error, ReadTimeout | TimeoutError
+            ):
+                timing.backoff()
+            self._emit('command', command, started, meter, error)
+            raise
+
+        event = self._emit('command', command, started, meter)
+        if timing is not None:
+            timing.observe(event.elapsed)
+        return output
+
+    def _iter_lines(self, command: str, **kwargs) -> Iterator[str]:
+        """Runs a command and yields its output line by line as it arrives.
+
+        Connections that can not stream their output (without `iter_lines`)
+        return the whole output at once, which is then split in lines. The
+        connection is held until the output ends or the iterator is closed,
+        so other threads wait for it instead of reading its lines. The
+        output is not buffered, so a caller that stops reading without
+        closing the iterator keeps the connection: other threads give up
+        after `LOCK_TIMEOUT` seconds with `TimeoutError`.
+
+        Args:
+            command (str): Command to be executed.
+            **kwargs: Options of `iter_lines` (e.g. `end`).
+
+        Yields:
+            str: Lines of the output.
+        """
+        self._check_open()
+        with self._locked():
+            iter_lines = getattr(self._connection, 'iter_lines', None)
+            if iter_lines is None:
+                yield from self._send('send_command', command).splitlines()
+                return
+            if self._timing is not None:
+                kwargs.setdefault('read_timeout', self._timing.read_timeout())
+            if not self._hooks:
+                yield from iter_lines(command, **kwargs)
+                return
+
+            connection = self._connection
+            meter = getattr(connection, 'meter', None)
+            if meter is not None:
+                meter.reset()
+            started = time.perf_counter()
+            try:
+                yield from iter_lines(command, **kwargs)
+            except Exception as error:
+                self._emit('stream', command, started, meter, error)
+                raise
+            except GeneratorExit:
+                # Streams stopped early by the caller are reported as well
+                self._emit('stream', command, started, meter)
+                raise
+            self._emit('stream', command, started, meter)
 
     def _cmd(self, command: str) -> str:
         """Runs a command in the router's terminal.
@@ -58,14 +533,9 @@ class Base:
             >>> router._cmd('/system identity print')
             'name: Netmikro'
         """
-        # The `expect_string` parameter is a regex (format: [admin@mikrotik])
-        # necessary in case the router's identity is changed,
-        # there is no ReadTimeout error due to the output format changing,
-        # as it includes the router's identity
-        return self._connection.send_command(
-            command_string=command,
-            expect_string=rf'\[{self._username}@[^]]+\]',
-        )
+        # The end of the output is found by the sentinel printed after the
+        # command, so changing the identity (part of the prompt) is safe
+        return self._send('send_command', command_string=command)
 
     def _get(self, command: str) -> str:
         """Method for returning string outputs.
@@ -76,7 +546,9 @@ class Base:
         Returns:
             str: Output of the command.
         """
-        output = self._connection.send_command(f'return [{command}]').strip()
+        output = self._send(
+            'send_command', f'return [{command}]', idempotent=True
+        ).strip()
         return output
 
     def _get_number(self, command: str) -> int:
@@ -88,10 +560,10 @@ class Base:
         Returns:
             int: Numeric output of the command.
         """
-        output = self._connection.send_command(f'return [{command}]').strip()
-        if not output:
-            return 0
-        return int(output)
+        output = self._send(
+            'send_command', f'return [{command}]', idempotent=True
+        )
+        return number(output)
 
     def _get_float(self, command: str) -> float:
         """Method for returning numeric outputs in floats.
@@ -102,10 +574,10 @@ class Base:
         Returns:
             float: Numeric output of the command.
         """
-        output = self._connection.send_command(f'return [{command}]').strip()
-        if not output:
-            return 0.0
-        return float(output)
+        output = self._send(
+            'send_command', f'return [{command}]', idempotent=True
+        )
+        return decimal(output)
 
     def _get_bool(self, command: str) -> bool:
         """Method for returning boolean outputs.
@@ -116,7 +588,9 @@ class Base:
         Returns:
             bool: Boolean output of the command.
         """
-        output = self._connection.send_command(f'return [{command}]').strip()
+        output = self._send(
+            'send_command', f'return [{command}]', idempotent=True
+        ).strip()
         if output == 'true':
             return True
         return False
@@ -130,9 +604,66 @@ class Base:
         Returns:
             list[IPv4Address]: List of IP addresses.
         """
-        output = (
-            self._connection.send_command(f'return [{command}]')
-            .strip()
-            .split(';')
+        output = self._send(
+            'send_command', f'return [{command}]', idempotent=True
+        )
+        return ip_list(output)
+
+    def _get_batch(self, commands: dict[str, BatchCommand]) -> dict[str, Any]:
+        """Method for returning many outputs in a single round trip.
+
+        All commands are joined into one expression that the router evaluates
+        at once, the values come back separated by `BATCH_SEPARATOR` and are
+        converted locally.
+
+        Args:
+            commands (dict): Mapping of a name to the command to be executed,
+                or to a tuple with the command and a function that converts
+                its output (e.g. `number`, `boolean`, `ip_list`).
+
+        Returns:
+            dict: Mapping of each name to the converted output of its command.
+
+        Raises:
+            InvalidBatchOutput: If the router does not return one value per command.
+
+        Examples:
+            >>> router._get_batch({
+            ...     'name': '/system identity get name',
+            ...     'level': ('/system license get nlevel', number),
+            ... })
+            {'name': 'Netmikro', 'level': 4}
+        """
+        if not commands:
+            return {}
+
+        output = self._send(
+            'send_command', batch_script(commands), idempotent=True
         )
-        return [IPv4Address(ip) for ip in output]
+        return batch_values(commands, output)
+
+    def _get_batch_groups(
+        self, groups: dict[str, dict[str, BatchCommand]]
+    ) -> dict[str, dict[str, Any]]:
+        """Method for returning the outputs of many groups of commands at once.
+
+        Works like `_get_batch`, but keeps the outputs of each group apart,
+        so the commands of many records are read in a single round trip.
+
+        Args:
+            groups (dict): Mapping of a group name to its commands, in the
+                format of `_get_batch`.
+
+        Returns:
+            dict: Mapping of each group name to the converted outputs of its
+                commands.
+
+        Examples:
+            >>> router._get_batch_groups({
+            ...     'system': {'name': '/system identity get name'},
+            ...     'license': {'level': ('/system license get nlevel', number)},
+            ... })
+            {'system': {'name': 'Netmikro'}, 'license': {'level': 4}}
+        """
+        values = self._get_batch(join_groups(groups))
+        return split_groups(groups, values)
@@ -1,8 +1,34 @@
+from collections.abc import Callable
+from functools import cached_property
+from typing import Any
+
 from pydantic.dataclasses import dataclass
 
-from netmikro.modules.base import Base
+from netmikro.modules.base import Base, BatchCommand
+from netmikro.utils import boolean, invalidates, number
 from netmikro.validators import Port
 
+SERVICE_NAMES = [
+    'api',
+    'api-ssl',
+    'ftp',
+    'ssh',
+    'telnet',
+    'winbox',
+    'www',
+    'www-ssl',
+]
+# Port, state and address of every service, read by `Ip.service`
+SERVICE_COMMANDS: dict[str, BatchCommand] = {
+    f'{service} {field}': (f'/ip service get {service} {field}', convert)
+    for service in SERVICE_NAMES
+    for field, convert in (
+        ('port', number),
+        ('disabled', boolean),
+        ('address', str),
+    )
+}
+
 
 @dataclass
 class IpService:
@@ -22,6 +48,29 @@ class IpService:
     available_from: str
 
 
+def service_records(
+    record: Callable[..., Any], values: dict[str, Any]
+) -> dict[str, IpService]:
+    """Builds the `IpService` of each service from `SERVICE_COMMANDS`.
+
+    Args:
+        record (Callable): Builder of the records, e.g. `Base._record`.
+        values (dict): Values read with `SERVICE_COMMANDS`.
+
+    Returns:
+        dict: Dictionary with an `IpService` for each service name.
+    """
+    return {
+        service: record(
+            IpService,
+            port=values[f'{service} port'],
+            disabled=values[f'{service} disabled'],
+            available_from=values[f'{service} address'],
+        )
+        for service in SERVICE_NAMES
+    }
+
+
 # noinspection PyUnresolvedReferences
 class Ip(Base):
     """Class that generates the connection with a MikroTik router.
@@ -30,29 +79,19 @@ class Ip(Base):
         service (dict): Dictionary with the services available on the router.
     """
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-        _service_names = [
-            'api',
-            'api-ssl',
-            'ftp',
-            'ssh',
-            'telnet',
-            'winbox',
-            'www',
-            'www-ssl',
-        ]
-
-        self.service = {
-            service: IpService(
-                port=int(self._get(f'/ip service get {service} port')),
-                disabled=self._get_bool(f'/ip service get {service} disabled'),
-                available_from=self._get(f'/ip service get {service} address'),
-            )
-            for service in _service_names
-        }
+    @cached_property
+    def service(self) -> dict[str, IpService]:
+        """Services available on the router, loaded on first access.
+
+        The port, state and address of every service are read in a single
+        round trip.
 
+        Returns:
+            dict: Dictionary with an `IpService` for each service name.
+        """
+        return service_records(self._record, self._get_batch(SERVICE_COMMANDS))
+
+    @invalidates('config')
     def ip_port_set(self, service_name: str, port: int) -> None:
         """Set the API port number.
 
@@ -63,7 +102,9 @@ class Ip(Base):
         Examples:
             >>> router.ip_port_set('www', 8080)
         """
-        self._cmd(
-            f'/ip service set {service_name} port={Port(port=port).port}'
-        )
-        self.service[service_name].port = port
+        port = Port(port=port).port
+        self._cmd(f'/ip service set {service_name} port={port}')
+        # Only keep the loaded services in sync, there is no reason to fetch
+        # them now if they have not been read yet
+        if 'service' in self.__dict__:
+            self.service[service_name].port = port
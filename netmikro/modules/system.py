@@ -1,74 +1,353 @@
-from datetime import date, time
+from collections.abc import Callable, Iterable
+from datetime import UTC, date, datetime, time
+from functools import cached_property
 from ipaddress import IPv4Address
-from typing import List
+from typing import Any, List
 
 from netmikro.exceptions import InvalidNtpMode
-from netmikro.modules.base import Base
-from netmikro.utils import boolean
+from netmikro.facts import Fingerprint
+from netmikro.modules.base import Base, BatchCommand
+from netmikro.utils import (
+    boolean,
+    cached,
+    coalesced,
+    decimal,
+    duration,
+    invalidates,
+    ip_address,
+    ip_list,
+    number,
+    quote_value,
+)
 from netmikro.validators import (
+    Clock,
+    Health,
     IfRouterboard,
     License,
     NTPClient,
     NTPServer,
     Resources,
+    Snapshot,
 )
 
+# Commands that read each record, in the format of `Base._get_batch`
+ROUTERBOARD_COMMANDS: dict[str, BatchCommand] = {
+    'model': '/system routerboard get model',
+    'revision': '/system routerboard get revision',
+    'serial_number': '/system routerboard get serial-number',
+    'firmware_type': '/system routerboard get firmware-type',
+    'factory_firmware': '/system routerboard get factory-firmware',
+    'current_firmware': '/system routerboard get current-firmware',
+    'upgrade_firmware': '/system routerboard get upgrade-firmware',
+}
+LICENSE_COMMANDS: dict[str, BatchCommand] = {
+    'software_id': '/system license get software-id',
+    'level': ('/system license get nlevel', number),
+    'features': '/system license get features',
+}
+RESOURCES_COMMANDS: dict[str, BatchCommand] = {
+    'cpu': '/system resource get cpu',
+    'cpu_frequency': ('/system resource get cpu-frequency', number),
+    'memory': ('/system resource get total-memory', number),
+    'storage': ('/system resource get total-hdd-space', number),
+    'architecture': '/system resource get architecture-name',
+    'board_name': '/system resource get board-name',
+    'version': '/system resource get version',
+}
+# Read on first access to check the records kept by a `FactCache`
+FINGERPRINT_COMMANDS: dict[str, BatchCommand] = {
+    'version': '/system resource get version',
+    'board_name': '/system resource get board-name',
+    'uptime': ('/system resource get uptime', duration),
+}
+CLOCK_COMMANDS: dict[str, BatchCommand] = {
+    'time': ('/system clock get time', time.fromisoformat),
+    'date': ('/system clock get date', date.fromisoformat),
+    'time_zone': '/system clock get time-zone-name',
+    'gmt_offset': '/system clock get gmt-offset as-string',
+    'dst_active': ('/system clock get dst-active', boolean),
+    'time_zone_autodetect': (
+        '/system clock get time-zone-autodetect',
+        boolean,
+    ),
+}
+HEALTH_COMMANDS: dict[str, BatchCommand] = {
+    'voltage': ('/system health get number=0 value', decimal),
+    'temperature': ('/system health get number=1 value', decimal),
+}
+NTP_CLIENT_COMMANDS: dict[str, BatchCommand] = {
+    'enabled': ('/system ntp client get enabled', boolean),
+    'mode': '/system ntp client get mode',
+    'servers': ('/system ntp client get servers', ip_list),
+    'vrf': '/system ntp client get vrf',
+    'freq_diff': ('/system ntp client get freq-drift', number),
+    'status': '/system ntp client get status',
+    'synced_server': (
+        '/system ntp client get synced-server',
+        ip_address,
+    ),
+    'synced_stratum': ('/system ntp client get synced-stratum', number),
+    'system_offset': ('/system ntp client get system-offset', number),
+}
+NTP_SERVER_COMMANDS: dict[str, BatchCommand] = {
+    'enabled': ('/system ntp server get enabled', boolean),
+    'broadcast': ('/system ntp server get broadcast', boolean),
+    'multicast': ('/system ntp server get multicast', boolean),
+    'manycast': ('/system ntp server get manycast', boolean),
+    'broadcast_address': (
+        '/system ntp server get broadcast-address',
+        ip_address,
+    ),
+    'vrf': '/system ntp server get vrf',
+}
+# Groups of commands read by `snapshot()`, the second one on RouterBoards
+SNAPSHOT_COMMANDS: dict[str, dict[str, BatchCommand]] = {
+    'system': {
+        'identity': '/system identity get name',
+        'note': '/system note get note',
+        'routerboard': ('/system routerboard get routerboard', boolean),
+    },
+    'resources': RESOURCES_COMMANDS,
+    'clock': CLOCK_COMMANDS,
+    'ntp_client': NTP_CLIENT_COMMANDS,
+    'ntp_server': NTP_SERVER_COMMANDS,
+}
+SNAPSHOT_BOARD_COMMANDS: dict[str, dict[str, BatchCommand]] = {
+    'routerboard': ROUTERBOARD_COMMANDS,
+    'license': LICENSE_COMMANDS,
+    'health': HEALTH_COMMANDS,
+}
+
+
+def health_commands(
+    interfaces: Iterable[str], routerboard: bool
+) -> dict[str, BatchCommand]:
+    """Returns the commands read by `System.health_sample`.
+
+    Args:
+        interfaces (Iterable[str]): Names of the interfaces whose traffic
+            counters are read.
+        routerboard (bool): Whether the router has health sensors.
+
+    Returns:
+        dict: Commands in the format of `Base._get_batch`.
+    """
+    commands: dict[str, BatchCommand] = {
+        'cpu_load': ('/system resource get cpu-load', decimal),
+        'free_memory': ('/system resource get free-memory', decimal),
+        'total_memory': ('/system resource get total-memory', decimal),
+    }
+    if routerboard:
+        commands.update(HEALTH_COMMANDS)
+    for interface in interfaces:
+        for counter in ('rx-byte', 'tx-byte'):
+            commands[f'{interface}.{counter}'] = (
+                f'/interface get {quote_value(interface)} {counter}',
+                decimal,
+            )
+    return commands
+
+
+def health_values(sample: dict[str, float]) -> dict[str, float]:
+    """Converts the values read with `health_commands` to a sample.
+
+    Args:
+        sample (dict): Values read from the router.
+
+    Returns:
+        dict: Sample in the format of `System.health_sample`.
+    """
+    free, total = sample.pop('free_memory'), sample.pop('total_memory')
+    used = 100 * (total - free) / total if total else 0.0
+    return {
+        'cpu_load': sample.pop('cpu_load'),
+        'memory_used': round(used, 2),
+        **sample,
+    }
+
+
+def ntp_client_command(
+    servers: List[IPv4Address], enabled: bool, mode: str, vrf: str
+) -> str:
+    """Returns the command run by `System.ntp_client_set`.
+
+    Args:
+        servers (list): List of NTP servers.
+        enabled (bool): Specifies whether the NTP client should be enabled.
+        mode (str): Specifies the NTP client mode.
+        vrf (str): Specifies the VRF to be used by the NTP client.
+
+    Returns:
+        str: Command that sets the NTP client.
+
+    Raises:
+        InvalidNtpMode: If the mode is not a mode of the NTP client.
+    """
+    servers_command: str = ','.join([
+        str(IPv4Address(server)) for server in servers
+    ])
+
+    enabled_command = 'yes' if enabled else 'no'
+    mode = mode.lower().strip()
+    if mode not in {'unicast', 'broadcast', 'multicast', 'manycast'}:
+        raise InvalidNtpMode(f'Invalid mode: {mode}')
+    vrf = vrf.lower().strip()
+
+    return (
+        f'/system ntp client set '
+        f'enabled={enabled_command} mode={mode} servers={servers_command} vrf={vrf}'
+    )
+
+
+def snapshot_record(
+    record: Callable[..., Any],
+    host: str,
+    collected_at: datetime,
+    values: dict[str, dict[str, Any]],
+    board: dict[str, dict[str, Any]] | None,
+) -> Snapshot:
+    """Builds the record returned by `System.snapshot`.
+
+    Args:
+        record (Callable): Builder of the records, e.g. `Base._record`.
+        host (str): Address of the router.
+        collected_at (datetime): When the values were read.
+        values (dict): Values read with `SNAPSHOT_COMMANDS`.
+        board (dict): Values read with `SNAPSHOT_BOARD_COMMANDS`, None if
+            the router is not a RouterBoard.
+
+    Returns:
+        Snapshot: Record of the router.
+    """
+    routerboard = license = health = None
+    if board is not None:
+        routerboard = record(IfRouterboard, **board['routerboard'])
+        license = record(License, **board['license'])
+        health = record(Health, **board['health'])
+
+    return record(
+        Snapshot,
+        host=host,
+        collected_at=collected_at,
+        identity=values['system']['identity'],
+        note=values['system']['note'],
+        resources=record(Resources, **values['resources']),
+        routerboard=routerboard,
+        license=license,
+        health=health,
+        clock=record(Clock, **values['clock']),
+        ntp_client=record(NTPClient, **values['ntp_client']),
+        ntp_server=record(NTPServer, **values['ntp_server']),
+    )
+
 
 # noinspection PyUnresolvedReferences
-class System(Base):
+class System(Base):  # noqa: PLR0904
     """Gets system-related information from the router.
 
+    The attributes are only read from the router when first accessed and are
+    kept afterwards, so creating a connection does not cost any extra command.
+
     Attributes:
         identity (str): Name of the router (format: 'HS-A (192.168.88.1) on RB912UAG-5HPnD (mipsbe)').
-        routerboard (dict): If the router is a RouterBoard, returns a dictionary with board information.
-        license (dict): A dictionary with router license information.
+        routerboard (IfRouterboard): If the router is a RouterBoard, the board information, otherwise None.
+        license (License): If the router is a RouterBoard, the license information, otherwise None.
         note (str): Notes of about the router.
-        resources (dict): A dictionary with router hardware information.
+        resources (Resources): Router hardware information.
     """
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-        self.identity: str = self._get('/system identity get name')
-
-        if self.is_routerboard():
-            # ROUTERBOARD
-            prefix = '/system routerboard get'
-            self.routerboard = IfRouterboard(
-                model=self._get(f'{prefix} model'),
-                revision=self._get(f'{prefix} revision'),
-                serial_number=self._get(f'{prefix} serial-number'),
-                firmware_type=self._get(f'{prefix} firmware-type'),
-                factory_firmware=self._get(f'{prefix} factory-firmware'),
-                current_firmware=self._get(f'{prefix} current-firmware'),
-                upgrade_firmware=self._get(f'{prefix} upgrade-firmware'),
-            )
+    @cached_property
+    def identity(self) -> str:
+        """Name of the router, loaded on first access."""
+        return self._get('/system identity get name')
 
-            # LICENSE
-            prefix = '/system license get'
-            self.license = License(
-                software_id=self._get(f'{prefix} software-id'),
-                level=self._get_number(f'{prefix} nlevel'),
-                features=self._get(f'{prefix} features'),
-            )
+    @cached_property
+    def routerboard(self) -> IfRouterboard | None:
+        """RouterBoard information, loaded on first access.
+
+        Returns:
+            IfRouterboard | None: Board information, or None if the router is not a RouterBoard.
+        """
+        if self._facts is not None:
+            return self._load_facts()['routerboard']
+        if not self.is_routerboard():
+            return None
 
-        # NOTE
-        self.note = self._get('/system note get note')
-
-        # RESOURCES
-        prefix = '/system resource get'
-        self.resources = Resources(
-            cpu=self._get('/system resource get cpu'),
-            cpu_frequency=self._get_number(
-                '/system resource get cpu-frequency'
-            ),
-            memory=self._get_number('/system resource get total-memory'),
-            storage=self._get_number('/system resource get total-hdd-space'),
-            architecture=self._get('/system resource get architecture-name'),
-            board_name=self._get('/system resource get board-name'),
-            version=self._get('/system resource get version'),
+        return self._record(
+            IfRouterboard, **self._get_batch(ROUTERBOARD_COMMANDS)
         )
 
+    @cached_property
+    def license(self) -> License | None:
+        """License information, loaded on first access.
+
+        Returns:
+            License | None: License information, or None if the router is not a RouterBoard.
+        """
+        if self._facts is not None:
+            return self._load_facts()['license']
+        if self.routerboard is None:
+            return None
+
+        return self._record(License, **self._get_batch(LICENSE_COMMANDS))
+
+    @cached_property
+    def note(self) -> str:
+        """Notes about the router, loaded on first access."""
+        return self._get('/system note get note')
+
+    @cached_property
+    def resources(self) -> Resources:
+        """Hardware information, loaded on first access."""
+        if self._facts is not None:
+            return self._load_facts()['resources']
+        return self._record(Resources, **self._get_batch(RESOURCES_COMMANDS))
+
+    def _load_facts(self) -> dict[str, Any]:
+        """Loads `resources`, `routerboard` and `license` at once.
+
+        The fingerprint of the router is read first, in one command, and
+        the records are taken from the `FactCache` if it still matches.
+        Otherwise they are read from the router, in one round trip, or two
+        on RouterBoards, and stored in the cache.
+
+        Returns:
+            dict: Records by attribute name, which are also kept as the
+                values of the attributes.
+        """
+        host, port = str(self._auth.host), self._auth.port
+        values = self._get_batch(FINGERPRINT_COMMANDS)
+        fingerprint = Fingerprint.from_uptime(**values)
+        records = self._facts.get(host, port, fingerprint)
+        if records is None:
+            values = self._get_batch_groups({
+                'resources': RESOURCES_COMMANDS,
+                'system': {
+                    'routerboard': (
+                        '/system routerboard get routerboard',
+                        boolean,
+                    ),
+                },
+            })
+            records = {
+                'resources': self._record(Resources, **values['resources']),
+                'routerboard': None,
+                'license': None,
+            }
+            if values['system']['routerboard']:
+                board = self._get_batch_groups({
+                    'routerboard': ROUTERBOARD_COMMANDS,
+                    'license': LICENSE_COMMANDS,
+                })
+                records['routerboard'] = self._record(
+                    IfRouterboard, **board['routerboard']
+                )
+                records['license'] = self._record(License, **board['license'])
+            self._facts.set(host, port, fingerprint, records)
+
+        self.__dict__.update(records)
+        return records
+
     def __str__(self) -> str:
         return f'{self.identity} ({self._host}) on {self.resources.board_name} ({self.resources.architecture})'
 
@@ -105,6 +384,7 @@ class System(Base):
         clock_date = self._get('/system clock get date').split('-')
         return date(*[int(i) for i in clock_date])
 
+    @cached
     def clock_time_zone_get(self) -> str:
         """Returns the router's time zone.
 
@@ -117,6 +397,7 @@ class System(Base):
         """
         return self._get('/system clock get time-zone-name')
 
+    @cached
     def clock_gmt_offset_get(self) -> str:
         """Returns the router's GMT offset.
 
@@ -129,6 +410,7 @@ class System(Base):
         """
         return self._get('/system clock get gmt-offset as-string')
 
+    @cached
     def clock_dst_active_get(self) -> bool:
         """Returns True if DST is enabled, if not enabled, returns False.
 
@@ -141,6 +423,7 @@ class System(Base):
         """
         return self._get_bool('/system clock get dst-active')
 
+    @cached
     def clock_time_zone_autodetect_get(self) -> bool:
         """Returns True if time-zone-autodetect is enabled, if not enabled, it returns False.
 
@@ -153,6 +436,7 @@ class System(Base):
         """
         return self._get_bool('/system clock get time-zone-autodetect')
 
+    @coalesced
     def health_voltage(self) -> float:
         """Returns the current voltage at the router.
 
@@ -165,6 +449,7 @@ class System(Base):
         """
         return self._get_float('/system health get number=0 value')
 
+    @coalesced
     def health_temperature(self) -> float:
         """Returns the current temperature at the router.
 
@@ -177,6 +462,29 @@ class System(Base):
         """
         return self._get_float('/system health get number=1 value')
 
+    def health_sample(
+        self, interfaces: Iterable[str] = ()
+    ) -> dict[str, float]:
+        """Reads the load, health and traffic counters in a single round trip.
+
+        Meant to be called periodically, e.g. by a `HealthPoller`.
+
+        Args:
+            interfaces (Iterable[str]): Names of the interfaces whose
+                traffic counters are read.
+
+        Returns:
+            dict: `cpu_load` and `memory_used` in percent, `voltage` and
+                `temperature` on RouterBoards, and the `<interface>.rx-byte`
+                and `<interface>.tx-byte` counters of each interface.
+
+        Examples:
+            >>> router.health_sample(['ether1'])
+            {'cpu_load': 2.0, 'memory_used': 39.2, 'voltage': 24.1, 'temperature': 37.0, 'ether1.rx-byte': 1532.0, 'ether1.tx-byte': 802.0}
+        """
+        commands = health_commands(interfaces, self.routerboard is not None)
+        return health_values(self._get_batch(commands))
+
     def history_system_get(self) -> str:
         """Returns the history of changes made to the router's system settings.
 
@@ -195,6 +503,7 @@ class System(Base):
         """
         return self._cmd('/system history print')
 
+    @invalidates('config')
     def identity_set(self, new_identity: str):
         """Sets the router's identity.
 
@@ -204,10 +513,11 @@ class System(Base):
         Examples:
             >>> router.identity_set('new_identity')
         """
-        new_identity.strip()
+        new_identity = new_identity.strip()
         self._cmd(f'/system identity set name={new_identity}')
         self.identity = new_identity
 
+    @invalidates('config')
     def note_set(self, note: str, show_at_login: bool = False):
         """Sets the router's note.
 
@@ -222,7 +532,9 @@ class System(Base):
         self._cmd(
             f'/system note set note="{note}" show-at-login={show_at_login_command}'
         )
+        self.note = note
 
+    @cached
     def ntp_client_get(
         self,
     ) -> NTPClient:
@@ -245,21 +557,9 @@ class System(Base):
                 'vrf': 'main'
             }
         """
-        prefix = '/system ntp client get'
-        npt_client = NTPClient(
-            enabled=self._get_bool(f'{prefix} enabled'),
-            mode=self._get(f'{prefix} mode'),
-            servers=self._get_list_ips(f'{prefix} servers'),
-            vrf=self._get(f'{prefix} vrf'),
-            freq_diff=self._get_number(f'{prefix} freq-drift'),
-            status=self._get(f'{prefix} status'),
-            synced_server=IPv4Address(self._get(f'{prefix} synced-server')),
-            synced_stratum=self._get_number(f'{prefix} synced-stratum'),
-            system_offset=self._get_number(f'{prefix} system-offset'),
-        )
-
-        return npt_client
+        return self._record(NTPClient, **self._get_batch(NTP_CLIENT_COMMANDS))
 
+    @invalidates('ntp_client_get', 'config')
     def ntp_client_set(
         self,
         servers: List[IPv4Address],
@@ -283,21 +583,9 @@ class System(Base):
                 'main'
             )
         """
-        servers_command: str = ','.join([
-            str(IPv4Address(server)) for server in servers
-        ])
-
-        enabled_command = 'yes' if enabled else 'no'
-        mode = mode.lower().strip()
-        if mode not in {'unicast', 'broadcast', 'multicast', 'manycast'}:
-            raise InvalidNtpMode(f'Invalid mode: {mode}')
-        vrf = vrf.lower().strip()
-
-        self._cmd(
-            f'/system ntp client set '
-            f'enabled={enabled_command} mode={mode} servers={servers_command} vrf={vrf}'
-        )
+        self._cmd(ntp_client_command(servers, enabled, mode, vrf))
 
+    @cached
     def ntp_server_get(self) -> NTPServer:
         """Returns the NTP server configuration.
 
@@ -315,25 +603,9 @@ class System(Base):
                 'vrf': 'main'
             }
         """
-        prefix = '/system ntp server get'
-
-        _broadcast_address = (
-            IPv4Address(_broadcast_address)
-            if (_broadcast_address := self._get(f'{prefix} broadcast-address'))
-            else None
-        )
-
-        ntp_server = NTPServer(
-            enabled=boolean(self._get(f'{prefix} enabled')),
-            broadcast=boolean(self._get(f'{prefix} broadcast')),
-            multicast=boolean(self._get(f'{prefix} multicast')),
-            manycast=boolean(self._get(f'{prefix} manycast')),
-            broadcast_address=_broadcast_address,
-            vrf=self._get(f'{prefix} vrf'),
-        )
-
-        return ntp_server
+        return self._record(NTPServer, **self._get_batch(NTP_SERVER_COMMANDS))
 
+    @cached
     def is_routerboard(self) -> bool:
         """Returns True if the router is a RouterBoard, if not, returns False.
 
@@ -341,3 +613,40 @@ class System(Base):
             bool: True if the router is a RouterBoard, if not, returns False.
         """
         return self._get_bool('/system routerboard get routerboard')
+
+    def snapshot(self) -> Snapshot:
+        """Returns everything known about the router in a single record.
+
+        The lazy attributes, the clock, the health and the NTP settings are
+        read together, in one round trip, or two on RouterBoards, whose
+        board, license and health are read after the router is known to be
+        one. The lazy attributes are updated with the values read.
+
+        Returns:
+            Snapshot: Record of the router, which can be serialized with
+                `model_dump_json()`.
+
+        Examples:
+            >>> snapshot = router.snapshot()
+            >>> snapshot.ntp_client.servers
+            [IPv4Address('200.160.7.186'), IPv4Address('201.49.148.135')]
+            >>> snapshot.model_dump_json()
+            '{"host":"192.168.3.3","collected_at":"2024-08-28T18:55:41Z",...}'
+        """
+        collected_at = datetime.now(UTC)
+        values = self._get_batch_groups(SNAPSHOT_COMMANDS)
+        board = None
+        if values['system']['routerboard']:
+            board = self._get_batch_groups(SNAPSHOT_BOARD_COMMANDS)
+        snapshot = snapshot_record(
+            self._record, str(self._auth.host), collected_at, values, board
+        )
+
+        self.__dict__.update(
+            identity=snapshot.identity,
+            note=snapshot.note,
+            resources=snapshot.resources,
+            routerboard=snapshot.routerboard,
+            license=snapshot.license,
+        )
+        return snapshot
@@ -0,0 +1,234 @@
+import time
+from collections.abc import Iterable
+from threading import Event, Lock, Thread
+
+from netmikro.fleet import DeviceKey, FleetResult, RouterFleet
+from netmikro.utils import Aggregate, RingBuffer
+
+# Suffix of the traffic counters of `health_sample`, which are stored as
+# rates in bits per second (e.g. 'ether1.rx-byte' becomes 'ether1.rx-bps')
+_COUNTER = '-byte'
+_RATE = '-bps'
+
+
+class HealthPoller:
+    """Samples the health of the routers of a fleet at a fixed interval.
+
+    Every poll reads `health_sample()` of all routers concurrently, one
+    round trip per router, and stores each metric in a `RingBuffer` per
+    router, so the memory used is fixed by `size` however long it runs.
+    Traffic counters are stored as rates in bits per second.
+
+    Routers are identified by their `device_key` (host, port and username),
+    so routers behind the same address keep series of their own. Methods
+    that take a router also accept its host, if no other router shares it.
+
+    Args:
+        fleet (RouterFleet): Routers to be sampled.
+        interval (float): Seconds between the start of two polls.
+        size (int): Number of samples kept of each metric of each router.
+        interfaces (Iterable[str]): Names of the interfaces whose traffic
+            is sampled.
+
+    Examples:
+        >>> with HealthPoller(fleet, interval=15, size=240) as poller:
+        ...     time.sleep(600)
+        ...     poller.aggregate('192.168.3.3', 'cpu_load', seconds=300)
+        Aggregate(count=20, min=1.0, max=34.0, mean=5.3, p95=21.0)
+    """
+
+    def __init__(
+        self,
+        fleet: RouterFleet,
+        interval: float = 30.0,
+        size: int = 120,
+        interfaces: Iterable[str] = (),
+    ):
+        self._fleet = fleet
+        self._interval = interval
+        self._size = size
+        self._interfaces = list(interfaces)
+        self._series: dict[tuple[DeviceKey, str], RingBuffer] = {}
+        self._counters: dict[tuple[DeviceKey, str], tuple[float, float]] = {}
+        self._lock = Lock()
+        self._stopped = Event()
+        self._thread: Thread | None = None
+        self._errors: dict[DeviceKey, Exception] = {}
+
+    def __enter__(self) -> 'HealthPoller':
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    @property
+    def errors(self) -> dict[DeviceKey, Exception]:
+        """Error of the last poll that failed on each router, by key."""
+        with self._lock:
+            return dict(self._errors)
+
+    def poll(self) -> list[FleetResult]:
+        """Samples every router of the fleet once.
+
+        Returns:
+            list[FleetResult]: Routers whose sample failed.
+        """
+        failed = []
+        for result in self._fleet.run('health_sample', self._interfaces):
+            if not result.ok:
+                with self._lock:
+                    self._errors[result.key] = result.error
+                failed.append(result)
+                continue
+            self._store(result.key, result.value, time.time())
+        return failed
+
+    def _store(
+        self, key: DeviceKey, sample: dict[str, float], timestamp: float
+    ) -> None:
+        """Adds the values of a sample to the series of the router."""
+        with self._lock:
+            self._errors.pop(key, None)
+            for name, value in sample.items():
+                if name.endswith(_COUNTER):
+                    self._store_rate(key, name, value, timestamp)
+                else:
+                    self._append(key, name, value, timestamp)
+
+    def _store_rate(
+        self, key: DeviceKey, name: str, value: float, timestamp: float
+    ) -> None:
+        """Stores the rate of a counter since its previous sample."""
+        previous = self._counters.get((key, name))
+        self._counters[key, name] = (timestamp, value)
+        # The first sample and counters that were reset (e.g. after a
+        # reboot) have no rate
+        if previous is None or value < previous[1] or timestamp <= previous[0]:
+            return
+        rate = 8 * (value - previous[1]) / (timestamp - previous[0])
+        self._append(key, name.removesuffix(_COUNTER) + _RATE, rate, timestamp)
+
+    def _append(
+        self, key: DeviceKey, name: str, value: float, timestamp: float
+    ) -> None:
+        series = self._series.get((key, name))
+        if series is None:
+            series = self._series[key, name] = RingBuffer(self._size)
+        series.append(value, timestamp)
+
+    def start(self) -> None:
+        """Starts polling in a background thread, until `stop()` is called."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            started = time.monotonic()
+            self.poll()
+            # Polls start at a fixed rate, however long each one takes
+            elapsed = time.monotonic() - started
+            self._stopped.wait(max(self._interval - elapsed, 0.0))
+
+    def stop(self) -> None:
+        """Stops polling, waiting for the current poll to finish."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _key(self, device: str | DeviceKey) -> DeviceKey:
+        """Returns the key of a router given by its key or by its host.
+
+        Raises:
+            ValueError: If the host is shared by many routers.
+        """
+        if not isinstance(device, str):
+            return tuple(device)
+        keys = [key for key in self._fleet.keys if key[0] == device]
+        if len(keys) > 1:
+            raise ValueError(
+                f'{device} is the host of {len(keys)} routers, give the '
+                f'(host, port, username) of one of them'
+            )
+        return keys[0] if keys else (device, 0, '')
+
+    def metrics(self, device: str | DeviceKey) -> list[str]:
+        """Returns the names of the metrics sampled from a router.
+
+        Args:
+            device (str | tuple): Key of the router, or its host.
+
+        Returns:
+            list[str]: Names of the metrics (e.g. 'cpu_load', 'ether1.rx-bps').
+        """
+        device = self._key(device)
+        with self._lock:
+            return [name for key, name in self._series if key == device]
+
+    def series(
+        self, device: str | DeviceKey, metric: str
+    ) -> RingBuffer | None:
+        """Returns the samples of a metric of a router.
+
+        Args:
+            device (str | tuple): Key of the router, or its host.
+            metric (str): Name of the metric.
+
+        Returns:
+            RingBuffer | None: Copy of the samples, which later polls do not
+                change, None if it was never sampled.
+        """
+        key = self._key(device)
+        with self._lock:
+            series = self._series.get((key, metric))
+            return None if series is None else series.copy()
+
+    def aggregate(
+        self,
+        device: str | DeviceKey,
+        metric: str,
+        seconds: float | None = None,
+    ) -> Aggregate | None:
+        """Summarizes a metric of a router over the last seconds.
+
+        Args:
+            device (str | tuple): Key of the router, or its host.
+            metric (str): Name of the metric.
+            seconds (float): Length of the window, all samples if None.
+
+        Returns:
+            Aggregate | None: Count, min, max, mean and p95 of the window,
+                None if there are no samples in it.
+        """
+        key = self._key(device)
+        with self._lock:
+            series = self._series.get((key, metric))
+            return None if series is None else series.aggregate(seconds)
+
+    def summary(
+        self, seconds: float | None = None
+    ) -> dict[tuple[DeviceKey, str], Aggregate]:
+        """Summarizes every metric of every router over the last seconds.
+
+        Args:
+            seconds (float): Length of the window, all samples if None.
+
+        Returns:
+            dict: `Aggregate` of each `(key, metric)` with samples in the
+                window, where `key` is the `device_key` of the router.
+        """
+        now = time.time()
+        with self._lock:
+            aggregates = {
+                key: series.aggregate(seconds, now)
+                for key, series in self._series.items()
+            }
+        return {
+            key: aggregate
+            for key, aggregate in aggregates.items()
+            if aggregate is not None
+        }
@@ -1,4 +1,46 @@
+import re
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import Any, NamedTuple
+
+from netmikro.exceptions import ConfigError
+from netmikro.facts import FactCache
 from netmikro.modules import Ip, System
+from netmikro.modules.ip import SERVICE_NAMES, IpService
+from netmikro.transports import ConnectionPool, Transport
+from netmikro.utils import (
+    ConfigTree,
+    Hook,
+    PrintParser,
+    Row,
+    cached,
+    format_value,
+    typed_value,
+)
+
+_PIPELINE_MARKER = re.compile(r'<netmikro:(\d+)>')
+
+# Line printed after the last command of a script typed at once, it is built
+# by concatenation on the router so only its output matches
+_SCRIPT_END = '<netmikro:end>'
+_SCRIPT_END_COMMAND = ':put ("<net" . "mikro:end>")'
+
+
+class CommandOutput(NamedTuple):
+    """Output of one of the commands run by `cmd_pipeline()`.
+
+    Attributes:
+        command (str): Command that was executed.
+        output (str): Output of the command.
+        elapsed (float): Seconds between the end of the previous command and
+            the end of this one, as seen by Netmikro.
+    """
+
+    command: str
+    output: str
+    elapsed: float
 
 
 # noinspection PyUnresolvedReferences
@@ -17,13 +59,23 @@ class RouterOS(Ip, System):
         'name: Netmikro'
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         host: str,
         username: str,
         password: str,
         ssh_port: int = 22,
-        delay: float = 0,
+        delay: float | str = 0,
+        *,
+        transport: Transport = 'ssh',
+        api_port: int | None = None,
+        pool: ConnectionPool | None = None,
+        cache_ttl: float | dict[str, float] | None = None,
+        cache_size: int = 128,
+        hooks: Iterable[Hook] = (),
+        trusted: bool = False,
+        channels: int = 1,
+        facts: FactCache | None = None,
     ):
         """Class that generates the connection with a MikroTik router.
 
@@ -32,9 +84,55 @@ class RouterOS(Ip, System):
             username (str): Username to be used in the connection.
             password (str): Password to be used in the connection.
             ssh_port (int): SSH port to be used in the connection.
-            delay (float): Time delay between command executions on the router.
+            delay (float | str): Time delay between command executions on
+                the router, or 'auto' to stretch the read timeout of slow
+                commands and back off after timeouts.
+            transport (Transport): How to talk to the router: 'ssh'
+                (terminal), 'api' or 'api-ssl' (RouterOS API), 'fake'
+                (in-process simulator) or a function that opens the
+                connection (e.g. a `FakeRouter`).
+            api_port (int): Port of the API service, by default the port of
+                the chosen API service. Ignored by the 'ssh' transport.
+            pool (ConnectionPool): Pool to borrow the connection from, it is
+                given back to the pool on `disconnect()`.
+            cache_ttl (float | dict): Seconds the result of read-only getters
+                is cached, or a mapping of getter names to seconds to cache
+                only those getters. Nothing is cached by default.
+            cache_size (int): Maximum number of cached results.
+            hooks (Iterable[Hook]): Functions called with the
+                `CommandEvent` of every connection and command, e.g. a
+                `MetricsCollector`.
+            trusted (bool): Build the records read from the router (e.g.
+                `IpService`) without validating them again, which saves CPU
+                when polling many routers. Values given to setters are
+                always validated.
+            channels (int): Number of reads run at the same time on
+                their own SSH exec channels, over the connection already
+                authenticated, so independent getters called from
+                different threads (or by `gather()`) run in parallel.
+                Commands that change the router still wait for the
+                terminal, one at a time.
+            facts (FactCache): Persistent cache of `resources`,
+                `routerboard` and `license`, which are then taken from the
+                cache while the version, board and boot time of the router
+                are the same, at the cost of one command.
         """
-        super().__init__(host, username, password, ssh_port, delay)
+        super().__init__(
+            host,
+            username,
+            password,
+            ssh_port,
+            delay,
+            transport=transport,
+            api_port=api_port,
+            pool=pool,
+            cache_ttl=cache_ttl,
+            cache_size=cache_size,
+            hooks=hooks,
+            trusted=trusted,
+            channels=channels,
+            facts=facts,
+        )
 
         self._username = username
         self._host = host
@@ -45,11 +143,39 @@ class RouterOS(Ip, System):
         Examples:
             >>> router.disconnect()
         """
-        return self._connection.disconnect()
+        return self._close_connection()
+
+    def cache_clear(self, *names: str) -> None:
+        """Forgets cached values so they are read again from the router.
+
+        Clears the results of cached getters and the attributes loaded on
+        first access (e.g. `identity`, `service`).
+
+        Args:
+            *names (str): Names of the getters or attributes, all if empty.
+
+        Examples:
+            >>> router.cache_clear('ntp_server_get', 'service')
+        """
+        lazy = {
+            name
+            for cls in type(self).__mro__
+            for name, value in vars(cls).items()
+            if isinstance(value, cached_property)
+        }
+        for name in (lazy & set(names)) if names else lazy:
+            self.__dict__.pop(name, None)
+
+        self._generations.bump(*names)
+        if self._cache is not None:
+            self._cache.invalidate(*names)
 
     def cmd(self, command: str) -> str:
         """Runs a command in the router's terminal.
 
+        Commands that ask for a confirmation (e.g. `/system reboot`) are
+        declined, see `SSHConnection.send_command`.
+
         Args:
             command (str): Command to be executed.
 
@@ -60,18 +186,224 @@ class RouterOS(Ip, System):
             >>> router.cmd('/system identity print')
             'name: Netmikro'
         """
-        # The `expect_string` parameter is a regex (format: [admin@mikrotik])
-        # necessary in case the router's identity is changed,
-        # there is no ReadTimeout error due to the output format changing,
-        # as it includes the router's identity
-        return self._connection.send_command(
-            command_string=command,
-            expect_string=rf'\[{self._username}@[^]]+\]',
-        )
+        # The end of the output is found by the sentinel printed after the
+        # command, so changing the identity (part of the prompt) is safe
+        return self._send('send_command', command_string=command)
+
+    def gather(self, *names: str) -> dict[str, Any]:
+        """Reads getters and lazy attributes at the same time.
+
+        Each name is read in a thread of its own, so with `channels` above
+        1 their commands run in parallel on separate exec channels and the
+        whole read takes about as long as the slowest command.
+
+        Args:
+            *names (str): Names of getters without arguments (e.g.
+                'health_temperature') or of lazy attributes (e.g.
+                'resources').
+
+        Returns:
+            dict: Value of each name.
+
+        Examples:
+            >>> router = RouterOS('192.168.3.3', 'user', 'password', channels=4)
+            >>> router.gather('health_temperature', 'ntp_client_get')
+            {'health_temperature': 37.0, 'ntp_client_get': NTPClient(...)}
+        """
+
+        def read(name: str) -> Any:
+            value = getattr(self, name)
+            return value() if callable(value) else value
+
+        workers = max(min(self._channels, len(names)), 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {name: executor.submit(read, name) for name in names}
+        return {name: future.result() for name, future in futures.items()}
+
+    def cmd_stream(self, command: str) -> Iterator[str]:
+        """Runs a command and yields its output line by line as it arrives.
+
+        Unlike `cmd()`, the output is never kept whole in memory, which
+        matters for commands that print huge tables. The connection is held
+        until the loop ends or the iterator is closed.
+
+        Args:
+            command (str): Command to be executed.
+
+        Yields:
+            str: Lines of the output.
+
+        Examples:
+            >>> for line in router.cmd_stream('/ip route print terse'):
+            ...     print(line)
+             0  ADC  dst-address=192.168.88.0/24 gateway=bridge
+        """
+        return self._iter_lines(command)
+
+    def iter_print(
+        self,
+        path: str,
+        *options: str,
+        convert: Callable[[str], Any] = typed_value,
+    ) -> Iterator[Row]:
+        """Prints a menu and yields its items as they arrive.
+
+        The output is parsed by `PrintParser` while it is received, so the
+        memory used is the same no matter how big the table is. `terse`
+        is the most compact output to be transferred and parsed.
+
+        Args:
+            path (str): Menu to be printed (e.g. '/ip route').
+            *options (str): Options of the print command (e.g. 'terse',
+                'detail', 'where dynamic').
+            convert (Callable): Function applied to each value, see
+                `PrintParser`.
+
+        Yields:
+            Row: Each item of the menu.
 
-    def cmd_multiline(self, *args) -> str:
+        Examples:
+            >>> for row in router.iter_print('/ip arp', 'terse'):
+            ...     print(row.values['address'], row.values['mac-address'])
+            192.168.88.10 AA:BB:CC:DD:EE:FF
+        """
+        command = ' '.join([path, 'print', *options, 'without-paging'])
+        return iter(PrintParser(self._iter_lines(command), convert))
+
+    @cached
+    def config(self, *sections: str, verbose: bool = True) -> ConfigTree:
+        """Reads the configuration with `export` and parses it.
+
+        The whole configuration, or the chosen sections, is read in a
+        single round trip and parsed while it is received, then any value
+        can be looked up in the returned `ConfigTree` without asking the
+        router again. With `verbose` the default values are exported too,
+        and the attributes `identity`, `note` and `service` are filled from
+        the export when it includes their menus.
+
+        Args:
+            *sections (str): Menus to be exported (e.g. '/ip service'), the
+                whole configuration if empty.
+            verbose (bool): Export the default values too.
+
+        Returns:
+            ConfigTree: Parsed configuration.
+
+        Examples:
+            >>> config = router.config('/ip service', '/system ntp')
+            >>> config.get('/system ntp client', 'enabled')
+            True
+            >>> config.get('/ip service', 'port', item='winbox')
+            8291
+        """
+        options = 'export terse verbose' if verbose else 'export terse'
+        commands = [f'{section} {options}' for section in sections]
+        if not commands:
+            tree = ConfigTree(self._iter_lines(f'/{options}'))
+        elif len(commands) == 1:
+            tree = ConfigTree(self._iter_lines(commands[0]))
+        else:
+            # The exports are typed at once, so the end of the last one is
+            # marked by the script
+            commands.append(_SCRIPT_END_COMMAND)
+            tree = ConfigTree(
+                self._iter_lines('\n'.join(commands), end=_SCRIPT_END)
+            )
+
+        if verbose:
+            self._load_config(tree)
+        return tree
+
+    def apply_config(
+        self,
+        desired: dict[str, dict[str, Any]],
+        current: ConfigTree | None = None,
+    ) -> list[str]:
+        """Brings the configuration to a desired state with minimal changes.
+
+        The desired state is compared with the current configuration, read
+        with `config()` (from the cache, if enabled) unless it is given,
+        and only the values that differ become commands. All commands are
+        sent as a single script, so a router that is already in the desired
+        state costs only the export, and one that is not costs one more
+        round trip however many values change.
+
+        The commands run in order and are not rolled back if one of them
+        fails: the error is raised after the script ends.
+
+        Args:
+            desired (dict): Desired state of each menu by path, see
+                `ConfigTree.diff`.
+            current (ConfigTree): Current configuration, read from the
+                router if not given.
+
+        Returns:
+            list[str]: Commands that were run, empty if nothing changed.
+
+        Raises:
+            ConfigError: If the router printed an error for any command.
+
+        Examples:
+            >>> router.apply_config({
+            ...     '/system ntp client': {
+            ...         'enabled': True,
+            ...         'servers': ['200.160.7.186', '201.49.148.135'],
+            ...     },
+            ...     '/ip service': {'telnet': {'disabled': True}},
+            ... })
+            ['/ip service set [ find name=telnet ] disabled=yes']
+        """
+        if current is None:
+            current = self.config(*desired)
+        commands = current.diff(desired)
+        if not commands:
+            return []
+
+        script = '\n'.join([*commands, _SCRIPT_END_COMMAND])
+        try:
+            # `set`, `add` and `remove` print nothing unless they fail
+            errors = [
+                line.strip()
+                for line in self._iter_lines(script, end=_SCRIPT_END)
+                if line.strip() and line.strip() != _SCRIPT_END
+            ]
+        finally:
+            self.cache_clear()
+        if errors:
+            raise ConfigError('\n'.join(errors))
+        return commands
+
+    def _load_config(self, tree: ConfigTree) -> None:
+        """Fills the attributes loaded on first access from an export."""
+        if '/system identity' in tree:
+            name = tree.get('/system identity', 'name')
+            self.__dict__['identity'] = format_value(name)
+        if '/system note' in tree:
+            self.__dict__['note'] = format_value(
+                tree.get('/system note', 'note')
+            )
+
+        if '/ip service' not in tree:
+            return
+        section = tree['/ip service']
+        items = {name: section.item(name) for name in SERVICE_NAMES}
+        if all(items.values()):
+            self.__dict__['service'] = {
+                name: self._record(
+                    IpService,
+                    port=item['port'],
+                    disabled=item['disabled'],
+                    available_from=format_value(item.get('address')),
+                )
+                for name, item in items.items()
+            }
+
+    def cmd_multiline(self, *args: str) -> str:
         """Runs multiple commands in the router's terminal.
 
+        The commands are sent one at a time, waiting for the prompt after
+        each one, and the output of all of them is returned together.
+
         Args:
             *args (str): List of commands to be executed.
 
@@ -79,11 +411,68 @@ class RouterOS(Ip, System):
             str: Output of the commands.
 
         Examples:
-            >>> router.cmd_multiline([
+            >>> print(router.cmd_multiline(
             ...     '/system identity print',
-            ...     '/system note print'
-            ... ])
-            ['name: Netmikro', 'note: Test']
+            ...     '/system note print',
+            ... ))
+            name: Netmikro
+            note: Test
         """
         commands = [x for x in args]
-        return self._connection.send_multiline(commands)
+        return self._send('send_multiline', commands)
+
+    def cmd_pipeline(self, *args: str) -> list[CommandOutput]:
+        """Runs multiple commands at once and returns the output of each one.
+
+        All commands are sent at once, each followed by a marker that the
+        router prints when it finishes, so there is a single wait for the
+        whole list. The output of each command is returned separately with
+        the time it took. The commands must be independent: a command does
+        not wait for the previous one to be confirmed before being sent.
+
+        Args:
+            *args (str): List of commands to be executed.
+
+        Returns:
+            list[CommandOutput]: Output of each command.
+
+        Examples:
+            >>> router.cmd_pipeline(
+            ...     '/system identity print',
+            ...     '/system note print',
+            ... )
+            [CommandOutput(command='/system identity print', output='name: Netmikro', elapsed=0.012), ...]
+        """
+        commands = list(args)
+        if not commands:
+            return []
+
+        # The marker is built by concatenation on the router, so only its
+        # output, never its echo, matches `_PIPELINE_MARKER`
+        script = '\n'.join(
+            f'{command}\n:put ("<net" . "mikro:{index}>")'
+            for index, command in enumerate(commands)
+        )
+        end = f'<netmikro:{len(commands) - 1}>'
+
+        results = []
+        output: list[str] = []
+        last = time.perf_counter()
+        for line in self._iter_lines(script, end=end):
+            marker = _PIPELINE_MARKER.fullmatch(line.strip())
+            if marker is None:
+                output.append(line)
+                continue
+
+            now = time.perf_counter()
+            results.append(
+                CommandOutput(
+                    command=commands[int(marker[1])],
+                    output='\n'.join(output).strip(),
+                    elapsed=now - last,
+                )
+            )
+            output = []
+            last = now
+
+        return results
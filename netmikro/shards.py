@@ -0,0 +1,283 @@
+import multiprocessing
+import os
+import pickle
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import replace
+from multiprocessing.connection import Connection, wait
+from threading import Lock
+from typing import Any
+
+from netmikro.dataset import FleetDataset
+from netmikro.exceptions import WorkerError
+from netmikro.fleet import FleetResult, Operation, RouterFleet
+
+# Results are sent to the parent in batches, which saves a round trip
+# through the pipe (and its pickling overhead) per router
+_BATCH_SIZE = 64
+_DONE = 'done'
+# Seconds `close()` waits for the workers to disconnect their routers
+# before terminating them
+_JOIN_TIMEOUT = 10.0
+
+
+def _portable(result: FleetResult) -> FleetResult:
+    """Replaces the error of a result if it can not be sent by the pipe."""
+    if result.error is None:
+        return result
+    try:
+        pickle.dumps(result.error)
+    except Exception:
+        error = WorkerError(f'{type(result.error).__name__}: {result.error}')
+        return replace(result, error=error)
+    return result
+
+
+def _send_results(
+    connection: Connection, results: Iterator[FleetResult]
+) -> None:
+    """Sends results to the parent in batches, followed by `_DONE`."""
+    batch = []
+    for result in results:
+        batch.append(_portable(result))
+        if len(batch) >= _BATCH_SIZE:
+            connection.send((None, batch))
+            batch = []
+    connection.send((None, batch))
+    connection.send((_DONE, None))
+
+
+def _serve(
+    shard: list[dict], max_workers: int, connection: Connection
+) -> None:
+    """Runs the requests of the parent on a shard, in a worker process.
+
+    Each request is the name of a `RouterFleet` method with its arguments,
+    or None to stop. Results of the methods that yield `FleetResult`s are
+    sent in batches followed by `_DONE`, other values are sent at once.
+    """
+    with RouterFleet(shard, max_workers) as fleet:
+        while (request := connection.recv()) is not None:
+            name, args, kwargs = request
+            try:
+                value = getattr(fleet, name)(*args, **kwargs)
+                if isinstance(value, Iterator):
+                    _send_results(connection, value)
+                else:
+                    connection.send((_DONE, value))
+            except Exception as error:  # noqa: BLE001
+                connection.send((_DONE, WorkerError(repr(error))))
+
+
+class ShardedFleet:
+    """Runs operations on a fleet split across many processes.
+
+    The inventory is split in shards, one per worker process, and each
+    worker keeps a `RouterFleet` with the `RouterOS` sessions of its shard
+    between operations. Parsing the output and validating the records runs
+    in the workers, so the work scales with the number of cores instead of
+    being limited by the GIL of a single process.
+
+    Results are sent to the parent in pickled batches, and datasets are
+    built in the workers and sent as whole columns (`array`s of doubles are
+    pickled as raw bytes), then joined by `FleetDataset.concat`.
+
+    Operations must be picklable: names of `RouterOS` methods, or functions
+    defined at the top level of a module. One operation runs at a time: an
+    operation started while the results of another are still being read
+    raises `RuntimeError`.
+
+    Args:
+        inventory (Iterable[dict]): Arguments used to create the `RouterOS`
+            of each router, see `RouterFleet`.
+        processes (int): Number of worker processes, the number of CPUs by
+            default, never more than the number of routers.
+        max_workers (int): Maximum number of routers handled at the same
+            time by each process.
+        start_method (str): How the processes are started ('fork', 'spawn'
+            or 'forkserver'), the default of the platform if None.
+
+    Examples:
+        >>> from netmikro import ShardedFleet
+        >>> with ShardedFleet(inventory, processes=8) as fleet:
+        ...     dataset = fleet.dataset()
+        >>> dataset.count_by('resources.version')
+        {'7.12 (stable)': 18400, '7.11.2 (stable)': 1600}
+    """
+
+    def __init__(
+        self,
+        inventory: Iterable[dict],
+        processes: int | None = None,
+        max_workers: int = 32,
+        start_method: str | None = None,
+    ):
+        inventory = [dict(device) for device in inventory]
+        processes = max(
+            min(processes or os.cpu_count() or 1, len(inventory)), 1
+        )
+        self._hosts = [device['host'] for device in inventory]
+        self._lock = Lock()
+        self._busy = False
+        self._workers: list[tuple[multiprocessing.Process, Connection]] = []
+
+        context = multiprocessing.get_context(start_method)
+        for index in range(processes):
+            parent, child = context.Pipe()
+            process = context.Process(
+                target=_serve,
+                args=(inventory[index::processes], max_workers, child),
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            self._workers.append((process, parent))
+
+    def __enter__(self) -> 'ShardedFleet':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def hosts(self) -> list[str]:
+        """Hosts of all routers in the inventory."""
+        return list(self._hosts)
+
+    @staticmethod
+    def _receive(connection: Connection) -> tuple[str | None, Any]:
+        try:
+            return connection.recv()
+        except EOFError as error:
+            raise WorkerError(
+                'A worker process exited unexpectedly'
+            ) from error
+
+    def _replies(
+        self, name: str, *args, **kwargs
+    ) -> Iterator[tuple[bool, Any]]:
+        """Sends a request to every worker and yields their replies.
+
+        The workers are claimed while the replies are read, without holding
+        the lock between them, so a caller that keeps the iterator does not
+        block other threads.
+
+        Yields:
+            tuple: `(False, batch)` for each batch of results and `(True,
+                value)` for the value returned by each worker, as they
+                arrive from any worker.
+
+        Raises:
+            RuntimeError: If the replies of another request are being read.
+        """
+        with self._lock:
+            if self._busy:
+                raise RuntimeError('Another operation is running on the fleet')
+            self._busy = True
+
+        pending = []
+        try:
+            for _, connection in self._workers:
+                connection.send((name, args, kwargs))
+                pending.append(connection)
+            while pending:
+                for connection in wait(pending):
+                    status, value = self._receive(connection)
+                    if status is None:
+                        yield False, value
+                        continue
+                    pending.remove(connection)
+                    if isinstance(value, WorkerError):
+                        raise value
+                    yield True, value
+        finally:
+            try:
+                # Replies left by a caller that stopped early would be read
+                # as the replies of the next request
+                for connection in pending:
+                    while self._receive(connection)[0] is None:
+                        pass
+            finally:
+                with self._lock:
+                    self._busy = False
+
+    def run(
+        self, operation: Operation, *args, **kwargs
+    ) -> Iterator[FleetResult]:
+        """Runs an operation on every router of the fleet.
+
+        Results are yielded as soon as each batch arrives, so the order is
+        not the same as the inventory. Errors that can not be sent back by
+        the worker are replaced by a `WorkerError` with their description.
+
+        Args:
+            operation (str | Callable): Name of a `RouterOS` method, or a
+                picklable function that receives the `RouterOS` as first
+                argument.
+            *args: Positional arguments of the operation.
+            **kwargs: Keyword arguments of the operation.
+
+        Yields:
+            FleetResult: Result of the operation on each router.
+
+        Raises:
+            WorkerError: If a worker process fails.
+        """
+        for final, batch in self._replies('run', operation, *args, **kwargs):
+            if not final:
+                yield from batch
+
+    def cmd(self, command: str) -> Iterator[FleetResult]:
+        """Runs a command in the terminal of every router of the fleet.
+
+        Args:
+            command (str): Command to be executed.
+
+        Yields:
+            FleetResult: Output of the command on each router.
+        """
+        return self.run('cmd', command)
+
+    def snapshots(self) -> Iterator[FleetResult]:
+        """Collects the `Snapshot` of every router of the fleet.
+
+        Yields:
+            FleetResult: Snapshot of each router.
+        """
+        return self.run('snapshot')
+
+    def dataset(self) -> FleetDataset:
+        """Collects the snapshots of the fleet as a columnar dataset.
+
+        Each worker builds the dataset of its shard, so only the columns
+        are sent back. Routers whose snapshot failed are left out.
+
+        Returns:
+            FleetDataset: One row per router.
+
+        Raises:
+            WorkerError: If a worker process fails.
+        """
+        return FleetDataset.concat(
+            dataset for final, dataset in self._replies('dataset') if final
+        )
+
+    def close(self) -> None:
+        """Disconnects all routers and stops the worker processes.
+
+        Workers that do not stop within `_JOIN_TIMEOUT` seconds (e.g. still
+        waiting for a router) are terminated.
+        """
+        workers, self._workers = self._workers, []
+        for _, connection in workers:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+        deadline = time.monotonic() + _JOIN_TIMEOUT
+        for process, connection in workers:
+            process.join(max(deadline - time.monotonic(), 0))
+            if process.is_alive():
+                process.terminate()
+                process.join()
+            connection.close()
@@ -0,0 +1,19 @@
+from .api import ApiConnection, AsyncApiConnection
+from .connection import (
+    DEFAULT_PORTS,
+    AsyncConnection,
+    AsyncTransport,
+    Connection,
+    Transport,
+    create_async_connection,
+    create_connection,
+    register_transport,
+)
+from .fake import (
+    DEFAULT_MENUS,
+    AsyncFakeConnection,
+    FakeConnection,
+    FakeRouter,
+)
+from .pool import ConnectionPool
+from .ssh import SSHConnection
@@ -0,0 +1,584 @@
+import asyncio
+import socket
+import ssl
+from collections.abc import Generator, Iterator, Sequence
+
+from netmikro.exceptions import ApiError
+from netmikro.utils.metrics import ChannelMeter
+from netmikro.validators import Auth
+
+API_PORT = 8728
+API_SSL_PORT = 8729
+
+
+def encode_length(length: int) -> bytes:
+    """Encodes the length of a word of the RouterOS API.
+
+    Args:
+        length (int): Length of the word in bytes.
+
+    Returns:
+        bytes: Length encoded with 1 to 5 bytes.
+    """
+    if length < 0x80:  # noqa: PLR2004
+        return length.to_bytes(1, 'big')
+    if length < 0x4000:  # noqa: PLR2004
+        return (length | 0x8000).to_bytes(2, 'big')
+    if length < 0x200000:  # noqa: PLR2004
+        return (length | 0xC00000).to_bytes(3, 'big')
+    if length < 0x10000000:  # noqa: PLR2004
+        return (length | 0xE0000000).to_bytes(4, 'big')
+    return b'\xf0' + length.to_bytes(4, 'big')
+
+
+def length_prefix(first: int) -> tuple[int, int]:
+    """Decodes the first byte of the length of a word of the RouterOS API.
+
+    Args:
+        first (int): First byte of the length.
+
+    Returns:
+        tuple: Bits of the first byte that are part of the length, and the
+            number of bytes of the length that follow it.
+    """
+    if first < 0x80:  # noqa: PLR2004
+        return first, 0
+    if first < 0xC0:  # noqa: PLR2004
+        return first & 0x3F, 1
+    if first < 0xE0:  # noqa: PLR2004
+        return first & 0x1F, 2
+    if first < 0xF0:  # noqa: PLR2004
+        return first & 0x0F, 3
+    return 0, 4
+
+
+def encode_sentence(*words: str) -> bytes:
+    """Encodes a sentence of the RouterOS API.
+
+    Args:
+        *words (str): Words of the sentence (e.g. '/system/identity/print').
+
+    Returns:
+        bytes: Sentence ready to be written in the socket.
+    """
+    sentence = b''
+    for word in words:
+        data = word.encode()
+        sentence += encode_length(len(data)) + data
+    return sentence + b'\x00'
+
+
+def execute_words(command_string: str) -> tuple[str, ...]:
+    """Returns the sentence that runs a terminal command through the API.
+
+    The command is executed as a script with `/execute as-string`,
+    `return` commands are converted to `:put` so their value is printed.
+
+    Args:
+        command_string (str): Command to be executed.
+
+    Returns:
+        tuple: Words of the sentence.
+    """
+    command = command_string.strip()
+    if command.startswith('return '):
+        command = f':put {command.removeprefix("return ")}'
+    return '/execute', f'=script={command}', '=as-string='
+
+
+def execute_output(replies: Sequence[dict[str, str]]) -> str:
+    """Returns the output of a command run with `execute_words`.
+
+    Args:
+        replies (Sequence[dict]): Replies to the sentence.
+
+    Returns:
+        str: Output of the command.
+    """
+    output = ''.join(reply.get('ret', '') for reply in replies)
+    return output.replace('\r\n', '\n').strip()
+
+
+def parse_attributes(words: Sequence[str]) -> dict[str, str]:
+    """Converts the attribute words of a reply (`=name=value`) to a dict.
+
+    Args:
+        words (Sequence[str]): Words of a reply, without the reply type.
+
+    Returns:
+        dict: Attributes of the reply.
+    """
+    attributes = {}
+    for word in words:
+        if word.startswith('='):
+            name, _, value = word[1:].partition('=')
+            attributes[name] = value
+    return attributes
+
+
+class ApiConnection:
+    """Connection with the RouterOS API (`/ip service` api and api-ssl).
+
+    Replies are structured key/value sentences, so there is no prompt to be
+    matched nor any delay between commands. The data written and read is
+    measured in `meter`.
+
+    Args:
+        sock (socket.socket): Socket connected to the API service.
+    """
+
+    def __init__(self, sock: socket.socket):
+        self._socket = sock
+        self.meter = ChannelMeter()
+
+    @classmethod
+    def connect(  # noqa: PLR0913
+        cls,
+        host: str,
+        username: str,
+        password: str,
+        port: int = API_PORT,
+        *,
+        use_ssl: bool = False,
+        timeout: float = 10,
+    ) -> 'ApiConnection':
+        """Opens a connection with the API service and logs in.
+
+        Args:
+            host (str): IP address of the router.
+            username (str): Username to be used in the connection.
+            password (str): Password to be used in the connection.
+            port (int): Port of the API service.
+            use_ssl (bool): Whether the connection uses TLS (api-ssl).
+            timeout (float): Time limit in seconds to wait for the router.
+
+        Returns:
+            ApiConnection: Logged in connection.
+        """
+        sock = socket.create_connection((host, port), timeout=timeout)
+        if use_ssl:
+            # RouterOS usually serves api-ssl with a self signed certificate
+            context = ssl.create_default_context()
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+            sock = context.wrap_socket(sock, server_hostname=host)
+
+        connection = cls(sock)
+        connection.login(username, password)
+        return connection
+
+    def _read(self, size: int) -> bytes:
+        data = b''
+        while len(data) < size:
+            chunk = self._socket.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError('Connection closed by the router')
+            self.meter.received(len(chunk))
+            data += chunk
+        return data
+
+    def _read_length(self) -> int:
+        high, size = length_prefix(self._read(1)[0])
+        return int.from_bytes(bytes([high]) + self._read(size), 'big')
+
+    def read_sentence(self) -> list[str]:
+        """Reads a sentence sent by the router.
+
+        Returns:
+            list[str]: Words of the sentence.
+        """
+        words = []
+        while length := self._read_length():
+            words.append(self._read(length).decode(errors='replace'))
+        return words
+
+    def talk(self, *words: str) -> list[dict[str, str]]:
+        """Sends a sentence and reads the whole reply.
+
+        Args:
+            *words (str): Words of the sentence, the command followed by
+                its attributes (e.g. '/ip/service/print', '?name=api').
+
+        Returns:
+            list[dict]: Attributes of each `!re` reply, followed by the
+                attributes of `!done` when it has any.
+
+        Raises:
+            ApiError: If the router replies with `!trap` or `!fatal`.
+
+        Examples:
+            >>> connection.talk('/system/identity/print')
+            [{'name': 'Netmikro'}]
+        """
+        return list(self.iter_talk(*words))
+
+    def iter_talk(self, *words: str) -> Iterator[dict[str, str]]:
+        """Sends a sentence and yields each reply as soon as it is read.
+
+        Args:
+            *words (str): Words of the sentence, the command followed by
+                its attributes (e.g. '/ip/route/print').
+
+        Yields:
+            dict: Attributes of each `!re` reply, followed by the attributes
+                of `!done` when it has any.
+
+        Raises:
+            ApiError: If the router replies with `!trap` or `!fatal`.
+        """
+        sentence = encode_sentence(*words)
+        self.meter.sent(len(sentence))
+        self._socket.sendall(sentence)
+
+        replies = self._read_replies()
+        try:
+            done, error = yield from replies
+        except GeneratorExit:
+            # The caller stopped early, the rest of the reply is read so it
+            # does not mix with the next command
+            while self.read_sentence()[:1] != ['!done']:
+                pass
+            raise
+
+        if error is not None:
+            raise ApiError(error)
+        if done:
+            yield done
+
+    def _read_replies(
+        self,
+    ) -> Generator[dict[str, str], None, tuple[dict[str, str], str | None]]:
+        """Yields the `!re` replies until `!done` is read.
+
+        Returns:
+            tuple: Attributes of `!done` and the message of `!trap`, if any.
+        """
+        error = None
+        while True:
+            reply_type, *attributes = self.read_sentence()
+            if reply_type == '!fatal':
+                raise ApiError(' '.join(attributes))
+            if reply_type == '!trap':
+                error = parse_attributes(attributes).get('message', '')
+            elif reply_type == '!re':
+                yield parse_attributes(attributes)
+            elif reply_type == '!done':
+                return parse_attributes(attributes), error
+
+    def login(self, username: str, password: str) -> None:
+        """Logs in on the API service (RouterOS v6.43 and later).
+
+        Args:
+            username (str): Username to be used in the connection.
+            password (str): Password to be used in the connection.
+        """
+        self.talk('/login', f'=name={username}', f'=password={password}')
+
+    def print(self, path: str, *proplist: str) -> list[dict[str, str]]:
+        """Returns the items of a menu as structured records.
+
+        Args:
+            path (str): Menu to be printed (e.g. '/ip service').
+            *proplist (str): Properties to be returned, all if empty.
+
+        Returns:
+            list[dict]: Properties of each item of the menu.
+
+        Examples:
+            >>> connection.print('/ip service', 'name', 'port')
+            [{'name': 'telnet', 'port': '23'}, ...]
+        """
+        command = '/' + '/'.join(path.strip('/ ').split()) + '/print'
+        words = [command]
+        if proplist:
+            words.append(f'=.proplist={",".join(proplist)}')
+        return self.talk(*words)
+
+    def send_command(
+        self, command_string: str, expect_string: str | None = None, **kwargs
+    ) -> str:
+        """Runs a terminal command through the API and returns its output.
+
+        Args:
+            command_string (str): Command to be executed, see
+                `execute_words`.
+            expect_string (str): Ignored, there is no prompt in the API.
+            **kwargs: Ignored, kept for compatibility with Netmiko.
+
+        Returns:
+            str: Output of the command.
+        """
+        return execute_output(self.talk(*execute_words(command_string)))
+
+    def iter_lines(self, command_string: str, **kwargs) -> Iterator[str]:
+        """Runs a terminal command and yields the lines of its output.
+
+        Args:
+            command_string (str): Command to be executed.
+            **kwargs: Ignored, kept for compatibility with `SSHConnection`.
+
+        Yields:
+            str: Lines of the output.
+        """
+        yield from self.send_command(command_string).splitlines()
+
+    def send_multiline(self, commands: Sequence[str], **kwargs) -> str:
+        """Runs multiple terminal commands through the API.
+
+        Args:
+            commands (Sequence[str]): Commands to be executed.
+            **kwargs: Ignored, kept for compatibility with Netmiko.
+
+        Returns:
+            str: Output of the commands.
+        """
+        return '\n'.join(self.send_command(command) for command in commands)
+
+    def is_alive(self) -> bool:
+        """Returns True if the router still answers on this connection."""
+        try:
+            self.talk('/system/identity/print')
+        except OSError:
+            return False
+        return True
+
+    def disconnect(self) -> None:
+        """Closes the connection with the API service."""
+        self._socket.close()
+
+
+class AsyncApiConnection:
+    """Asyncio connection with the RouterOS API.
+
+    Works like `ApiConnection`, but every read and write is awaited on the
+    event loop, so one loop can hold the connections of thousands of
+    routers without a thread for each one. Sentences are sent one at a
+    time: concurrent calls on the same connection wait for each other.
+
+    Args:
+        reader (asyncio.StreamReader): Stream the replies are read from.
+        writer (asyncio.StreamWriter): Stream the sentences are written to.
+    """
+
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        self._reader = reader
+        self._writer = writer
+        self._lock = asyncio.Lock()
+        self.meter = ChannelMeter()
+
+    @classmethod
+    async def connect(  # noqa: PLR0913
+        cls,
+        host: str,
+        username: str,
+        password: str,
+        port: int = API_PORT,
+        *,
+        use_ssl: bool = False,
+        timeout: float = 10,
+    ) -> 'AsyncApiConnection':
+        """Opens a connection with the API service and logs in.
+
+        Args:
+            host (str): IP address of the router.
+            username (str): Username to be used in the connection.
+            password (str): Password to be used in the connection.
+            port (int): Port of the API service.
+            use_ssl (bool): Whether the connection uses TLS (api-ssl).
+            timeout (float): Time limit in seconds to connect and log in.
+
+        Returns:
+            AsyncApiConnection: Logged in connection.
+        """
+        context = None
+        if use_ssl:
+            # RouterOS usually serves api-ssl with a self signed certificate
+            context = ssl.create_default_context()
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+
+        async with asyncio.timeout(timeout):
+            reader, writer = await asyncio.open_connection(
+                host, port, ssl=context
+            )
+            connection = cls(reader, writer)
+            await connection.login(username, password)
+        return connection
+
+    async def _read(self, size: int) -> bytes:
+        try:
+            data = await self._reader.readexactly(size)
+        except asyncio.IncompleteReadError as error:
+            raise ConnectionError('Connection closed by the router') from error
+        self.meter.received(len(data))
+        return data
+
+    async def _read_length(self) -> int:
+        high, size = length_prefix((await self._read(1))[0])
+        return int.from_bytes(bytes([high]) + await self._read(size), 'big')
+
+    async def read_sentence(self) -> list[str]:
+        """Reads a sentence sent by the router.
+
+        Returns:
+            list[str]: Words of the sentence.
+        """
+        words = []
+        while length := await self._read_length():
+            words.append((await self._read(length)).decode(errors='replace'))
+        return words
+
+    async def talk(self, *words: str) -> list[dict[str, str]]:
+        """Sends a sentence and reads the whole reply.
+
+        Args:
+            *words (str): Words of the sentence, the command followed by
+                its attributes (e.g. '/ip/service/print', '?name=api').
+
+        Returns:
+            list[dict]: Attributes of each `!re` reply, followed by the
+                attributes of `!done` when it has any.
+
+        Raises:
+            ApiError: If the router replies with `!trap` or `!fatal`.
+
+        Examples:
+            >>> await connection.talk('/system/identity/print')
+            [{'name': 'Netmikro'}]
+        """
+        sentence = encode_sentence(*words)
+        async with self._lock:
+            self.meter.sent(len(sentence))
+            self._writer.write(sentence)
+            await self._writer.drain()
+
+            replies = []
+            error = None
+            while True:
+                reply_type, *attributes = await self.read_sentence()
+                if reply_type == '!fatal':
+                    raise ApiError(' '.join(attributes))
+                if reply_type == '!trap':
+                    error = parse_attributes(attributes).get('message', '')
+                elif reply_type == '!re':
+                    replies.append(parse_attributes(attributes))
+                elif reply_type == '!done':
+                    done = parse_attributes(attributes)
+                    break
+
+        if error is not None:
+            raise ApiError(error)
+        if done:
+            replies.append(done)
+        return replies
+
+    async def login(self, username: str, password: str) -> None:
+        """Logs in on the API service (RouterOS v6.43 and later).
+
+        Args:
+            username (str): Username to be used in the connection.
+            password (str): Password to be used in the connection.
+        """
+        await self.talk('/login', f'=name={username}', f'=password={password}')
+
+    async def send_command(self, command_string: str, **kwargs) -> str:
+        """Runs a terminal command through the API and returns its output.
+
+        Args:
+            command_string (str): Command to be executed, see
+                `execute_words`.
+            **kwargs: Ignored, kept for compatibility with `ApiConnection`.
+
+        Returns:
+            str: Output of the command.
+        """
+        replies = await self.talk(*execute_words(command_string))
+        return execute_output(replies)
+
+    async def send_multiline(self, commands: Sequence[str], **kwargs) -> str:
+        """Runs multiple terminal commands through the API.
+
+        Args:
+            commands (Sequence[str]): Commands to be executed.
+            **kwargs: Ignored, kept for compatibility with `ApiConnection`.
+
+        Returns:
+            str: Output of the commands.
+        """
+        return '\n'.join([
+            await self.send_command(command) for command in commands
+        ])
+
+    async def is_alive(self) -> bool:
+        """Returns True if the router still answers on this connection."""
+        try:
+            await self.talk('/system/identity/print')
+        except OSError:
+            return False
+        return True
+
+    async def disconnect(self) -> None:
+        """Closes the connection with the API service."""
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except OSError:
+            pass
+
+
+def api_connection(auth: Auth) -> ApiConnection:
+    """Opens a connection with the `api` service of the router.
+
+    Args:
+        auth (Auth): Credentials necessary to connect to the router.
+
+    Returns:
+        ApiConnection: Logged in connection.
+    """
+    return ApiConnection.connect(
+        str(auth.host), auth.username, auth.password, auth.port
+    )
+
+
+def api_ssl_connection(auth: Auth) -> ApiConnection:
+    """Opens a connection with the `api-ssl` service of the router.
+
+    Args:
+        auth (Auth): Credentials necessary to connect to the router.
+
+    Returns:
+        ApiConnection: Logged in connection.
+    """
+    return ApiConnection.connect(
+        str(auth.host), auth.username, auth.password, auth.port, use_ssl=True
+    )
+
+
+async def async_api_connection(auth: Auth) -> AsyncApiConnection:
+    """Opens an asyncio connection with the `api` service of the router.
+
+    Args:
+        auth (Auth): Credentials necessary to connect to the router.
+
+    Returns:
+        AsyncApiConnection: Logged in connection.
+    """
+    return await AsyncApiConnection.connect(
+        str(auth.host), auth.username, auth.password, auth.port
+    )
+
+
+async def async_api_ssl_connection(auth: Auth) -> AsyncApiConnection:
+    """Opens an asyncio connection with the `api-ssl` service of the router.
+
+    Args:
+        auth (Auth): Credentials necessary to connect to the router.
+
+    Returns:
+        AsyncApiConnection: Logged in connection.
+    """
+    return await AsyncApiConnection.connect(
+        str(auth.host), auth.username, auth.password, auth.port, use_ssl=True
+    )
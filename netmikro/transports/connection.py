@@ -0,0 +1,137 @@
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Protocol
+
+from netmikro.exceptions import InvalidTransport
+from netmikro.transports.api import (
+    API_PORT,
+    API_SSL_PORT,
+    api_connection,
+    api_ssl_connection,
+    async_api_connection,
+    async_api_ssl_connection,
+)
+from netmikro.transports.fake import async_fake_connection, fake_connection
+from netmikro.transports.ssh import ssh_connection
+from netmikro.validators import Auth
+
+
+class Connection(Protocol):
+    """Interface used by Netmikro to talk to a router.
+
+    It is the subset of the Netmiko connection API that Netmikro relies on,
+    so `MikrotikRouterOsSSH` is a valid connection as it is. Connections
+    may also have `exec_command(command_string, meter=None, **kwargs)`,
+    which runs a command concurrently with others and counts its data in
+    its own `ChannelMeter`, used by `RouterOS(channels=...)`.
+    """
+
+    def send_command(
+        self, command_string: str, expect_string: str | None = None, **kwargs
+    ) -> str:
+        """Runs a command and returns its output."""
+
+    def send_multiline(self, commands: Sequence[str], **kwargs) -> str:
+        """Runs multiple commands and returns their output."""
+
+    def is_alive(self) -> bool:
+        """Returns True if the connection can still be used."""
+
+    def disconnect(self) -> None:
+        """Closes the connection."""
+
+
+class AsyncConnection(Protocol):
+    """Interface used by `AsyncRouterOS` to talk to a router."""
+
+    async def send_command(self, command_string: str, **kwargs) -> str:
+        """Runs a command and returns its output."""
+
+    async def send_multiline(self, commands: Sequence[str], **kwargs) -> str:
+        """Runs multiple commands and returns their output."""
+
+    async def is_alive(self) -> bool:
+        """Returns True if the connection can still be used."""
+
+    async def disconnect(self) -> None:
+        """Closes the connection."""
+
+
+_TRANSPORTS: dict[str, Callable[[Auth], Connection]] = {
+    'ssh': ssh_connection,
+    'api': api_connection,
+    'api-ssl': api_ssl_connection,
+    'fake': fake_connection,
+}
+
+_ASYNC_TRANSPORTS: dict[str, Callable[[Auth], Awaitable[AsyncConnection]]] = {
+    'api': async_api_connection,
+    'api-ssl': async_api_ssl_connection,
+    'fake': async_fake_connection,
+}
+
+DEFAULT_PORTS = {'api': API_PORT, 'api-ssl': API_SSL_PORT}
+
+# Name of a registered transport, or a factory of connections
+Transport = str | Callable[[Auth], Connection]
+AsyncTransport = str | Callable[[Auth], Awaitable[AsyncConnection]]
+
+
+def register_transport(
+    name: str, factory: Callable[[Auth], Connection]
+) -> None:
+    """Makes a transport available to be used by `RouterOS`.
+
+    Args:
+        name (str): Name of the transport (e.g. 'ssh').
+        factory (Callable): Function that receives the `Auth` of the router
+            and returns an open connection.
+    """
+    _TRANSPORTS[name] = factory
+
+
+def create_connection(transport: Transport, auth: Auth) -> Connection:
+    """Opens a connection with a router using the given transport.
+
+    Args:
+        transport (Transport): Name of the transport ('ssh', 'api',
+            'api-ssl' or 'fake'), or a function that receives the `Auth` of
+            the router and returns an open connection (e.g. a `FakeRouter`).
+        auth (Auth): Credentials necessary to connect to the router.
+
+    Returns:
+        Connection: Open connection with the router.
+
+    Raises:
+        InvalidTransport: If there is no transport with the given name.
+    """
+    if callable(transport):
+        return transport(auth)
+    if transport not in _TRANSPORTS:
+        raise InvalidTransport(f'Invalid transport: {transport}')
+    return _TRANSPORTS[transport](auth)
+
+
+async def create_async_connection(
+    transport: AsyncTransport, auth: Auth
+) -> AsyncConnection:
+    """Opens an asyncio connection with a router using the given transport.
+
+    Args:
+        transport (AsyncTransport): Name of the transport ('api', 'api-ssl'
+            or 'fake'), or a coroutine function that receives the `Auth` of
+            the router and returns an open connection (e.g.
+            `FakeRouter.connect_async`).
+        auth (Auth): Credentials necessary to connect to the router.
+
+    Returns:
+        AsyncConnection: Open connection with the router.
+
+    Raises:
+        InvalidTransport: If there is no asyncio transport with the given
+            name, e.g. 'ssh', whose connection is blocking.
+    """
+    if callable(transport):
+        return await transport(auth)
+    if transport not in _ASYNC_TRANSPORTS:
+        raise InvalidTransport(f'Invalid asyncio transport: {transport}')
+    return await _ASYNC_TRANSPORTS[transport](auth)
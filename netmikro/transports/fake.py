@@ -0,0 +1,826 @@
+import asyncio
+import copy
+import random
+import re
+import time
+from collections.abc import Iterator, Sequence
+from threading import Lock
+from typing import Any
+
+from netmikro.utils.metrics import ChannelMeter
+from netmikro.validators import Auth
+
+Menu = dict[str, str] | list[dict[str, str]]
+
+_COMMAND = re.compile(
+    r'/?([\w/ -]*?)[/ ]+(get|set|add|remove|print|export)\b\s*(.*)',
+    re.S,
+)
+_ATTRIBUTE = re.compile(r'([\w.-]+)=("(?:[^"\\]|\\.)*"|\S*)')
+_FIND = re.compile(r'\[\s*find\s+([\w-]+)=("(?:[^"\\]|\\.)*"|[^\s\]]*)\s*\]')
+_ESCAPE = re.compile(r'\\(.)')
+
+_FLAG_NAMES = {'X': 'DISABLED', 'U': 'UNDOABLE'}
+_LIST_PROPERTIES = {'servers', 'address'}
+_TEXT_PROPERTIES = {'comment', 'name', 'note'}
+_YES_NO = {'yes': 'true', 'no': 'false'}
+
+# Menus and properties that hold state instead of configuration, which
+# `export` leaves out
+_STATUS_MENUS = {
+    '/system health',
+    '/system history',
+    '/system license',
+    '/system resource',
+    '/system routerboard',
+}
+_SINGLE_MENUS_WITH_NAME = {'/system identity'}
+_STATUS_PROPERTIES = {
+    '/interface': {'type', 'rx-byte', 'tx-byte', 'running'},
+    '/system clock': {'time', 'date', 'gmt-offset', 'dst-active'},
+    '/system ntp client': {
+        'freq-drift',
+        'status',
+        'synced-server',
+        'synced-stratum',
+        'system-offset',
+    },
+}
+
+
+def _interface(name: str, kind: str = 'ether') -> dict[str, str]:
+    return {
+        'name': name,
+        'type': kind,
+        'mtu': '1500',
+        'rx-byte': '0',
+        'tx-byte': '0',
+        'running': 'true',
+        'disabled': 'false',
+    }
+
+
+def _service(name: str, port: int, disabled: bool = False) -> dict[str, str]:
+    return {
+        'name': name,
+        'port': str(port),
+        'address': '',
+        'disabled': 'true' if disabled else 'false',
+    }
+
+
+DEFAULT_MENUS: dict[str, Menu] = {
+    '/system identity': {'name': 'MikroTik'},
+    '/system note': {'note': '', 'show-at-login': 'false'},
+    '/system clock': {
+        'time': '12:00:00',
+        'date': '2024-01-01',
+        'time-zone-name': 'America/Sao_Paulo',
+        'gmt-offset': '-03:00',
+        'dst-active': 'false',
+        'time-zone-autodetect': 'true',
+    },
+    '/system health': [
+        {'name': 'voltage', 'value': '24.1', 'type': 'V'},
+        {'name': 'temperature', 'value': '37', 'type': 'C'},
+    ],
+    '/system resource': {
+        'uptime': '1d02:03:04',
+        'version': '7.12 (stable)',
+        'free-memory': '40763392',
+        'total-memory': '67108864',
+        'cpu': 'MIPS 74Kc V4.12',
+        'cpu-count': '1',
+        'cpu-frequency': '600',
+        'cpu-load': '2',
+        'free-hdd-space': '111235072',
+        'total-hdd-space': '134217728',
+        'architecture-name': 'mipsbe',
+        'board-name': 'RB951Ui-2HnD',
+        'platform': 'MikroTik',
+    },
+    '/system routerboard': {
+        'routerboard': 'true',
+        'model': 'RB951Ui-2HnD',
+        'revision': 'r2',
+        'serial-number': 'HE108GV1S3D',
+        'firmware-type': 'ar9340',
+        'factory-firmware': '3.41',
+        'current-firmware': '7.12',
+        'upgrade-firmware': '7.12',
+    },
+    '/system license': {
+        'software-id': 'E2VM-S6B8',
+        'nlevel': '4',
+        'features': '',
+    },
+    '/system ntp client': {
+        'enabled': 'true',
+        'mode': 'unicast',
+        'servers': '200.160.7.186;201.49.148.135',
+        'vrf': 'main',
+        'freq-drift': '3',
+        'status': 'synchronized',
+        'synced-server': '200.160.7.186',
+        'synced-stratum': '1',
+        'system-offset': '-1',
+    },
+    '/system ntp server': {
+        'enabled': 'false',
+        'broadcast': 'false',
+        'multicast': 'false',
+        'manycast': 'false',
+        'broadcast-address': '',
+        'vrf': 'main',
+    },
+    '/system history': [],
+    '/interface': [
+        _interface('ether1'),
+        _interface('ether2'),
+        _interface('bridge', 'bridge'),
+    ],
+    '/ip service': [
+        _service('telnet', 23),
+        _service('ftp', 21),
+        _service('www', 80),
+        _service('ssh', 22),
+        _service('www-ssl', 443, disabled=True),
+        _service('api', 8728),
+        _service('winbox', 8291),
+        _service('api-ssl', 8729),
+    ],
+}
+
+
+class _ScriptError(Exception):
+    """Error printed by the simulated router instead of the output."""
+
+
+class FakeRouter:
+    """In-process stand-in for a RouterOS router.
+
+    It understands the subset of the terminal language used by Netmikro:
+    `get`, `set`, `add`, `remove`, `print` and `export` on the menus of `DEFAULT_MENUS`, `return` and
+    `:put` expressions with `[...]` commands, `:tostr`, strings and `.`
+    concatenation, which covers the batched reads of `_get_batch` and the
+    markers of pipelined commands. Menus are shared by all connections
+    opened with the same `FakeRouter`, like on a real router.
+
+    Every command waits for `latency` seconds (plus or minus a random
+    `jitter`), which simulates the round trip to the router, and is counted
+    in `round_trips`, `bytes_sent` and `bytes_received`, so the cost of an
+    operation can be measured without hardware.
+
+    An instance is a transport, it can be given to `RouterOS` as it is or
+    registered with `register_transport`.
+
+    Args:
+        latency (float): Seconds each round trip takes.
+        jitter (float): Maximum random variation of `latency`, in seconds.
+        connect_latency (float): Seconds opening a connection takes.
+        menus (dict): Initial state of the menus, `DEFAULT_MENUS` by default.
+        seed (int): Seed of the jitter, for reproducible runs.
+
+    Examples:
+        >>> from netmikro import RouterOS
+        >>> from netmikro.transports import FakeRouter
+        >>> fake = FakeRouter(latency=0.02, jitter=0.005)
+        >>> router = RouterOS('192.0.2.1', 'admin', '', transport=fake)
+        >>> router.ntp_client_get().mode
+        'unicast'
+        >>> fake.round_trips
+        1
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        connect_latency: float = 0.0,
+        menus: dict[str, Menu] | None = None,
+        seed: int | None = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.connect_latency = connect_latency
+        self.menus = copy.deepcopy(DEFAULT_MENUS if menus is None else menus)
+        self._random = random.Random(seed)
+        self._lock = Lock()
+        self.connections = 0
+        self.round_trips = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def __call__(self, auth: Auth) -> 'FakeConnection':
+        """Opens a connection with the simulated router.
+
+        Args:
+            auth (Auth): Credentials of the router, the username is used
+                as the author of the changes in `/system history`.
+
+        Returns:
+            FakeConnection: Open connection.
+        """
+        time.sleep(self.connect_latency)
+        with self._lock:
+            self.connections += 1
+        return FakeConnection(self, auth.username)
+
+    def reset_stats(self) -> None:
+        """Sets the counters of connections, round trips and bytes to zero."""
+        with self._lock:
+            self.connections = 0
+            self.round_trips = 0
+            self.bytes_sent = 0
+            self.bytes_received = 0
+
+    def round_trip(self, script: str, username: str = 'admin') -> str:
+        """Runs a script as a single round trip and returns its output.
+
+        Args:
+            script (str): Commands to be executed, one per line.
+            username (str): User running the script.
+
+        Returns:
+            str: Output of the commands.
+        """
+        time.sleep(self._delay())
+        return self._run(script, username)
+
+    async def async_round_trip(
+        self, script: str, username: str = 'admin'
+    ) -> str:
+        """Works like `round_trip`, but waits without blocking the loop.
+
+        Args:
+            script (str): Commands to be executed, one per line.
+            username (str): User running the script.
+
+        Returns:
+            str: Output of the commands.
+        """
+        await asyncio.sleep(self._delay())
+        return self._run(script, username)
+
+    async def connect_async(self, auth: Auth) -> 'AsyncFakeConnection':
+        """Opens an asyncio connection with the simulated router.
+
+        It is an asyncio transport, which can be given to
+        `AsyncRouterOS.connect`.
+
+        Args:
+            auth (Auth): Credentials of the router.
+
+        Returns:
+            AsyncFakeConnection: Open connection.
+        """
+        await asyncio.sleep(self.connect_latency)
+        with self._lock:
+            self.connections += 1
+        return AsyncFakeConnection(self, auth.username)
+
+    def _delay(self) -> float:
+        """Returns the seconds the next round trip takes."""
+        delay = self.latency
+        if self.jitter:
+            delay += self._random.uniform(-self.jitter, self.jitter)
+        return max(delay, 0.0)
+
+    def _run(self, script: str, username: str) -> str:
+        with self._lock:
+            outputs = [
+                self._run_line(line.strip(), username)
+                for line in script.splitlines()
+                if line.strip()
+            ]
+            output = '\n'.join(output for output in outputs if output)
+            self.round_trips += 1
+            self.bytes_sent += len(script.encode())
+            self.bytes_received += len(output.encode())
+        return output
+
+    def _run_line(self, line: str, username: str) -> str:
+        """Runs one line of a script, errors are printed as the output."""
+        try:
+            if line.startswith('return '):
+                return self._evaluate(line.removeprefix('return '))
+            if line.startswith(':put '):
+                return self._evaluate(line.removeprefix(':put '))
+            action, output = self._command(line, username)
+        except _ScriptError as error:
+            return str(error)
+        # A `get` out of an expression has nothing to print
+        return '' if action == 'get' else output
+
+    def _evaluate(self, expression: str) -> str:
+        value, position = self._expression(expression, 0)
+        if position < len(expression):
+            raise _ScriptError(f'syntax error (line 1 column {position + 1})')
+        return value
+
+    def _expression(self, text: str, position: int) -> tuple[str, int]:
+        """Evaluates terms joined by `.` until a closing bracket."""
+        values = []
+        while position < len(text):
+            char = text[position]
+            if char in ')]':
+                break
+            if char.isspace() or char == '.':
+                position += 1
+                continue
+            value, position = self._term(text, position)
+            values.append(value)
+        return ''.join(values), position
+
+    def _term(self, text: str, position: int) -> tuple[str, int]:
+        char = text[position]
+        if char == '"':
+            end = position + 1
+            while end < len(text) and text[end] != '"':
+                end += 2 if text[end] == '\\' else 1
+            return _ESCAPE.sub(r'\1', text[position + 1 : end]), end + 1
+        if char == '(':
+            value, end = self._expression(text, position + 1)
+            return value, end + 1
+        if char == '[':
+            end = _closing_bracket(text, position)
+            return self._bracket(text[position + 1 : end].strip()), end + 1
+
+        end = position
+        while (
+            end < len(text)
+            and not text[end].isspace()
+            and text[end] not in ')].'
+        ):
+            end += 1
+        return text[position:end], end
+
+    def _bracket(self, command: str) -> str:
+        """Returns the value of a `[...]` command."""
+        for function in (':tostr ', ':put '):
+            if command.startswith(function):
+                return self._evaluate(command.removeprefix(function))
+        action, output = self._command(command, 'admin')
+        return output if action == 'get' else ''
+
+    def _command(self, command: str, username: str) -> tuple[str, str]:
+        """Runs a menu command and returns its action and output."""
+        match = _COMMAND.fullmatch(command)
+        if match is None:
+            name = command.split(maxsplit=1)[0].lstrip('/')
+            raise _ScriptError(f'bad command name {name} (line 1 column 1)')
+
+        words, action, arguments = match.groups()
+        path = '/' + ' '.join(words.replace('/', ' ').split())
+        if action == 'export':
+            return action, self._export(path, arguments.split())
+        if path not in self.menus:
+            name = path.split()[-1].lstrip('/')
+            raise _ScriptError(f'bad command name {name} (line 1 column 1)')
+
+        menu = self.menus[path]
+        if action == 'print':
+            return action, _render(menu, arguments.split())
+        if action == 'get':
+            return action, self._get(menu, arguments.split())
+        if action == 'set':
+            self._set(path, menu, arguments, username)
+        elif isinstance(menu, dict):
+            raise _ScriptError(
+                f'bad command name {action} (line 1 column {len(path) + 2})'
+            )
+        elif action == 'add':
+            self._add(path, menu, arguments, username)
+        else:
+            menu.remove(_find(menu, arguments))
+            self._record(path, username)
+        return action, ''
+
+    def _export(self, path: str, options: list[str]) -> str:
+        """Prints the configuration of the menus under `path` as scripts."""
+        paths = [
+            menu
+            for menu in self.menus
+            if path in {'/', menu} or menu.startswith(f'{path} ')
+        ]
+        if not paths:
+            name = path.rsplit(maxsplit=1)[-1].lstrip('/')
+            raise _ScriptError(f'bad command name {name} (line 1 column 1)')
+
+        clock = self.menus.get('/system clock', {})
+        version = self.menus.get('/system resource', {}).get('version', '7')
+        license = self.menus.get('/system license', {})
+        board = self.menus.get('/system routerboard', {})
+        lines = [
+            f'# {clock.get("date", "")} {clock.get("time", "")} by RouterOS '
+            f'{version.split()[0]}',
+            f'# software id = {license.get("software-id", "")}',
+            '#',
+            f'# model = {board.get("model", "CHR")}',
+        ]
+        if 'serial-number' in board:
+            lines.append(f'# serial number = {board["serial-number"]}')
+
+        for menu in paths:
+            if menu in _STATUS_MENUS:
+                continue
+            skip = {'.flags', *_STATUS_PROPERTIES.get(menu, ())}
+            items, defaults = self.menus[menu], DEFAULT_MENUS.get(menu, [])
+            if isinstance(items, dict):
+                items, defaults = [items], [defaults]
+            for index, item in enumerate(items):
+                selector = []
+                if menu not in _SINGLE_MENUS_WITH_NAME and 'name' in item:
+                    # Items of lists are selected by name
+                    selector = [_export_value('name', item['name'])]
+                    skip.add('name')
+                default = defaults[index] if index < len(defaults) else {}
+                values = [
+                    f'{name}={_export_value(name, value)}'
+                    for name, value in sorted(item.items())
+                    if name not in skip
+                    # Without `verbose` only changed values are exported
+                    and ('verbose' in options or default.get(name) != value)
+                ]
+                if values:
+                    lines.append(' '.join([menu, 'set', *selector, *values]))
+        return '\n'.join(lines)
+
+    @staticmethod
+    def _get(menu: Menu, arguments: list[str]) -> str:
+        *selector, name = arguments or ['']
+        # Options such as `as-string` do not change the simulated values
+        if name == 'as-string' and selector:
+            *selector, name = selector
+        item = _select(menu, selector)
+        if name not in item:
+            raise _ScriptError('input does not match any value of value-name')
+        return item[name]
+
+    def _set(
+        self, path: str, menu: Menu, arguments: str, username: str
+    ) -> None:
+        item = _find(menu, arguments)
+        if _FIND.search(arguments) is not None:
+            arguments = _FIND.sub('', arguments, count=1)
+        for name, raw in _ATTRIBUTE.findall(arguments):
+            if name not in item:
+                raise _ScriptError(
+                    f'expected end of command (line 1 column {len(path) + 6})'
+                )
+            item[name] = _value(name, raw)
+        self._record(path, username)
+
+    def _add(
+        self,
+        path: str,
+        menu: list[dict[str, str]],
+        arguments: str,
+        username: str,
+    ) -> None:
+        # Properties that are not given keep empty values, as the defaults
+        item = dict.fromkeys(menu[0] if menu else (), '')
+        item.pop('.flags', None)
+        for name, raw in _ATTRIBUTE.findall(arguments):
+            item[name] = _value(name, raw)
+        menu.append(item)
+        self._record(path, username)
+
+    def _record(self, path: str, username: str) -> None:
+        """Adds a change of a menu to `/system history`."""
+        history = self.menus.get('/system history')
+        if isinstance(history, list):
+            history.insert(
+                0,
+                {
+                    '.flags': 'U',
+                    'action': f'{path.lstrip("/")} changed',
+                    'by': username,
+                    'policy': 'write',
+                },
+            )
+
+
+def _closing_bracket(text: str, position: int) -> int:
+    """Returns the position of the `]` that closes the one at `position`."""
+    depth = 0
+    quoted = False
+    index = position
+    while index < len(text):
+        char = text[index]
+        if quoted:
+            if char == '\\':
+                index += 1
+            elif char == '"':
+                quoted = False
+        elif char == '"':
+            quoted = True
+        elif char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+            if depth == 0:
+                return index
+        index += 1
+    raise _ScriptError(f'missing ] (line 1 column {len(text)})')
+
+
+def _value(name: str, raw: str) -> str:
+    """Converts a value typed in a command to the value stored in a menu."""
+    value = raw
+    if len(raw) > 1 and raw[0] == raw[-1] == '"':
+        value = _ESCAPE.sub(r'\1', raw[1:-1])
+    if name not in _TEXT_PROPERTIES:
+        value = _YES_NO.get(value, value)
+    if name in _LIST_PROPERTIES:
+        value = value.replace(',', ';')
+    return value
+
+
+def _find(menu: Menu, arguments: str) -> dict[str, str]:
+    """Returns the item selected by `[ find name=value ]`, a number or name."""
+    find = _FIND.search(arguments)
+    if find is None or isinstance(menu, dict):
+        return _select(menu, _ATTRIBUTE.sub('', arguments).split())
+
+    name, value = find[1], _value(find[1], find[2])
+    for item in menu:
+        if item.get(name) == value:
+            return item
+    raise _ScriptError('no such item')
+
+
+def _select(menu: Menu, selector: list[str]) -> dict[str, str]:
+    """Returns the item of a menu selected by number or name."""
+    if isinstance(menu, dict):
+        return menu
+
+    if len(selector) == 1:
+        key = selector[0].removeprefix('number=')
+        if key.isdigit() and int(key) < len(menu):
+            return menu[int(key)]
+        for item in menu:
+            if item.get('name') == key:
+                return item
+    raise _ScriptError('no such item')
+
+
+def _flags(item: dict[str, str]) -> str:
+    flags = item.get('.flags', '')
+    if item.get('disabled') == 'true':
+        flags += 'X'
+    return flags
+
+
+def _render(menu: Menu, options: list[str]) -> str:
+    """Prints a menu as RouterOS does, in table, `detail` or `terse` format."""
+    if isinstance(menu, dict):
+        width = max(len(name) for name in menu)
+        return '\n'.join(
+            f'{name.rjust(width)}: {value}' for name, value in menu.items()
+        )
+    if not menu:
+        return ''
+
+    flags = sorted({flag for item in menu for flag in _flags(item)})
+    lines = []
+    if flags:
+        legend = '; '.join(f'{flag} - {_FLAG_NAMES[flag]}' for flag in flags)
+        lines.append(f'Flags: {legend}')
+
+    names = [name for name in menu[0] if name not in {'.flags', 'disabled'}]
+    prefix = len(str(len(menu) - 1)) + len(flags) + 2
+    if 'terse' in options or 'detail' in options:
+        for index, item in enumerate(menu):
+            values = ' '.join(
+                f'{name}={_quote(item[name], "detail" in options)}'
+                for name in names
+            )
+            start = f'{index} {_flags(item)}'.ljust(prefix)
+            lines.append(f'{start}{values}')
+        return '\n'.join(lines)
+
+    widths = [
+        max(len(name), *(len(item[name]) for item in menu)) for name in names
+    ]
+    lines.append('Columns: ' + ', '.join(name.upper() for name in names))
+    lines.append(
+        '#'.ljust(prefix)
+        + '  '.join(
+            name.upper().ljust(width) for name, width in zip(names, widths)
+        ).rstrip()
+    )
+    for index, item in enumerate(menu):
+        start = f'{index} {_flags(item)}'.ljust(prefix)
+        lines.append(
+            start
+            + '  '.join(
+                item[name].ljust(width) for name, width in zip(names, widths)
+            ).rstrip()
+        )
+    return '\n'.join(lines)
+
+
+def _export_value(name: str, value: str) -> str:
+    """Formats a value as `export` does, with escapes and quotes."""
+    if name not in _TEXT_PROPERTIES:
+        value = {'true': 'yes', 'false': 'no'}.get(value, value)
+    if name in _LIST_PROPERTIES:
+        value = value.replace(';', ',')
+    if re.fullmatch(r'[\w.:,/-]+', value, re.ASCII):
+        return value
+    escaped = ''.join(
+        char
+        if char.isascii()
+        else ''.join(f'\\{byte:02X}' for byte in char.encode())
+        for char in value.replace('\\', '\\\\').replace('"', '\\"')
+    )
+    return f'"{escaped}"'
+
+
+def _quote(value: str, detail: bool) -> str:
+    if detail and not re.fullmatch(r'[\w.:;/-]+', value):
+        return '"' + value.replace('"', '\\"') + '"'
+    return value
+
+
+class FakeConnection:
+    """Connection with a `FakeRouter`.
+
+    The script and its output are counted in `meter`, the output arrives
+    all at once after the latency of the router.
+
+    Args:
+        router (FakeRouter): Simulated router.
+        username (str): User logged in.
+    """
+
+    def __init__(self, router: FakeRouter, username: str = 'admin'):
+        self.router = router
+        self._username = username
+        self._alive = True
+        self.meter = ChannelMeter()
+
+    def _round_trip(
+        self, script: str, meter: ChannelMeter | None = None
+    ) -> str:
+        if not self._alive:
+            raise ConnectionError('Connection closed')
+        if meter is None:
+            meter = self.meter
+        meter.sent(len(script.encode()))
+        output = self.router.round_trip(script, self._username)
+        meter.received(len(output.encode()))
+        return output
+
+    def send_command(
+        self, command_string: str, expect_string: str | None = None, **kwargs
+    ) -> str:
+        """Runs a command and returns its output.
+
+        Args:
+            command_string (str): Command to be executed.
+            expect_string (str): Ignored, there is no prompt to be matched.
+            **kwargs: Ignored, kept for compatibility with Netmiko.
+
+        Returns:
+            str: Output of the command.
+        """
+        return self._round_trip(command_string)
+
+    def exec_command(
+        self,
+        command_string: str,
+        meter: ChannelMeter | None = None,
+        **kwargs,
+    ) -> str:
+        """Runs a command like on its own SSH exec channel.
+
+        Round trips of different threads overlap, like the channels of a
+        real router.
+
+        Args:
+            command_string (str): Command to be executed.
+            meter (ChannelMeter): Counts the data of this call alone,
+                instead of the `meter` of the connection.
+            **kwargs: Ignored, kept for compatibility with `SSHConnection`.
+
+        Returns:
+            str: Output of the command.
+        """
+        return self._round_trip(command_string, meter)
+
+    def send_multiline(self, commands: Sequence[str], **kwargs) -> str:
+        """Runs multiple commands, one round trip each.
+
+        Args:
+            commands (Sequence[str]): Commands to be executed.
+            **kwargs: Ignored, kept for compatibility with Netmiko.
+
+        Returns:
+            str: Output of the commands.
+        """
+        return '\n'.join(self._round_trip(command) for command in commands)
+
+    def iter_lines(self, command_string: str, **kwargs: Any) -> Iterator[str]:
+        """Runs a script in a single round trip and yields its output lines.
+
+        Args:
+            command_string (str): Commands to be executed, one per line.
+            **kwargs: Ignored, kept for compatibility with `SSHConnection`.
+
+        Yields:
+            str: Lines of the output.
+        """
+        yield from self._round_trip(command_string).splitlines()
+
+    def is_alive(self) -> bool:
+        """Returns True until the connection is closed."""
+        return self._alive
+
+    def disconnect(self) -> None:
+        """Closes the connection."""
+        self._alive = False
+
+
+class AsyncFakeConnection:
+    """Asyncio connection with a `FakeRouter`.
+
+    Works like `FakeConnection`, but waits for the latency of the router
+    with `asyncio.sleep`, so many routers can be simulated on one loop.
+
+    Args:
+        router (FakeRouter): Simulated router.
+        username (str): User logged in.
+    """
+
+    def __init__(self, router: FakeRouter, username: str = 'admin'):
+        self.router = router
+        self._username = username
+        self._alive = True
+        self.meter = ChannelMeter()
+
+    async def send_command(self, command_string: str, **kwargs) -> str:
+        """Runs a command and returns its output.
+
+        Args:
+            command_string (str): Command to be executed.
+            **kwargs: Ignored, kept for compatibility with `FakeConnection`.
+
+        Returns:
+            str: Output of the command.
+        """
+        if not self._alive:
+            raise ConnectionError('Connection closed')
+        self.meter.sent(len(command_string.encode()))
+        output = await self.router.async_round_trip(
+            command_string, self._username
+        )
+        self.meter.received(len(output.encode()))
+        return output
+
+    async def send_multiline(self, commands: Sequence[str], **kwargs) -> str:
+        """Runs multiple commands, one round trip each.
+
+        Args:
+            commands (Sequence[str]): Commands to be executed.
+            **kwargs: Ignored, kept for compatibility with `FakeConnection`.
+
+        Returns:
+            str: Output of the commands.
+        """
+        return '\n'.join([
+            await self.send_command(command) for command in commands
+        ])
+
+    async def is_alive(self) -> bool:
+        """Returns True until the connection is closed."""
+        return self._alive
+
+    async def disconnect(self) -> None:
+        """Closes the connection."""
+        self._alive = False
+
+
+def fake_connection(auth: Auth) -> FakeConnection:
+    """Opens a connection with a new `FakeRouter` with the default state.
+
+    Args:
+        auth (Auth): Credentials of the router.
+
+    Returns:
+        FakeConnection: Open connection.
+    """
+    return FakeRouter()(auth)
+
+
+async def async_fake_connection(auth: Auth) -> AsyncFakeConnection:
+    """Opens an asyncio connection with a new `FakeRouter`.
+
+    Args:
+        auth (Auth): Credentials of the router.
+
+    Returns:
+        AsyncFakeConnection: Open connection.
+    """
+    return await FakeRouter().connect_async(auth)
@@ -0,0 +1,181 @@
+import time
+from threading import Event, Lock, Thread
+
+from netmikro.transports.connection import (
+    Connection,
+    Transport,
+    create_connection,
+)
+from netmikro.validators import Auth
+
+PoolKey = tuple[str, int, str, Transport]
+
+
+def _close(connection: Connection) -> None:
+    """Closes a connection ignoring errors, it may already be broken."""
+    try:
+        connection.disconnect()
+    except Exception:  # noqa: S110
+        pass
+
+
+class ConnectionPool:
+    """Keeps router connections open so they can be reused.
+
+    Connections are identified by host, port, username and transport. A
+    `RouterOS` created with `pool=` borrows an idle connection when there is
+    one and gives it back on `disconnect()`, saving the whole login.
+
+    Idle connections are checked before being lent and, when `keepalive` is
+    set, periodically by a background thread, which keeps the sessions from
+    being closed by the router and drops the ones that died. Connections
+    idle for more than `max_idle` seconds are closed.
+
+    Args:
+        max_idle (float): Seconds an idle connection is kept open.
+        max_per_key (int): Maximum number of idle connections per router.
+        keepalive (float): Seconds between health checks of idle
+            connections, None disables the background thread.
+
+    Examples:
+        >>> from netmikro import ConnectionPool, RouterOS
+        >>> pool = ConnectionPool(max_idle=300, keepalive=60)
+        >>> router = RouterOS('192.168.3.3', 'user', 'password', pool=pool)
+        >>> router.cmd('/system identity print')
+        'name: Netmikro'
+        >>> router.disconnect()  # The session goes back to the pool
+    """
+
+    def __init__(
+        self,
+        max_idle: float = 300,
+        max_per_key: int = 4,
+        keepalive: float | None = None,
+    ):
+        self._max_idle = max_idle
+        self._max_per_key = max_per_key
+        self._idle: dict[PoolKey, list[tuple[Connection, float]]] = {}
+        self._lock = Lock()
+        self._closed = Event()
+
+        if keepalive:
+            Thread(
+                target=self._keepalive_loop, args=(keepalive,), daemon=True
+            ).start()
+
+    def __enter__(self) -> 'ConnectionPool':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @staticmethod
+    def key(transport: Transport, auth: Auth) -> PoolKey:
+        """Returns the key that identifies the connections with a router.
+
+        Args:
+            transport (Transport): Name of the transport, or its factory.
+            auth (Auth): Credentials of the router.
+
+        Returns:
+            tuple: Host, port, username and transport.
+        """
+        return str(auth.host), auth.port, auth.username, transport
+
+    @staticmethod
+    def _is_alive(connection: Connection) -> bool:
+        try:
+            return connection.is_alive()
+        except Exception:  # noqa: BLE001
+            return False
+
+    def acquire(self, transport: Transport, auth: Auth) -> Connection:
+        """Lends an idle connection with the router or opens a new one.
+
+        Args:
+            transport (Transport): Name of the transport, or its factory.
+            auth (Auth): Credentials of the router.
+
+        Returns:
+            Connection: Open connection with the router.
+        """
+        key = self.key(transport, auth)
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                if not idle:
+                    break
+                connection, last_used = idle.pop()
+
+            if (
+                time.monotonic() - last_used <= self._max_idle
+                and self._is_alive(connection)
+            ):
+                return connection
+            _close(connection)
+
+        return create_connection(transport, auth)
+
+    def release(
+        self, transport: Transport, auth: Auth, connection: Connection
+    ) -> None:
+        """Gives a connection back to the pool.
+
+        A connection that is already idle in the pool is not added again.
+
+        Args:
+            transport (Transport): Name of the transport, or its factory.
+            auth (Auth): Credentials of the router.
+            connection (Connection): Connection that is no longer in use.
+        """
+        key = self.key(transport, auth)
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if any(known is connection for known, _ in idle):
+                return
+            if not self._closed.is_set() and len(idle) < self._max_per_key:
+                idle.append((connection, time.monotonic()))
+                return
+        _close(connection)
+
+    @staticmethod
+    def discard(connection: Connection) -> None:
+        """Closes a connection that must not be reused, e.g. a broken one.
+
+        Args:
+            connection (Connection): Connection to be closed.
+        """
+        _close(connection)
+
+    def evict(self) -> None:
+        """Closes idle connections that expired or are no longer alive."""
+        now = time.monotonic()
+        with self._lock:
+            idle, self._idle = self._idle, {}
+
+        alive: dict[PoolKey, list[tuple[Connection, float]]] = {}
+        for key, connections in idle.items():
+            for connection, last_used in connections:
+                if now - last_used <= self._max_idle and self._is_alive(
+                    connection
+                ):
+                    alive.setdefault(key, []).append((connection, last_used))
+                else:
+                    _close(connection)
+
+        with self._lock:
+            for key, connections in alive.items():
+                self._idle.setdefault(key, [])[:0] = connections
+
+    def _keepalive_loop(self, interval: float) -> None:
+        while not self._closed.wait(interval):
+            self.evict()
+
+    def close(self) -> None:
+        """Stops the keep-alive thread and closes all idle connections."""
+        self._closed.set()
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection, _ in connections:
+                _close(connection)
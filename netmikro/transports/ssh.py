@@ -0,0 +1,282 @@
+import itertools
+import re
+import time
+from collections.abc import Iterator
+
+from netmiko.exceptions import ReadTimeout
+from netmiko.mikrotik.mikrotik_ssh import MikrotikRouterOsSSH
+from paramiko import ChannelException, SSHException
+
+from netmikro.utils.metrics import ChannelMeter
+from netmikro.validators import Auth
+
+# Matches the router prompt (format: [admin@mikrotik] >), whatever the
+# identity of the router is
+PROMPT = re.compile(r'\[[^\]\s]+@[^\]]+\]\s*>')
+
+
+class SSHConnection(MikrotikRouterOsSSH):
+    """Netmiko connection with the router terminal.
+
+    Adds to `MikrotikRouterOsSSH` the methods Netmikro needs on top of the
+    Netmiko API, and measures the data written and read in `meter`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        # Created first, the login already reads and writes the channel
+        self.meter = ChannelMeter()
+        self._sentinels = itertools.count()
+        super().__init__(*args, **kwargs)
+
+    def write_channel(self, out_data: str) -> None:
+        """Writes data to the channel, counting its size in `meter`."""
+        self.meter.sent(len(out_data.encode()))
+        super().write_channel(out_data)
+
+    def read_channel(self) -> str:
+        """Reads the available data, counting its size in `meter`."""
+        data = super().read_channel()
+        self.meter.received(len(data.encode()))
+        return data
+
+    def send_command(
+        self,
+        command_string: str,
+        expect_string: str | None = None,
+        read_timeout: float = 10.0,
+        **kwargs,
+    ) -> str:
+        """Runs a command and returns its output.
+
+        The command is followed by a `:put` of a sentinel that is unique in
+        the session, and the output is read until the sentinel and the
+        prompt after it arrive. The end of the output is then known
+        exactly, without waiting for the prompt to stop changing and
+        whatever the identity in the prompt is (even right after it was
+        changed by the command).
+
+        Commands with an `expect_string`, or with more than one line, are
+        run by Netmiko as before.
+
+        The sentinel is typed ahead, together with the command. A command
+        that asks a question (e.g. `/system reboot` and its `[y/N]`) reads
+        the sentinel as its answer, which declines it, and the question is
+        left in the output. Such commands must be given an `expect_string`
+        matching the question, and answered with a command of their own.
+
+        Args:
+            command_string (str): Command to be executed.
+            expect_string (str): Pattern that ends the output, for commands
+                that need Netmiko's prompt detection.
+            read_timeout (float): Seconds to wait for new data before giving up.
+            **kwargs: Options of Netmiko's `send_command`.
+
+        Returns:
+            str: Output of the command.
+
+        Raises:
+            ReadTimeout: If the router sends nothing for `read_timeout` seconds.
+        """
+        if expect_string is not None or '\n' in command_string.strip():
+            return super().send_command(
+                command_string,
+                expect_string=expect_string,
+                read_timeout=read_timeout,
+                **kwargs,
+            )
+
+        # Built by concatenation on the router, so only the output of the
+        # `:put`, never its echo, is the sentinel
+        number = next(self._sentinels)
+        sentinel = f'<netmikro:end:{number}>'
+        script = (
+            f'{command_string.strip()}\n:put ("<net" . "mikro:end:{number}>")'
+        )
+        lines = self.iter_lines(
+            script, read_timeout=read_timeout, end=sentinel
+        )
+        return '\n'.join(line for line in lines if line != sentinel)
+
+    def exec_command(
+        self,
+        command_string: str,
+        read_timeout: float = 10.0,
+        meter: ChannelMeter | None = None,
+        **kwargs,
+    ) -> str:
+        """Runs a command on a new exec channel and returns its output.
+
+        The channel is opened over the SSH transport already authenticated,
+        so there is no new handshake, and it does not touch the terminal:
+        many commands can run at the same time from different threads.
+
+        Args:
+            command_string (str): Command to be executed, in one line.
+            read_timeout (float): Seconds to wait for new data before giving up.
+            meter (ChannelMeter): Counts the data of this channel alone,
+                instead of the `meter` of the connection, which is shared
+                with the terminal and the other channels.
+            **kwargs: Ignored, kept for compatibility with `send_command`.
+
+        Returns:
+            str: Output of the command.
+
+        Raises:
+            ReadTimeout: If the router does not open the channel, or sends
+                nothing, for `read_timeout` seconds.
+        """
+        if meter is None:
+            meter = self.meter
+        transport = self.remote_conn_pre.get_transport()
+        try:
+            channel = transport.open_session(timeout=read_timeout)
+        except ChannelException:
+            # Refused by the router (e.g. too many sessions), not a timeout
+            raise
+        except SSHException as error:
+            if not transport.is_active():
+                raise
+            raise ReadTimeout(
+                f'Timed out opening a channel for: {command_string}'
+            ) from error
+        channel.settimeout(read_timeout)
+        chunks = []
+        try:
+            channel.exec_command(command_string)
+            meter.sent(len(command_string.encode()))
+            while chunk := channel.recv(65536):
+                meter.received(len(chunk))
+                chunks.append(chunk)
+        except TimeoutError as error:
+            raise ReadTimeout(
+                f'Timed out reading the output of: {command_string}'
+            ) from error
+        finally:
+            channel.close()
+        return '\n'.join(
+            b''.join(chunks).decode(errors='replace').splitlines()
+        )
+
+    def iter_lines(
+        self,
+        command_string: str,
+        read_timeout: float = 10.0,
+        end: str | None = None,
+    ) -> Iterator[str]:
+        """Runs a command and yields its output line by line as it arrives.
+
+        Only the line being received is kept in memory, so the output of
+        commands printing huge tables does not need to fit in memory.
+
+        A script with one command per line is typed at once, without waiting
+        for the prompt between the commands. In this case `end` must be a
+        line printed by the last command, otherwise the prompt printed after
+        the first command would end the output.
+
+        Args:
+            command_string (str): Command to be executed.
+            read_timeout (float): Seconds to wait for new data before giving up.
+            end (str): Line that is printed at the end of the output.
+
+        Yields:
+            str: Lines of the output, without the echo and the prompt.
+
+        Raises:
+            ReadTimeout: If the router sends nothing for `read_timeout` seconds.
+        """
+        self.read_channel()
+        self.write_channel(
+            self.RETURN.join(command_string.splitlines()) + self.RETURN
+        )
+
+        lines = self._read_lines(command_string, read_timeout, end)
+        try:
+            yield from lines
+        except GeneratorExit:
+            # The caller stopped early, interrupt the command so its
+            # remaining output does not mix with the next command
+            self.write_channel('\x03')
+            self.read_until_pattern(
+                pattern=PROMPT.pattern + r'\s*$',
+                re_flags=re.M,
+                read_timeout=read_timeout,
+            )
+            raise
+
+    def _read_lines(
+        self, command_string: str, read_timeout: float, end: str | None
+    ) -> Iterator[str]:
+        """Yields the lines received until the prompt is printed again.
+
+        Echoes longer than the terminal (e.g. of batched reads) may be
+        wrapped in many lines, which are skipped as long as they continue
+        the echoed command.
+        """
+        typed = [line.strip() for line in command_string.splitlines()]
+        rest = ''
+        buffer = ''
+        echoed = False
+        ended = end is None
+        last_data = time.monotonic()
+        while True:
+            data = self.read_channel()
+            if not data:
+                if time.monotonic() - last_data > read_timeout:
+                    raise ReadTimeout(
+                        f'Timed out reading the output of: {command_string}'
+                    )
+                time.sleep(0.01)
+                continue
+            last_data = time.monotonic()
+
+            buffer += data
+            *lines, buffer = buffer.split('\n')
+            for line in lines:
+                # The router may repaint the command line more than once
+                prompt = PROMPT.match(line)
+                if prompt:
+                    echoed = True
+                    rest = _echo_rest(typed, line[prompt.end() :].strip())
+                elif (
+                    rest
+                    and (fragment := line.strip())
+                    and rest.lstrip().startswith(fragment)
+                ):
+                    rest = rest.lstrip()[len(fragment) :]
+                elif echoed:
+                    rest = ''
+                    output = line.rstrip('\r')
+                    ended = ended or output == end
+                    yield output
+
+            if ended and echoed and PROMPT.fullmatch(buffer.strip()):
+                return
+
+
+def _echo_rest(typed: list[str], echo: str) -> str:
+    """Returns the part of a typed command missing from its echo, if any."""
+    if not echo:
+        return ''
+    for command in typed:
+        if command != echo and command.startswith(echo):
+            return command[len(echo) :]
+    return ''
+
+
+def ssh_connection(auth: Auth) -> SSHConnection:
+    """Opens an SSH connection with the router terminal.
+
+    Args:
+        auth (Auth): Credentials necessary to connect to the router.
+
+    Returns:
+        SSHConnection: Netmiko connection with the router.
+    """
+    return SSHConnection(
+        device_type='mikrotik_routeros',
+        host=str(auth.host),
+        username=auth.username,
+        password=auth.password,
+        port=auth.port,
+        global_delay_factor=auth.global_delay_factor,
+    )
@@ -1,2 +1,28 @@
 from ..validators import *
+from .cache import (
+    Generations,
+    SingleFlight,
+    TTLCache,
+    cached,
+    coalesced,
+    invalidates,
+)
+from .config import (
+    ConfigSection,
+    ConfigTree,
+    format_value,
+    normalize_path,
+    quote_value,
+)
 from .converter import *
+from .metrics import (
+    ChannelMeter,
+    CommandEvent,
+    Hook,
+    MetricsCollector,
+    command_path,
+    measure,
+)
+from .parser import PrintParser, Row, typed_value
+from .series import Aggregate, RingBuffer, percentile, summarize
+from .timing import AdaptiveTiming
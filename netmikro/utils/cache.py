@@ -0,0 +1,308 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+from functools import wraps
+from threading import Lock
+from typing import Any
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Size bounded LRU cache whose entries expire after a time to live.
+
+    Keys are tuples whose first item is the name of the cached method, which
+    is used to pick the time to live and to invalidate all entries of a
+    method at once.
+
+    Args:
+        ttl (float | dict): Seconds an entry is kept, or a mapping of method
+            names to seconds, in which case only those methods are cached.
+        maxsize (int): Maximum number of entries, the least recently used
+            entry is dropped when it is exceeded.
+    """
+
+    def __init__(self, ttl: float | dict[str, float], maxsize: int = 128):
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._entries: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self._lock = Lock()
+
+    def ttl(self, name: str) -> float | None:
+        """Returns the time to live of a method, None if it is not cached.
+
+        Args:
+            name (str): Name of the method.
+
+        Returns:
+            float | None: Time to live in seconds.
+        """
+        if isinstance(self._ttl, dict):
+            return self._ttl.get(name)
+        return self._ttl
+
+    def get(self, key: tuple[Hashable, ...], default: Any = None) -> Any:
+        """Returns the value of a key that has not expired.
+
+        Args:
+            key (tuple): Key of the entry.
+            default (Any): Value returned if the key is missing or expired.
+
+        Returns:
+            Any: Cached value.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: tuple[Hashable, ...], value: Any) -> None:
+        """Stores a value with the time to live of its method.
+
+        Args:
+            key (tuple): Key of the entry.
+            value (Any): Value to be cached.
+        """
+        ttl = self.ttl(key[0])
+        if ttl is None:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *names: str) -> None:
+        """Drops the entries of some methods, or all entries if none given.
+
+        Args:
+            *names (str): Names of the methods.
+        """
+        with self._lock:
+            if not names:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] in names]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that would do the same work.
+
+    While a call of a key is running, other threads calling the same key
+    wait for it and get its result (or its exception) instead of running
+    the function again. Calls made after it finished run again.
+
+    Examples:
+        >>> flights = SingleFlight()
+        >>> flights.do(('health_temperature', (), ()), read_temperature)
+        37
+    """
+
+    def __init__(self):
+        self._calls: dict[tuple, Future] = {}
+        self._lock = Lock()
+
+    def do(
+        self, key: tuple[Hashable, ...], function: Callable[[], Any]
+    ) -> Any:
+        """Runs a function, or waits for the running call of the same key.
+
+        Args:
+            key (tuple): Key of the call.
+            function (Callable): Function without arguments that does the
+                work of the key.
+
+        Returns:
+            Any: Value returned by the function, in this thread or in the
+                one that was already running it.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            value = function()
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+class Generations:
+    """Counts the invalidations of each cached method.
+
+    A read records the generation of its method before it starts, and its
+    result is only shared (cached or handed to other callers) while the
+    generation is the same, so a value read before a setter ran is not
+    served after it.
+
+    Examples:
+        >>> generations = Generations()
+        >>> generations.get('identity')
+        0
+        >>> generations.bump('identity')
+        >>> generations.get('identity')
+        1
+    """
+
+    def __init__(self):
+        self._counts: dict[str, int] = {}
+        self._all = 0
+        self._lock = Lock()
+
+    def get(self, name: str) -> int:
+        """Returns the generation of a method.
+
+        Args:
+            name (str): Name of the method.
+
+        Returns:
+            int: Number of invalidations of the method, including the ones
+                of all methods.
+        """
+        with self._lock:
+            return self._all + self._counts.get(name, 0)
+
+    def bump(self, *names: str) -> None:
+        """Starts a new generation of some methods, or of all if none given.
+
+        Args:
+            *names (str): Names of the methods.
+        """
+        with self._lock:
+            if not names:
+                self._all += 1
+            for name in names:
+                self._counts[name] = self._counts.get(name, 0) + 1
+
+
+def cached(method: Callable) -> Callable:
+    """Caches the return of a getter in the `_cache` of its instance.
+
+    Nothing is cached when the instance has no cache (`_cache` is None).
+    Concurrent calls with the same arguments are coalesced by the
+    `SingleFlight` of the instance (`_flights`), if it has one, so a single
+    command is sent to the router for all of them. When the instance has
+    `Generations` (`_generations`), a call started before an `invalidates`
+    setter is neither joined by later calls nor cached.
+
+    Args:
+        method (Callable): Getter to be cached.
+
+    Returns:
+        Callable: Getter that reads from the cache first.
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache: TTLCache | None = getattr(self, '_cache', None)
+        flights: SingleFlight | None = getattr(self, '_flights', None)
+        if cache is None and flights is None:
+            return method(self, *args, **kwargs)
+
+        name = method.__name__
+        generations: Generations | None = getattr(self, '_generations', None)
+        generation = generations.get(name) if generations is not None else 0
+        key = (name, args, tuple(sorted(kwargs.items())))
+        if cache is not None:
+            value = cache.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+
+        def current() -> bool:
+            return generations is None or generations.get(name) == generation
+
+        def call() -> Any:
+            value = method(self, *args, **kwargs)
+            if cache is not None and current():
+                cache.set(key, value)
+                # An invalidation between the check and the set drops the
+                # entry again
+                if not current():
+                    cache.invalidate(name)
+            return value
+
+        if flights is None:
+            return call()
+        return flights.do((*key, generation), call)
+
+    return wrapper
+
+
+def coalesced(method: Callable) -> Callable:
+    """Coalesces concurrent calls of a getter, without caching its result.
+
+    For live readings (e.g. `health_temperature`), which must never be
+    served from the `_cache` but can be shared by the calls made while the
+    same reading is on its way: they wait for it through the `SingleFlight`
+    of the instance (`_flights`), if it has one.
+
+    Args:
+        method (Callable): Getter to be coalesced.
+
+    Returns:
+        Callable: Getter that joins the running call of the same arguments.
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        flights: SingleFlight | None = getattr(self, '_flights', None)
+        if flights is None:
+            return method(self, *args, **kwargs)
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        return flights.do(key, lambda: method(self, *args, **kwargs))
+
+    return wrapper
+
+
+def invalidates(*names: str) -> Callable[[Callable], Callable]:
+    """Drops cached getters after a setter changes what they return.
+
+    Args:
+        *names (str): Names of the getters affected by the setter.
+
+    Returns:
+        Callable: Decorator for the setter.
+    """
+
+    def decorator(method: Callable) -> Callable:
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                generations: Generations | None = getattr(
+                    self, '_generations', None
+                )
+                if generations is not None:
+                    generations.bump(*names)
+                cache: TTLCache | None = getattr(self, '_cache', None)
+                if cache is not None:
+                    cache.invalidate(*names)
+
+        return wrapper
+
+    return decorator
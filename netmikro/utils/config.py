@@ -0,0 +1,418 @@
+import re
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+from netmikro.utils.parser import typed_value
+
+_HEADER = re.compile(r'#\s*([\w ]+?)\s*=\s*(.*)')
+_COMMAND = re.compile(r'(/[\w/ -]*?)?\s*\b(add|set)\b\s*(.*)')
+_PATH = re.compile(r'/[\w/ -]*')
+_FIND = re.compile(r'\[\s*find\b\s*(.*?)\s*\]\s*')
+_ATTRIBUTE = re.compile(r'([\w.-]+)=("(?:[^"\\]|\\.)*"|\S*)')
+_ESCAPE = re.compile(r'\\([0-9A-F]{2}|.)')
+_ESCAPES = {'_': ' ', 'n': '\n', 'r': '\r', 't': '\t'}
+_PLAIN = re.compile(r'[\w.:,/@+-]+', re.ASCII)
+
+# Properties holding free text, which is kept as exported instead of being
+# converted (e.g. a note 'true' is not a boolean, an identity '007' is not
+# the number 7)
+TEXT_PROPERTIES = frozenset({'comment', 'name', 'note'})
+
+
+def normalize_path(path: str) -> str:
+    """Returns a menu path in the format used as key by `ConfigTree`.
+
+    Args:
+        path (str): Path with spaces or slashes (e.g. 'ip/service').
+
+    Returns:
+        str: Path starting with a slash and with spaces between the menus
+            (e.g. '/ip service').
+    """
+    return '/' + ' '.join(path.replace('/', ' ').split())
+
+
+def _unescape(value: str) -> str:
+    """Removes the quotes and the escapes of a value of an export."""
+    if len(value) > 1 and value[0] == value[-1] == '"':
+        value = value[1:-1]
+    if '\\' not in value:
+        return value
+
+    # Non-ASCII characters are exported as the hex of their UTF-8 bytes
+    unescaped = bytearray()
+    position = 0
+    for match in _ESCAPE.finditer(value):
+        unescaped += value[position : match.start()].encode()
+        escaped = match[1]
+        if len(escaped) == 2:  # noqa: PLR2004
+            unescaped.append(int(escaped, 16))
+        else:
+            unescaped += _ESCAPES.get(escaped, escaped).encode()
+        position = match.end()
+    unescaped += value[position:].encode()
+    return unescaped.decode(errors='replace')
+
+
+def format_value(value: Any) -> str:
+    """Converts a value back to the text used by RouterOS.
+
+    It reverts `typed_value`, so values read from a `ConfigTree` can be
+    compared with or sent to the router.
+
+    Args:
+        value (Any): Value to be converted.
+
+    Returns:
+        str: '' for None, 'yes' or 'no' for booleans, items joined by commas
+            for lists and `str(value)` for everything else.
+
+    Examples:
+        >>> format_value(True)
+        'yes'
+        >>> format_value(['200.160.7.186', '201.49.148.135'])
+        '200.160.7.186,201.49.148.135'
+    """
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'yes' if value else 'no'
+    if isinstance(value, list | tuple):
+        return ','.join(format_value(item) for item in value)
+    return str(value)
+
+
+def quote_value(value: Any) -> str:
+    """Formats a value to be typed in a command, quoting it if needed.
+
+    Args:
+        value (Any): Value to be typed, converted with `format_value`.
+
+    Returns:
+        str: The value as it is, or between quotes with backslashes,
+            quotes and `$` escaped when it has other characters or is empty.
+
+    Examples:
+        >>> quote_value('Core Router')
+        '"Core Router"'
+    """
+    text = format_value(value)
+    if _PLAIN.fullmatch(text):
+        return text
+    for char in '\\"$':
+        text = text.replace(char, f'\\{char}')
+    return f'"{text}"'
+
+
+def _arguments(values: dict[str, Any]) -> str:
+    return ' '.join(
+        f'{name}={quote_value(value)}' for name, value in values.items()
+    )
+
+
+def _changes(
+    current: dict[str, Any] | None, desired: dict[str, Any]
+) -> dict[str, Any]:
+    """Returns the desired values that differ from the current ones."""
+    current = current or {}
+    return {
+        name: value
+        for name, value in desired.items()
+        if name not in current
+        or format_value(current[name]) != format_value(value)
+    }
+
+
+class ConfigSection:
+    """Configuration of a menu read from an export.
+
+    Attributes:
+        path (str): Path of the menu (e.g. '/ip service').
+        values (dict): Properties of menus with a single item (e.g.
+            `/system identity`).
+        items (list[dict]): Properties of each item of menus with many
+            items (e.g. `/ip service`), in the order they were exported.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.values: dict[str, Any] = {}
+        self.items: list[dict[str, Any]] = []
+        self._index: dict[str, dict[str, Any]] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f'ConfigSection({self.path!r}, values={self.values!r}, '
+            f'items={self.items!r})'
+        )
+
+    def item(self, name: str) -> dict[str, Any] | None:
+        """Returns an item by its `name` (or `default-name`).
+
+        Args:
+            name (str): Name of the item.
+
+        Returns:
+            dict | None: Properties of the item, None if there is none.
+        """
+        return self._index.get(name)
+
+    def find(self, **criteria: Any) -> list[dict[str, Any]]:
+        """Returns the items whose properties have the given values.
+
+        Args:
+            **criteria: Values of the properties, use a dict for names
+                with hyphens (e.g. `find(**{'default-name': 'ether1'})`).
+
+        Returns:
+            list[dict]: Matching items.
+        """
+        return [
+            item
+            for item in self.items
+            if all(item.get(name) == value for name, value in criteria.items())
+        ]
+
+    def diff(self, desired: dict[str, Any]) -> list[str]:
+        """Returns the commands that change this menu into the desired state.
+
+        Args:
+            desired (dict): Values of menus with a single item (e.g.
+                {'enabled': True}), or the values of each item by name (e.g.
+                {'telnet': {'disabled': True}}). Items whose values are
+                None are removed, items that do not exist are added.
+
+        Returns:
+            list[str]: `set`, `add` and `remove` commands, only for the
+                values that are different, empty if nothing changes.
+        """
+        by_item = self.items or any(
+            isinstance(value, dict) for value in desired.values()
+        )
+        if not by_item:
+            changes = _changes(self.values, desired)
+            if not changes:
+                return []
+            return [f'{self.path} set {_arguments(changes)}']
+
+        commands = []
+        for name, values in desired.items():
+            item = self.item(name)
+            key = (
+                'default-name' if item and item.get('name') != name else 'name'
+            )
+            selector = f'[ find {key}={quote_value(name)} ]'
+            if values is None:
+                if item is not None:
+                    commands.append(f'{self.path} remove {selector}')
+            elif item is None:
+                arguments = _arguments({'name': name, **values})
+                commands.append(f'{self.path} add {arguments}')
+            else:
+                changes = _changes(item, values)
+                if changes:
+                    commands.append(
+                        f'{self.path} set {selector} {_arguments(changes)}'
+                    )
+        return commands
+
+    def _index_item(self, item: dict[str, Any]) -> None:
+        for key in ('default-name', 'name'):
+            if item.get(key) is not None:
+                self._index[str(item[key])] = item
+
+    def add(self, values: dict[str, Any]) -> None:
+        """Adds an item, as done by an `add` command.
+
+        Args:
+            values (dict): Properties of the item.
+        """
+        self.items.append(values)
+        self._index_item(values)
+
+    def set(self, values: dict[str, Any], criteria: dict[str, Any]) -> None:
+        """Changes properties, as done by a `set` command.
+
+        Args:
+            values (dict): Properties to be changed.
+            criteria (dict): Properties that select the item to be changed
+                (e.g. {'name': 'api'}), empty for menus with a single item.
+        """
+        if not criteria:
+            self.values.update(values)
+            return
+
+        matches = self.find(**criteria)
+        if not matches:
+            self.add({**criteria, **values})
+            return
+        for item in matches:
+            item.update(values)
+            self._index_item(item)
+
+
+class ConfigTree:
+    """Configuration of a router parsed from the output of `export`.
+
+    Sections are indexed by their path, so any value of the configuration
+    is read locally after a single `export`. Lines are consumed one at a
+    time, so it can parse the output while it is received. Use `export
+    terse verbose` to have the default values in the tree as well.
+
+    Args:
+        lines (Iterable[str]): Lines of the export.
+        convert (Callable): Function applied to each value, `typed_value`
+            by default, `str` keeps the values as exported. Properties in
+            `TEXT_PROPERTIES` are always kept as exported.
+
+    Attributes:
+        header (dict): Values of the comments at the top of the export
+            (e.g. {'software id': 'E2VM-S6B8', 'model': 'RB951Ui-2HnD'}).
+        sections (dict): `ConfigSection` of each exported menu.
+
+    Examples:
+        >>> tree = ConfigTree(router.cmd('/export terse verbose').splitlines())
+        >>> tree.get('/system identity', 'name')
+        'Netmikro'
+        >>> tree.get('/ip service', 'port', item='api')
+        8728
+        >>> tree['/ip service'].find(disabled=True)
+        [{'name': 'telnet', 'port': 23, 'disabled': True, ...}]
+    """
+
+    def __init__(
+        self,
+        lines: Iterable[str],
+        convert: Callable[[str], Any] = typed_value,
+    ):
+        self._convert = convert
+        self.header: dict[str, str] = {}
+        self.sections: dict[str, ConfigSection] = {}
+        self._path = '/'
+        for command in self._commands(lines):
+            self._apply(command)
+
+    def __getitem__(self, path: str) -> ConfigSection:
+        return self.sections[normalize_path(path)]
+
+    def __contains__(self, path: str) -> bool:
+        return normalize_path(path) in self.sections
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.sections)
+
+    def get(
+        self,
+        path: str,
+        name: str,
+        item: str | None = None,
+        default: Any = None,
+    ) -> Any:
+        """Returns a value of the configuration.
+
+        Args:
+            path (str): Path of the menu (e.g. '/system ntp client').
+            name (str): Name of the property (e.g. 'servers').
+            item (str): Name of the item, for menus with many items.
+            default (Any): Value returned if the property was not exported.
+
+        Returns:
+            Any: Value of the property.
+        """
+        section = self.sections.get(normalize_path(path))
+        if section is None:
+            return default
+        values = section.values if item is None else section.item(item)
+        if values is None:
+            return default
+        return values.get(name, default)
+
+    def diff(self, desired: dict[str, dict[str, Any]]) -> list[str]:
+        """Returns the commands that change the configuration into `desired`.
+
+        Values are compared as RouterOS prints them, so `True` matches
+        'yes', `8728` matches '8728' and lists match their items joined by
+        commas. Values missing from the tree (e.g. defaults of an export
+        without `verbose`) are always set.
+
+        Args:
+            desired (dict): Desired state of each menu by path, in the
+                format of `ConfigSection.diff`.
+
+        Returns:
+            list[str]: Commands to be run, empty if the configuration is
+                already in the desired state.
+
+        Examples:
+            >>> tree.diff({
+            ...     '/system identity': {'name': 'Netmikro'},
+            ...     '/ip service': {'telnet': {'disabled': True}},
+            ... })
+            ['/ip service set [ find name=telnet ] disabled=yes']
+        """
+        commands = []
+        for menu, values in desired.items():
+            path = normalize_path(menu)
+            section = self.sections.get(path) or ConfigSection(path)
+            commands.extend(section.diff(values))
+        return commands
+
+    def _commands(self, lines: Iterable[str]) -> Iterator[str]:
+        """Yields the commands of the export, joining wrapped lines."""
+        command = ''
+        for line in lines:
+            stripped = line.strip()
+            if not command and stripped.startswith('#'):
+                header = _HEADER.fullmatch(stripped)
+                if header is not None:
+                    self.header[header[1]] = header[2]
+                continue
+            if stripped.endswith('\\'):
+                command += stripped[:-1]
+                continue
+            command += stripped
+            if command:
+                yield command
+            command = ''
+
+    def _apply(self, command: str) -> None:
+        """Applies a command of the export to the tree."""
+        if _PATH.fullmatch(command):
+            # Exports without `terse` print the path once before its commands
+            self._path = normalize_path(command)
+            return
+
+        match = _COMMAND.fullmatch(command)
+        if match is None:
+            return
+        menu, action, arguments = match.groups()
+        if menu is not None:
+            self._path = normalize_path(menu)
+        section = self.sections.get(self._path)
+        if section is None:
+            section = self.sections[self._path] = ConfigSection(self._path)
+
+        criteria = {}
+        find = _FIND.match(arguments)
+        if find is not None:
+            criteria = self._attributes(find[1])
+            arguments = arguments[find.end() :]
+        elif action == 'set':
+            first, _, rest = arguments.partition(' ')
+            if first and '=' not in first:
+                criteria = {'name': _unescape(first)}
+                arguments = rest
+
+        values = self._attributes(arguments)
+        if action == 'add':
+            section.add(values)
+        else:
+            section.set(values, criteria)
+
+    def _attributes(self, arguments: str) -> dict[str, Any]:
+        return {
+            name: _unescape(value)
+            if name in TEXT_PROPERTIES
+            else self._convert(_unescape(value))
+            for name, value in _ATTRIBUTE.findall(arguments)
+        }
@@ -1,7 +1,21 @@
+import re
+from functools import lru_cache
+from ipaddress import IPv4Address
 from typing import Union
 
 from netmikro.exceptions import UndefinedBooleanValue
 
+# Addresses are immutable and a fleet uses few distinct ones (e.g. the same
+# NTP servers), so parsed addresses are shared instead of parsed again
+_ipv4 = lru_cache(maxsize=4096)(IPv4Address)
+
+# Durations are printed as '1w2d03:04:05' by RouterOS 7 and as
+# '1w2d3h4m5s' by older versions
+_DURATION = re.compile(
+    r'(?:(\d+)w)?(?:(\d+)d)?'
+    r'(?:(\d+):(\d+):(\d+)|(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s)?)'
+)
+
 
 def boolean(string: str) -> Union[bool, None, str]:
     """Convert a string to a boolean value.
@@ -21,3 +35,86 @@ def boolean(string: str) -> Union[bool, None, str]:
         return None
     else:
         raise UndefinedBooleanValue(f'Undefined boolean value: {string}')
+
+
+def number(string: str) -> int:
+    """Convert a string to an integer value.
+
+    Args:
+        string (str): String to be converted.
+
+    Returns:
+        int: Integer value of the string or 0 if the string is empty.
+    """
+    string = string.strip()
+    if not string:
+        return 0
+    return int(string)
+
+
+def decimal(string: str) -> float:
+    """Convert a string to a float value.
+
+    Args:
+        string (str): String to be converted.
+
+    Returns:
+        float: Float value of the string or 0.0 if the string is empty.
+    """
+    string = string.strip()
+    if not string:
+        return 0.0
+    return float(string)
+
+
+def ip_list(string: str) -> list[IPv4Address]:
+    """Convert a RouterOS list (items separated by `;`) to a list of IPs.
+
+    Args:
+        string (str): String to be converted.
+
+    Returns:
+        list[IPv4Address]: List of IP addresses, empty if the string is empty.
+    """
+    string = string.strip()
+    if not string:
+        return []
+    return [_ipv4(ip) for ip in string.split(';')]
+
+
+def ip_address(string: str) -> IPv4Address | None:
+    """Convert a string to an IP address.
+
+    Args:
+        string (str): String to be converted.
+
+    Returns:
+        IPv4Address | None: IP address or None if the string is empty.
+    """
+    string = string.strip()
+    if not string:
+        return None
+    return _ipv4(string)
+
+
+def duration(string: str) -> int:
+    """Convert a RouterOS duration (e.g. '1w2d03:04:05') to seconds.
+
+    Args:
+        string (str): String to be converted.
+
+    Returns:
+        int: Number of seconds, 0 if the string is empty.
+
+    Raises:
+        ValueError: If the string is not a duration.
+    """
+    match = _DURATION.fullmatch(string.strip())
+    if match is None:
+        raise ValueError(f'Invalid duration: {string}')
+    weeks, days, *clock = (int(group or 0) for group in match.groups())
+    # Hours, minutes and seconds come either as '03:04:05' or as '3h4m5s'
+    hours, minutes, seconds = map(sum, zip(clock[:3], clock[3:]))
+    return (
+        weeks * 604800 + days * 86400 + hours * 3600 + minutes * 60 + seconds
+    )
@@ -0,0 +1,235 @@
+import re
+import time
+from collections.abc import Callable
+from threading import Lock
+from typing import NamedTuple
+
+_PATH = re.compile(
+    r'(/[\w/-]*(?: [a-z][\w-]*)*?)[ /]+(?:get|set|print|export)\b'
+)
+
+
+class CommandEvent(NamedTuple):
+    """Measurements of a command, passed to the hooks of `RouterOS`.
+
+    The time of the command is split in three parts, which tell where a slow
+    command spends its time:
+
+    - `wait`, from sending the command to the first data received, is the
+      latency of the network and of the router;
+    - `transfer`, from the first to the last data received, grows with the
+      size of the output;
+    - `idle`, from the last data received until the command returns, is the
+      time spent waiting for the prompt after the output ended (e.g. the
+      `delay` of the connection or prompt patterns that do not match).
+
+    Connections that do not measure their I/O (without `meter`) report the
+    whole time as `wait`.
+
+    Attributes:
+        host (str): IP address of the router.
+        transport (str): Name of the transport (e.g. 'ssh').
+        phase (str): 'connect', 'command', 'stream' (output read line by
+            line) or 'reconnect'.
+        path (str): Menu of the command (e.g. '/system identity'), or its
+            first word if it does not use a menu.
+        command (str): Command that was executed.
+        elapsed (float): Seconds the command took.
+        wait (float): Seconds until the first data was received.
+        transfer (float): Seconds between the first and the last data.
+        idle (float): Seconds after the last data was received.
+        bytes_sent (int): Bytes written to the connection.
+        bytes_received (int): Bytes read from the connection.
+        error (Exception): Error raised by the command, if any.
+    """
+
+    host: str
+    transport: str
+    phase: str
+    path: str
+    command: str
+    elapsed: float
+    wait: float
+    transfer: float
+    idle: float
+    bytes_sent: int
+    bytes_received: int
+    error: Exception | None = None
+
+
+Hook = Callable[[CommandEvent], None]
+
+
+def command_path(command: str) -> str:
+    """Returns the menu of a command, used to group its measurements.
+
+    Args:
+        command (str): Command, or script, that was executed.
+
+    Returns:
+        str: Menu of the first command that uses one (e.g. '/ip service'),
+            otherwise the first word of the command.
+
+    Examples:
+        >>> command_path('return [/system ntp client get enabled]')
+        '/system ntp client'
+    """
+    match = _PATH.search(command)
+    if match is not None:
+        return '/' + ' '.join(match[1].replace('/', ' ').split())
+    words = command.split(maxsplit=1)
+    return words[0] if words else ''
+
+
+class ChannelMeter:
+    """Counts the bytes and the arrival times of the data of a connection.
+
+    Connections update it when they write and read, and `RouterOS` resets it
+    before each command to build its `CommandEvent`.
+    """
+
+    __slots__ = (
+        'bytes_received',
+        'bytes_sent',
+        'first_data',
+        'last_data',
+        'started',
+    )
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Starts measuring a new command."""
+        self.started = time.perf_counter()
+        self.first_data: float | None = None
+        self.last_data: float | None = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def sent(self, size: int) -> None:
+        """Records data written to the connection.
+
+        Args:
+            size (int): Number of bytes written.
+        """
+        self.bytes_sent += size
+
+    def received(self, size: int) -> None:
+        """Records data read from the connection.
+
+        Args:
+            size (int): Number of bytes read, reads without data are ignored.
+        """
+        if not size:
+            return
+        self.last_data = time.perf_counter()
+        if self.first_data is None:
+            self.first_data = self.last_data
+        self.bytes_received += size
+
+
+def measure(  # noqa: PLR0913, PLR0917
+    host: str,
+    transport: str,
+    phase: str,
+    command: str,
+    started: float,
+    meter: ChannelMeter | None,
+    error: Exception | None = None,
+) -> CommandEvent:
+    """Builds the `CommandEvent` of a command that has just finished.
+
+    Args:
+        host (str): IP address of the router.
+        transport (str): Name of the transport.
+        phase (str): Phase of the connection.
+        command (str): Command that was executed.
+        started (float): `time.perf_counter()` when the command was sent.
+        meter (ChannelMeter): I/O measured by the connection, if any.
+        error (Exception): Error raised by the command, if any.
+
+    Returns:
+        CommandEvent: Measurements of the command.
+    """
+    ended = time.perf_counter()
+    elapsed = ended - started
+    if meter is None or meter.first_data is None:
+        wait, transfer, idle = elapsed, 0.0, 0.0
+    else:
+        wait = meter.first_data - started
+        transfer = meter.last_data - meter.first_data
+        idle = ended - meter.last_data
+
+    return CommandEvent(
+        host=host,
+        transport=transport,
+        phase=phase,
+        path=command_path(command),
+        command=command,
+        elapsed=elapsed,
+        wait=wait,
+        transfer=transfer,
+        idle=idle,
+        bytes_sent=meter.bytes_sent if meter is not None else 0,
+        bytes_received=meter.bytes_received if meter is not None else 0,
+        error=error,
+    )
+
+
+class MetricsCollector:
+    """Hook that aggregates the events of the commands in memory.
+
+    Measurements are summed by host, path and phase, the shape of the
+    counters of Prometheus or of the spans of OpenTelemetry, so they can be
+    exported to either by reading `summary()`.
+
+    Examples:
+        >>> metrics = MetricsCollector()
+        >>> router = RouterOS('192.168.3.3', 'user', 'password', hooks=[metrics])
+        >>> router.ntp_client_get()
+        >>> metrics.summary()[('192.168.3.3', '/system ntp client', 'command')]
+        {'count': 1, 'errors': 0, 'elapsed': 0.051, 'wait': 0.049, ...}
+    """
+
+    _FIELDS = ('elapsed', 'wait', 'transfer', 'idle')
+    _COUNTERS = ('bytes_sent', 'bytes_received')
+
+    def __init__(self):
+        self._totals: dict[tuple[str, str, str], dict[str, float]] = {}
+        self._lock = Lock()
+
+    def __call__(self, event: CommandEvent) -> None:
+        """Adds the measurements of a command.
+
+        Args:
+            event (CommandEvent): Measurements of the command.
+        """
+        key = (event.host, event.path, event.phase)
+        with self._lock:
+            totals = self._totals.setdefault(
+                key,
+                dict.fromkeys(
+                    ('count', 'errors', *self._FIELDS, *self._COUNTERS), 0
+                ),
+            )
+            totals['count'] += 1
+            totals['errors'] += event.error is not None
+            for field in (*self._FIELDS, *self._COUNTERS):
+                totals[field] += getattr(event, field)
+
+    def summary(self) -> dict[tuple[str, str, str], dict[str, float]]:
+        """Returns the totals of each host, path and phase.
+
+        Returns:
+            dict: Number of commands and errors, total seconds (`elapsed`,
+                `wait`, `transfer` and `idle`) and total bytes of each
+                `(host, path, phase)`.
+        """
+        with self._lock:
+            return {key: dict(totals) for key, totals in self._totals.items()}
+
+    def clear(self) -> None:
+        """Drops all measurements."""
+        with self._lock:
+            self._totals.clear()
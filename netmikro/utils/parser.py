@@ -0,0 +1,201 @@
+import re
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any, NamedTuple
+
+_FLAG = re.compile(r'([A-Z*])\s+-\s+([^,;]+)')
+_RECORD = re.compile(r'\s*(\d+)((?:\s+[A-Z*]+(?=\s|$))*)\s*(.*)')
+_PROPERTY = re.compile(r'\s*([\w.-]+):\s?(.*)')
+_ATTRIBUTE = re.compile(r'([\w.-]+)=("(?:[^"\\]|\\.)*"|\S*)')
+_INTEGER = re.compile(r'-?\d+')
+_ESCAPE = re.compile(r'\\(.)')
+
+_BOOLEANS = {'true': True, 'yes': True, 'false': False, 'no': False}
+
+
+class Row(NamedTuple):
+    """Record printed by a RouterOS `print` command.
+
+    Attributes:
+        index (int): Number of the item, None if it has no number.
+        flags (str): Flags of the item (e.g. 'XD'), see `PrintParser.flags`.
+        comment (str): Comment of the item (`;;; comment`), if any.
+        values (dict): Properties of the item.
+    """
+
+    index: int | None
+    flags: str
+    comment: str | None
+    values: dict[str, Any]
+
+
+def typed_value(value: str) -> Any:
+    """Converts a value printed by RouterOS to its Python type.
+
+    Args:
+        value (str): Value as printed by the router.
+
+    Returns:
+        Any: int for integers, bool for true/yes/false/no, None for empty
+            values and str for everything else.
+    """
+    if not value:
+        return None
+    if value in _BOOLEANS:
+        return _BOOLEANS[value]
+    if _INTEGER.fullmatch(value):
+        return int(value)
+    return value
+
+
+def _unquote(value: str) -> str:
+    if len(value) > 1 and value[0] == value[-1] == '"':
+        return _ESCAPE.sub(r'\1', value[1:-1])
+    return value
+
+
+class PrintParser:
+    """Parses the output of `print`, `print detail` and `print terse`.
+
+    Lines are consumed one at a time, so it works on any iterable of lines
+    (e.g. a generator reading from the connection) and parses big tables in
+    a single pass. The format is detected from the output itself:
+
+    - tables, with or without the `Columns:` line, values are split using
+      the position of each column in the header;
+    - `detail` and `terse`, items starting with their number followed by
+      `name=value` properties;
+    - single items (e.g. `/system resource print`) with `name: value` lines.
+
+    The `Flags:` legend and the column names are available in `flags` and
+    `columns` once they have been read.
+
+    Args:
+        lines (Iterable[str]): Lines of the output.
+        convert (Callable): Function applied to each value, `typed_value`
+            by default, `str` keeps the values as printed.
+
+    Examples:
+        >>> parser = PrintParser(router.history_system_get().splitlines())
+        >>> list(parser)
+        [Row(index=None, flags='U', comment=None, values={'action': 'ntp settings changed', 'by': 'hick', 'policy': 'write'})]
+        >>> parser.flags
+        {'U': 'UNDOABLE'}
+    """
+
+    def __init__(
+        self,
+        lines: Iterable[str],
+        convert: Callable[[str], Any] = typed_value,
+    ):
+        self._lines = lines
+        self._convert = convert
+        self.flags: dict[str, str] = {}
+        self.columns: list[str] = []
+
+    def __iter__(self) -> Iterator[Row]:
+        lines = iter(self._lines)
+        for line in lines:
+            stripped = line.strip()
+            if not stripped:
+                continue
+            if stripped.startswith('Flags:'):
+                self.flags = {
+                    flag: name.strip()
+                    for flag, name in _FLAG.findall(stripped[6:])
+                }
+                continue
+            if stripped.startswith('Columns:'):
+                self.columns = [
+                    column.strip() for column in stripped[8:].split(',')
+                ]
+                continue
+
+            if self.columns or stripped.startswith('#'):
+                yield from self._table(line, lines)
+            elif _RECORD.fullmatch(line) and ('=' in line or ';;;' in line):
+                yield from self._records(line, lines)
+            elif _PROPERTY.fullmatch(line):
+                yield from self._properties(line, lines)
+            return
+
+    def _table(self, header: str, lines: Iterator[str]) -> Iterator[Row]:
+        """Parses table rows, `header` is the line with the column names."""
+        names = self.columns or [
+            column for column in header.split() if column != '#'
+        ]
+        starts = []
+        position = 0
+        for name in names:
+            column = re.compile(rf'(?<!\S){re.escape(name)}(?!\S)')
+            position = column.search(header, position).start()
+            starts.append(position)
+            position += len(name)
+        self.columns = names
+
+        keys = [name.lower() for name in names]
+        bounds = list(zip(starts, [*starts[1:], None]))
+        first = starts[0]
+        convert = self._convert
+        comment = None
+
+        for line in lines:
+            stripped = line.strip()
+            if not stripped:
+                continue
+            if stripped.startswith(';;;'):
+                comment = stripped[3:].strip()
+                continue
+
+            index = None
+            flags = ''
+            for token in line[:first].split():
+                if token.isdigit():
+                    index = int(token)
+                else:
+                    flags += token
+
+            values = {
+                key: convert(line[start:end].strip())
+                for key, (start, end) in zip(keys, bounds)
+            }
+            yield Row(index, flags, comment, values)
+            comment = None
+
+    def _records(self, first: str, lines: Iterator[str]) -> Iterator[Row]:
+        """Parses `detail` and `terse` items, `first` is the first line."""
+        convert = self._convert
+        row = None
+        for line in _chain(first, lines):
+            match = _RECORD.fullmatch(line)
+            if match:
+                if row is not None:
+                    yield row
+                number, flags, rest = match.groups()
+                comment = None
+                if rest.startswith(';;;'):
+                    comment, rest = rest[3:].strip(), ''
+                row = Row(int(number), flags.replace(' ', ''), comment, {})
+            elif row is None:
+                continue
+            else:
+                rest = line
+            for name, value in _ATTRIBUTE.findall(rest):
+                row.values[name] = convert(_unquote(value))
+
+        if row is not None:
+            yield row
+
+    def _properties(self, first: str, lines: Iterator[str]) -> Iterator[Row]:
+        """Parses a single item printed as `name: value` lines."""
+        values = {}
+        for line in _chain(first, lines):
+            match = _PROPERTY.fullmatch(line)
+            if match:
+                name, value = match.groups()
+                values[name] = self._convert(value.strip())
+        yield Row(None, '', None, values)
+
+
+def _chain(first: str, lines: Iterator[str]) -> Iterator[str]:
+    yield first
+    yield from lines
@@ -0,0 +1,164 @@
+import math
+import time
+from array import array
+from collections.abc import Iterable, Iterator
+from typing import NamedTuple
+
+
+class Aggregate(NamedTuple):
+    """Summary of the samples of a time window.
+
+    Attributes:
+        count (int): Number of samples in the window.
+        min (float): Smallest value.
+        max (float): Largest value.
+        mean (float): Average of the values.
+        p95 (float): 95th percentile of the values (nearest rank).
+    """
+
+    count: int
+    min: float
+    max: float
+    mean: float
+    p95: float
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Returns a percentile of sorted values, by the nearest rank method.
+
+    Args:
+        values (list[float]): Values in ascending order, at least one.
+        q (float): Percentile, from 0 to 100.
+
+    Returns:
+        float: Smallest value that is greater than or equal to `q` percent
+            of the values.
+    """
+    rank = max(math.ceil(q / 100 * len(values)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+def summarize(values: Iterable[float]) -> Aggregate | None:
+    """Summarizes values with their count, min, max, mean and p95.
+
+    Args:
+        values (Iterable[float]): Values to be summarized.
+
+    Returns:
+        Aggregate | None: Summary of the values, None if there are none.
+    """
+    values = sorted(values)
+    if not values:
+        return None
+    return Aggregate(
+        count=len(values),
+        min=values[0],
+        max=values[-1],
+        mean=math.fsum(values) / len(values),
+        p95=percentile(values, 95),
+    )
+
+
+class RingBuffer:
+    """Fixed-size series of timestamped samples.
+
+    Timestamps and values are kept in two preallocated `array`s of C doubles
+    (16 bytes per sample), so the memory used is fixed and appending never
+    allocates. When the buffer is full the oldest sample is overwritten.
+
+    Args:
+        size (int): Maximum number of samples kept.
+
+    Examples:
+        >>> series = RingBuffer(360)
+        >>> series.append(37.0)
+        >>> series.append(39.0)
+        >>> series.aggregate()
+        Aggregate(count=2, min=37.0, max=39.0, mean=38.0, p95=39.0)
+    """
+
+    __slots__ = ('_next', '_timestamps', '_values', 'count', 'size')
+
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError('The size of the buffer must be at least 1')
+        self.size = size
+        self.count = 0
+        self._next = 0
+        self._timestamps = array('d', bytes(8 * size))
+        self._values = array('d', bytes(8 * size))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, value: float, timestamp: float | None = None) -> None:
+        """Adds a sample, overwriting the oldest one if the buffer is full.
+
+        Args:
+            value (float): Value of the sample.
+            timestamp (float): Unix time of the sample, now by default.
+        """
+        self._timestamps[self._next] = (
+            time.time() if timestamp is None else timestamp
+        )
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def copy(self) -> 'RingBuffer':
+        """Returns a copy of the buffer, unchanged by later appends."""
+        other = RingBuffer.__new__(RingBuffer)
+        other.size, other.count, other._next = (
+            self.size,
+            self.count,
+            self._next,
+        )
+        other._timestamps = array('d', self._timestamps)
+        other._values = array('d', self._values)
+        return other
+
+    def __iter__(self) -> Iterator[tuple[float, float]]:
+        """Yields the `(timestamp, value)` samples from oldest to newest."""
+        start = (self._next - self.count) % self.size
+        for offset in range(self.count):
+            index = (start + offset) % self.size
+            yield self._timestamps[index], self._values[index]
+
+    def last(self) -> tuple[float, float] | None:
+        """Returns the newest `(timestamp, value)` sample, None if empty."""
+        if not self.count:
+            return None
+        index = (self._next - 1) % self.size
+        return self._timestamps[index], self._values[index]
+
+    def window(
+        self, seconds: float | None = None, now: float | None = None
+    ) -> array:
+        """Returns the values of the samples of the last seconds.
+
+        Args:
+            seconds (float): Length of the window, all samples if None.
+            now (float): Unix time the window ends at, now by default.
+
+        Returns:
+            array: Values from oldest to newest.
+        """
+        if seconds is None:
+            return array('d', (value for _, value in self))
+        start = (time.time() if now is None else now) - seconds
+        return array('d', (value for stamp, value in self if stamp >= start))
+
+    def aggregate(
+        self, seconds: float | None = None, now: float | None = None
+    ) -> Aggregate | None:
+        """Summarizes the samples of the last seconds.
+
+        Args:
+            seconds (float): Length of the window, all samples if None.
+            now (float): Unix time the window ends at, now by default.
+
+        Returns:
+            Aggregate | None: Count, min, max, mean and p95 of the window,
+                None if there are no samples in it.
+        """
+        return summarize(self.window(seconds, now))
@@ -0,0 +1,74 @@
+from threading import Lock
+
+
+class AdaptiveTiming:
+    """Read timeout of a connection stretched for slow commands.
+
+    The duration of the commands is smoothed as TCP does with its
+    retransmission timeout (RFC 6298): an average and a mean deviation
+    updated by every command. Routers whose commands take longer than
+    `min_timeout` get longer read timeouts instead of a `ReadTimeout`, and
+    every timeout doubles it until commands succeed again.
+
+    It never makes commands faster: on Netmiko 4 the `read_timeout` only
+    bounds how long the output is waited for, and the floor is Netmiko's
+    own default, so fast routers run exactly as with a fixed delay.
+
+    Args:
+        min_timeout (float): Minimum read timeout, in seconds.
+        max_timeout (float): Maximum read timeout, in seconds.
+
+    Examples:
+        >>> timing = AdaptiveTiming()
+        >>> timing.observe(elapsed=0.012)
+        >>> timing.read_timeout()
+        10.0
+    """
+
+    alpha = 0.125
+    beta = 0.25
+
+    def __init__(self, min_timeout: float = 10.0, max_timeout: float = 120.0):
+        # Commands of many exec channels are observed at the same time
+        self._lock = Lock()
+        self._min_timeout = min_timeout
+        self._max_timeout = max_timeout
+        self._backoff = 1.0
+        self.elapsed: float | None = None
+        self.elapsed_deviation = 0.0
+
+    def observe(self, elapsed: float) -> None:
+        """Adds the duration of a command that succeeded.
+
+        Args:
+            elapsed (float): Seconds the whole command took.
+        """
+        with self._lock:
+            if self.elapsed is None:
+                self.elapsed, self.elapsed_deviation = elapsed, elapsed / 2
+            else:
+                self.elapsed_deviation += self.beta * (
+                    abs(self.elapsed - elapsed) - self.elapsed_deviation
+                )
+                self.elapsed += self.alpha * (elapsed - self.elapsed)
+            self._backoff = max(self._backoff / 2, 1.0)
+
+    def backoff(self) -> None:
+        """Doubles the read timeout after a command timed out."""
+        with self._lock:
+            self._backoff = min(self._backoff * 2, 64.0)
+
+    def read_timeout(self) -> float:
+        """Returns the seconds to wait for the output of a command.
+
+        Returns:
+            float: Average duration of the commands plus four deviations,
+                at least `min_timeout`, multiplied by the backoff and
+                limited to `max_timeout`.
+        """
+        with self._lock:
+            timeout = self._min_timeout
+            if self.elapsed is not None:
+                timeout = self.elapsed + 4 * self.elapsed_deviation
+            timeout = max(timeout, self._min_timeout) * self._backoff
+        return min(timeout, self._max_timeout)
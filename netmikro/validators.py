@@ -1,3 +1,4 @@
+from datetime import date, datetime, time
 from ipaddress import IPv4Address
 from typing import Annotated
 
@@ -51,7 +52,7 @@ class NTPClient(BaseModel):
     vrf: str
     freq_diff: int
     status: str
-    synced_server: IPv4Address
+    synced_server: IPv4Address | None
     synced_stratum: int
     system_offset: int
 
@@ -63,3 +64,31 @@ class NTPServer(BaseModel):
     manycast: bool
     broadcast_address: IPv4Address | None
     vrf: str
+
+
+class Clock(BaseModel):
+    time: time
+    date: date
+    time_zone: str
+    gmt_offset: str
+    dst_active: bool
+    time_zone_autodetect: bool
+
+
+class Health(BaseModel):
+    voltage: float
+    temperature: float
+
+
+class Snapshot(BaseModel):
+    host: str
+    collected_at: datetime
+    identity: str
+    note: str
+    resources: Resources
+    routerboard: IfRouterboard | None
+    license: License | None
+    health: Health | None
+    clock: Clock
+    ntp_client: NTPClient
+    ntp_server: NTPServer
@@ -5,6 +5,7 @@ import pytest
 from dotenv import load_dotenv
 
 from netmikro.routeros import RouterOS
+from netmikro.transports import FakeRouter
 
 load_dotenv()
 
@@ -50,3 +51,22 @@ def validate_ip(ip):
     :return: True if ip is valid, False otherwise
     """
     return match(r'^((25[0-5]|(2[0-4]|1\d|[1-9]|)\d)\.?\b){4}$', ip)
+
+
+@pytest.fixture
+def fake():
+    """Fixture with a simulated router, to run tests without hardware."""
+    return FakeRouter()
+
+
+@pytest.fixture
+def offline_router(fake):
+    """Fixture to create a RouterOS connection with the simulated router."""
+    connection = RouterOS(
+        host='192.0.2.1',
+        username='netmikro',
+        password='nulliusinverba',
+        transport=fake,
+    )
+    yield connection
+    connection.disconnect()
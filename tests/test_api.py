@@ -0,0 +1,89 @@
+import socket
+from threading import Thread
+
+import pytest
+
+from netmikro import RouterOS
+from netmikro.exceptions import ApiError, InvalidTransport
+from netmikro.transports import ApiConnection
+from netmikro.transports.api import encode_length, encode_sentence
+
+
+def serve(sock, replies):
+    """Answer each sentence received with the next list of reply sentences."""
+    client = ApiConnection(sock)
+    for reply in replies:
+        client.read_sentence()
+        for sentence in reply:
+            sock.sendall(encode_sentence(*sentence))
+
+
+@pytest.fixture
+def api():
+    def factory(*replies):
+        client, server = socket.socketpair()
+        Thread(target=serve, args=(server, replies), daemon=True).start()
+        return ApiConnection(client)
+
+    return factory
+
+
+@pytest.mark.parametrize(
+    ('length', 'encoded'),
+    [
+        (0x7F, b'\x7f'),
+        (0x80, b'\x80\x80'),
+        (0x3FFF, b'\xbf\xff'),
+        (0x4000, b'\xc0\x40\x00'),
+        (0x200000, b'\xe0\x20\x00\x00'),
+        (0x10000000, b'\xf0\x10\x00\x00\x00'),
+    ],
+)
+def test_api_encode_length(length, encoded):
+    assert encode_length(length) == encoded
+
+
+def test_api_read_long_word(api):
+    value = 'x' * 0x4000
+    connection = api([('!re', f'=note={value}'), ('!done',)])
+    assert connection.talk('/system/note/print') == [{'note': value}]
+
+
+def test_api_print(api):
+    connection = api([
+        ('!re', '=name=api', '=port=8728'),
+        ('!re', '=name=ssh', '=port=22'),
+        ('!done',),
+    ])
+
+    assert connection.print('/ip service', 'name', 'port') == [
+        {'name': 'api', 'port': '8728'},
+        {'name': 'ssh', 'port': '22'},
+    ]
+
+
+def test_api_send_command(api):
+    connection = api([('!done', '=ret=Netmikro\r\n')])
+    assert connection.send_command('return [/system identity get name]') == (
+        'Netmikro'
+    )
+
+
+def test_api_trap(api):
+    connection = api([
+        ('!trap', '=message=no such command'),
+        ('!done',),
+    ])
+
+    with pytest.raises(ApiError, match='no such command'):
+        connection.talk('/test')
+
+
+def test_create_connection_with_invalid_transport():
+    with pytest.raises(InvalidTransport, match='Invalid transport: telnet'):
+        RouterOS(
+            host='192.168.3.4',
+            username='netmikro',
+            password='nulliusinverba',
+            transport='telnet',
+        )
@@ -0,0 +1,174 @@
+import asyncio
+from ipaddress import IPv4Address
+
+import pytest
+from pydantic import ValidationError
+
+from netmikro import AsyncRouterOS
+from netmikro.exceptions import InvalidTransport
+from netmikro.transports import AsyncApiConnection, FakeRouter
+from netmikro.transports.api import encode_sentence, parse_attributes
+from netmikro.validators import NTPClient
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+async def connect(fake, **kwargs):
+    return await AsyncRouterOS.connect(
+        '192.0.2.1',
+        'netmikro',
+        'nulliusinverba',
+        transport=fake.connect_async,
+        **kwargs,
+    )
+
+
+async def serve_api(fake):
+    """Serves the RouterOS API of a `FakeRouter` on a local port."""
+
+    async def handle(reader, writer):
+        connection = AsyncApiConnection(reader, writer)
+        while True:
+            try:
+                command, *words = await connection.read_sentence()
+            except ConnectionError:
+                break
+            attributes = parse_attributes(words)
+            reply = [('!done',)]
+            if command == '/execute':
+                output = fake.round_trip(attributes['script'])
+                reply = [('!done', f'=ret={output}')]
+            for sentence in reply:
+                writer.write(encode_sentence(*sentence))
+            await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(handle, '127.0.0.1', 0)
+
+
+def test_async_connect_with_negative_port():
+    with pytest.raises(
+        ValidationError, match='Input should be greater than or equal to 0'
+    ):
+        run(
+            AsyncRouterOS.connect(
+                host='192.168.3.4',
+                username='netmikro',
+                password='nulliusinverba',
+                port=-1,
+            )
+        )
+
+
+def test_async_connect_with_blocking_transport():
+    with pytest.raises(
+        InvalidTransport, match='Invalid asyncio transport: ssh'
+    ):
+        run(
+            AsyncRouterOS.connect(
+                '192.0.2.1', 'netmikro', 'secret', transport='ssh'
+            )
+        )
+
+
+def test_async_getters():
+    async def read():
+        async with await connect(FakeRouter()) as router:
+            return (
+                await router.cmd('/system identity print'),
+                await router.identity(),
+                await router.clock_time_zone_get(),
+                await router.health_voltage(),
+                await router.service(),
+                await router.license(),
+            )
+
+    output, identity, time_zone, voltage, service, license = run(read())
+    assert output == 'name: MikroTik'
+    assert identity == 'MikroTik'
+    assert time_zone == 'America/Sao_Paulo'
+    assert voltage == 24.1  # noqa: PLR2004
+    assert service['www-ssl'].disabled is True
+    assert license.level == 4  # noqa: PLR2004
+
+
+def test_async_setters():
+    fake = FakeRouter()
+
+    async def change():
+        async with await connect(fake) as router:
+            await router.identity_set('Async')
+            await router.ntp_client_set(['192.0.2.10'], enabled=False)
+            return await router.ntp_client_get()
+
+    client = run(change())
+    assert fake.menus['/system identity']['name'] == 'Async'
+    assert isinstance(client, NTPClient)
+    assert client.enabled is False
+    assert client.servers == [IPv4Address('192.0.2.10')]
+
+
+def test_async_snapshot_in_two_round_trips():
+    fake = FakeRouter()
+
+    async def read():
+        async with await connect(fake, trusted=True) as router:
+            fake.reset_stats()
+            return await router.snapshot()
+
+    snapshot = run(read())
+    assert fake.round_trips == 2  # noqa: PLR2004
+    assert snapshot.host == '192.0.2.1'
+    assert snapshot.routerboard.model == 'RB951Ui-2HnD'
+
+
+def test_async_routers_share_one_loop():
+    fakes = [FakeRouter(latency=0.05) for _ in range(50)]
+
+    async def read():
+        routers = await asyncio.gather(*(connect(fake) for fake in fakes))
+        try:
+            return await asyncio.gather(
+                *(router.health_sample(['ether1']) for router in routers)
+            )
+        finally:
+            await asyncio.gather(*(router.disconnect() for router in routers))
+
+    loop = asyncio.new_event_loop()
+    started = loop.time()
+    samples = loop.run_until_complete(read())
+    elapsed = loop.time() - started
+    loop.close()
+
+    assert len(samples) == len(fakes)
+    # Two round trips per router (the board check and the sample), waited
+    # for at the same time instead of one router after the other
+    assert elapsed < 1
+
+
+def test_async_api_transport():
+    fake = FakeRouter()
+
+    async def read():
+        server = await serve_api(fake)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            router = await AsyncRouterOS.connect(
+                '127.0.0.1', 'netmikro', 'secret', port
+            )
+            async with router:
+                return await asyncio.gather(
+                    router.identity(),
+                    router.ntp_client_get(),
+                    router.clock_date_get(),
+                )
+
+    identity, client, _ = run(read())
+    assert identity == 'MikroTik'
+    assert client.servers == [
+        IPv4Address('200.160.7.186'),
+        IPv4Address('201.49.148.135'),
+    ]
+    assert fake.round_trips == 3  # noqa: PLR2004
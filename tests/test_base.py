@@ -1,5 +1,7 @@
 from dotenv import load_dotenv
 
+from netmikro.utils import boolean, number
+
 load_dotenv()
 
 
@@ -9,3 +11,21 @@ def test_base_get_number_return_0_if_output_is_empty(router):
 
 def test_base_get_float_return_0_if_output_is_empty(router):
     assert router._get_float('/system/license/get features') == 0.0
+
+
+def test_base_get_batch(router):
+    output = router._get_batch({
+        'name': '/system identity get name',
+        'level': ('/system license get nlevel', number),
+        'routerboard': ('/system routerboard get routerboard', boolean),
+    })
+
+    assert output == {
+        'name': router._get('/system identity get name'),
+        'level': router._get_number('/system license get nlevel'),
+        'routerboard': router.is_routerboard(),
+    }
+
+
+def test_base_get_batch_empty(router):
+    assert router._get_batch({}) == {}
@@ -0,0 +1,26 @@
+import copy
+
+from benchmarks.run import CASES, compare, run_suite
+
+
+def test_benchmarks_run_offline():
+    results = run_suite(rtt=0, repeat=1)['results']
+    assert list(results) == [case.name for case in CASES]
+    assert results['__init__']['round_trips'] == 0
+    assert results['ntp_client_get']['round_trips'] == 1
+    assert results['cmd_pipeline']['round_trips'] == 1
+
+
+def test_benchmarks_compare():
+    baseline = run_suite(rtt=0, repeat=1)
+    current = copy.deepcopy(baseline)
+    assert compare(current, baseline) == []
+
+    current['results']['ntp_client_get']['round_trips'] = 9
+    current['results']['identity_set']['wall'] += 1
+    assert compare(current, baseline) == [
+        'ntp_client_get: round_trips 1 -> 9',
+        f'identity_set: wall '
+        f'{baseline["results"]["identity_set"]["wall"] * 1000:.2f}ms -> '
+        f'{current["results"]["identity_set"]["wall"] * 1000:.2f}ms',
+    ]
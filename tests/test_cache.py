@@ -0,0 +1,195 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier, Event
+
+import pytest
+
+from netmikro import RouterOS
+from netmikro.transports import FakeRouter
+from netmikro.utils import (
+    Generations,
+    SingleFlight,
+    TTLCache,
+    cached,
+    invalidates,
+)
+
+
+class Getter:
+    def __init__(self, cache):
+        self._cache = cache
+        self.calls = 0
+
+    @cached
+    def value_get(self, suffix=''):
+        self.calls += 1
+        return f'{self.calls}{suffix}'
+
+    @invalidates('value_get')
+    def value_set(self):
+        pass
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_cache_expires(clock):
+    cache = TTLCache(ttl=10)
+    cache.set(('value_get',), 1)
+    assert cache.get(('value_get',)) == 1
+
+    clock[0] = 11
+    assert cache.get(('value_get',)) is None
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TTLCache(ttl=10, maxsize=2)
+    cache.set(('a',), 1)
+    cache.set(('b',), 2)
+    cache.get(('a',))
+    cache.set(('c',), 3)
+
+    assert cache.get(('a',)) == 1
+    assert cache.get(('b',)) is None
+    assert len(cache) == 2  # noqa: PLR2004
+
+
+def test_cache_ttl_per_method():
+    cache = TTLCache(ttl={'a': 10})
+    cache.set(('a',), 1)
+    cache.set(('b',), 2)
+
+    assert cache.get(('a',)) == 1
+    assert cache.get(('b',)) is None
+
+
+def test_cached_getter_and_invalidating_setter():
+    getter = Getter(TTLCache(ttl=10))
+
+    assert getter.value_get() == '1'
+    assert getter.value_get() == '1'
+    assert getter.value_get(suffix='!') == '2!'
+
+    getter.value_set()
+    assert getter.value_get() == '3'
+
+
+def test_cached_getter_without_cache():
+    getter = Getter(None)
+
+    assert getter.value_get() == '1'
+    assert getter.value_get() == '2'
+
+
+class RacingGetter(Getter):
+    @cached
+    def value_get(self, suffix=''):
+        self.calls += 1
+        if self.calls == 1:
+            # A setter of another thread runs while the value is being read
+            self.value_set()
+        return f'{self.calls}{suffix}'
+
+
+def test_read_overlapping_a_setter_is_not_cached():
+    getter = RacingGetter(TTLCache(ttl=10))
+    getter._generations = Generations()
+
+    assert getter.value_get() == '1'
+    assert getter.value_get() == '2'
+    assert getter.value_get() == '2'
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    flights = SingleFlight()
+    started, release = Event(), Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait()
+        return 'value'
+
+    with ThreadPoolExecutor(4) as executor:
+        leader = executor.submit(flights.do, ('key',), slow)
+        started.wait()
+        followers = [
+            executor.submit(flights.do, ('key',), slow) for _ in range(3)
+        ]
+        time.sleep(0.05)
+        release.set()
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert results == ['value'] * 4
+    assert len(calls) == 1
+    assert len(flights) == 0
+
+    # Calls after the first one finished run again
+    release.set()
+    flights.do(('key',), slow)
+    assert len(calls) == 2  # noqa: PLR2004
+
+
+def test_single_flight_shares_errors():
+    flights = SingleFlight()
+
+    def fail():
+        raise ValueError('boom')
+
+    with pytest.raises(ValueError, match='boom'):
+        flights.do(('key',), fail)
+    assert len(flights) == 0
+
+
+def test_router_coalesces_concurrent_getters():
+    fake = FakeRouter(latency=0.05)
+    router = RouterOS('192.0.2.1', 'netmikro', 'secret', transport=fake)
+    barrier = Barrier(8)
+
+    def read(_):
+        barrier.wait()
+        return router.clock_time_zone_get()
+
+    fake.reset_stats()
+    with ThreadPoolExecutor(8) as executor:
+        time_zones = list(executor.map(read, range(8)))
+
+    assert len(set(time_zones)) == 1
+    assert fake.round_trips == 1
+
+    # Different getters are sent one at a time over the connection
+    fake.reset_stats()
+    with ThreadPoolExecutor(2) as executor:
+        offset = executor.submit(router.clock_gmt_offset_get)
+        ntp = executor.submit(router.ntp_client_get)
+        assert offset.result()
+        assert ntp.result()
+    assert fake.round_trips == 2  # noqa: PLR2004
+    router.disconnect()
+
+
+def test_router_coalesces_live_readings_without_caching():
+    fake = FakeRouter(latency=0.05)
+    router = RouterOS('192.0.2.1', 'netmikro', 'secret', transport=fake)
+    barrier = Barrier(8)
+
+    def read(_):
+        barrier.wait()
+        return router.health_temperature()
+
+    fake.reset_stats()
+    with ThreadPoolExecutor(8) as executor:
+        temperatures = list(executor.map(read, range(8)))
+
+    assert temperatures == [37.0] * 8
+    assert fake.round_trips == 1
+
+    # A reading made after the others finished is read again
+    router.health_temperature()
+    assert fake.round_trips == 2  # noqa: PLR2004
+    router.disconnect()
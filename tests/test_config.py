@@ -0,0 +1,197 @@
+import pytest
+
+from netmikro import RouterFleet
+from netmikro.exceptions import ConfigError
+from netmikro.transports import FakeRouter
+from netmikro.utils import ConfigTree, format_value
+
+EXPORT = r"""# 2024-01-01 12:00:00 by RouterOS 7.12
+# software id = E2VM-S6B8
+#
+# model = RB951Ui-2HnD
+/interface bridge
+add name=bridge
+/interface ethernet
+set [ find default-name=ether1 ] comment="Link \"WAN\"" \
+    mtu=1500
+/ip address
+add address=192.168.88.1/24 interface=bridge network=192.168.88.0
+/ip service
+set telnet disabled=yes
+set api port=8729
+/system identity
+set name=Roteador\_A\C3\A7\C3\A3o
+"""
+
+
+def test_config_tree_parses_export():
+    tree = ConfigTree(EXPORT.splitlines())
+
+    assert tree.header == {'software id': 'E2VM-S6B8', 'model': 'RB951Ui-2HnD'}
+    assert list(tree) == [
+        '/interface bridge',
+        '/interface ethernet',
+        '/ip address',
+        '/ip service',
+        '/system identity',
+    ]
+    assert tree.get('/system identity', 'name') == 'Roteador Ação'
+    assert tree.get('ip/service', 'port', item='api') == 8729  # noqa: PLR2004
+    assert tree.get('/ip service', 'port', item='ssh', default=22) == 22  # noqa: PLR2004
+    assert tree['/ip service'].find(disabled=True) == [
+        {'name': 'telnet', 'disabled': True}
+    ]
+    assert tree['/interface ethernet'].item('ether1') == {
+        'default-name': 'ether1',
+        'comment': 'Link "WAN"',
+        'mtu': 1500,
+    }
+    assert tree['/ip address'].items[0]['network'] == '192.168.88.0'
+    assert '/ip route' not in tree
+
+
+def test_format_value_reverts_typed_value():
+    assert not format_value(None)
+    assert format_value(False) == 'no'
+    assert format_value(8728) == '8728'
+    assert format_value(['a', 'b']) == 'a,b'
+
+
+def test_config_reads_export_in_one_round_trip(offline_router, fake):
+    fake.round_trip('/system identity set name="Ação"')
+    fake.reset_stats()
+    tree = offline_router.config()
+
+    assert fake.round_trips == 1
+    assert tree.header['software id'] == 'E2VM-S6B8'
+    assert tree.get('/system ntp client', 'servers') == (
+        '200.160.7.186,201.49.148.135'
+    )
+    assert '/system resource' not in tree
+
+    # The attributes in the export are not read again
+    assert offline_router.identity == 'Ação'
+    assert not offline_router.note
+    assert offline_router.service['www-ssl'].disabled is True
+    assert offline_router.service['api'].port == 8728  # noqa: PLR2004
+    assert fake.round_trips == 1
+
+
+def test_config_keeps_free_text_as_exported(offline_router, fake):
+    fake.round_trip('/system identity set name=007')
+    fake.round_trip('/system note set note=true')
+    tree = offline_router.config('/system identity', '/system note')
+
+    assert tree.get('/system identity', 'name') == '007'
+    assert tree.get('/system note', 'note') == 'true'
+    assert offline_router.identity == '007'
+    assert offline_router.note == 'true'
+
+
+def test_config_of_some_sections(offline_router, fake):
+    fake.reset_stats()
+    tree = offline_router.config('/ip service', '/system ntp')
+
+    assert fake.round_trips == 1
+    assert list(tree) == [
+        '/ip service',
+        '/system ntp client',
+        '/system ntp server',
+    ]
+
+    tree = offline_router.config('/system identity', verbose=False)
+    assert list(tree) == []
+    assert 'identity' not in offline_router.__dict__
+
+
+DESIRED = {
+    '/system ntp client': {
+        'enabled': True,
+        'servers': ['200.160.7.186', '201.49.148.135'],
+    },
+    '/system note': {'note': 'Core $router'},
+    '/ip service': {'telnet': {'disabled': True}, 'api': {'port': 8728}},
+}
+
+
+def test_config_tree_diff_only_changes():
+    tree = ConfigTree(EXPORT.splitlines())
+
+    assert tree.diff({
+        '/system identity': {'name': 'Roteador Ação'},
+        '/ip service': {
+            'telnet': {'disabled': True},
+            'api': {'port': 8728},
+            'ssh': None,
+        },
+        '/interface ethernet': {'ether1': {'mtu': 1500, 'comment': 'WAN'}},
+        '/interface bridge': {'bridge': None, 'lan': {'vlan-filtering': True}},
+        '/system note': {'note': 'Core $router'},
+    }) == [
+        '/ip service set [ find name=api ] port=8728',
+        '/interface ethernet set [ find default-name=ether1 ] comment=WAN',
+        '/interface bridge remove [ find name=bridge ]',
+        '/interface bridge add name=lan vlan-filtering=yes',
+        '/system note set note="Core \\$router"',
+    ]
+
+
+def test_apply_config_in_one_script(offline_router, fake):
+    fake.reset_stats()
+    commands = offline_router.apply_config(DESIRED)
+
+    assert commands == [
+        '/system note set note="Core \\$router"',
+        '/ip service set [ find name=telnet ] disabled=yes',
+    ]
+    assert fake.round_trips == 2  # noqa: PLR2004
+    assert offline_router.note == 'Core $router'
+    assert offline_router.service['telnet'].disabled is True
+
+    # A router already in the desired state only gets the export
+    fake.reset_stats()
+    assert offline_router.apply_config(DESIRED) == []
+    assert fake.round_trips == 1
+
+
+def test_apply_config_error(offline_router):
+    with pytest.raises(ConfigError, match='expected end of command'):
+        offline_router.apply_config({'/system note': {'colour': 'red'}})
+
+
+def test_setters_always_send(offline_router, fake):
+    offline_router.config()
+    fake.menus['/system identity']['name'] = 'Changed'
+    fake.reset_stats()
+    offline_router.identity_set(' MikroTik ')
+    offline_router.ip_port_set('api', 8728)
+
+    # The values loaded before may be stale, so the setters do not skip them
+    assert fake.round_trips == 2  # noqa: PLR2004
+    assert fake.menus['/system identity']['name'] == 'MikroTik'
+    assert offline_router.identity == 'MikroTik'
+
+
+def test_fleet_apply_config_rollout():
+    routers = [FakeRouter() for _ in range(3)]
+    routers[0].round_trip('/system note set note="Core \\$router"')
+    routers[0].round_trip('/ip service set telnet disabled=yes')
+    routers[0].reset_stats()
+    fleet = RouterFleet(
+        {
+            'host': f'192.0.2.{index}',
+            'username': 'netmikro',
+            'password': 'nulliusinverba',
+            'transport': router,
+        }
+        for index, router in enumerate(routers, 1)
+    )
+    with fleet:
+        results = {
+            result.host: result for result in fleet.apply_config(DESIRED)
+        }
+
+    assert all(result.ok for result in results.values())
+    assert results['192.0.2.1'].value == []
+    assert len(results['192.0.2.2'].value) == 2  # noqa: PLR2004
+    assert [router.round_trips for router in routers] == [1, 2, 2]
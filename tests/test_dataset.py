@@ -0,0 +1,96 @@
+import math
+
+import pytest
+
+from netmikro import FleetDataset, RouterFleet
+from netmikro.transports import FakeRouter
+from netmikro.utils import Aggregate
+
+ROWS = [
+    {'host': '192.0.2.1', 'version': '7.12', 'offset': 3, 'memory': 64},
+    {'host': '192.0.2.2', 'version': '7.11', 'offset': 80, 'memory': 128},
+    {'host': '192.0.2.3', 'version': '7.12', 'offset': None, 'memory': 256},
+    {'host': '192.0.2.4', 'version': None, 'offset': -60, 'memory': 512},
+]
+
+
+def test_dataset_columns():
+    dataset = FleetDataset(ROWS)
+
+    assert len(dataset) == 4  # noqa: PLR2004
+    assert dataset.column('offset').typecode == 'd'
+    assert math.isnan(dataset.column('offset')[2])
+    assert dataset.column('version') == ['7.12', '7.11', '7.12', None]
+    assert list(dataset)[2]['offset'] is None
+
+
+def test_dataset_queries():
+    dataset = FleetDataset(ROWS)
+
+    assert dataset.where('offset', '>', 50).hosts == ['192.0.2.2']
+    assert dataset.where('offset', '!=', 3).hosts == [
+        '192.0.2.2',
+        '192.0.2.4',
+    ]
+    assert dataset.where('version', '==', '7.12').hosts == [
+        '192.0.2.1',
+        '192.0.2.3',
+    ]
+    assert dataset.count_by('version') == {'7.12': 2, '7.11': 1, None: 1}
+    assert dataset.group_by('version')['7.11'].column('memory').tolist() == [
+        128.0
+    ]
+    assert dataset.percentile('memory', 50) == 128.0  # noqa: PLR2004
+    assert dataset.describe('offset') == Aggregate(
+        3, -60.0, 80.0, 23 / 3, 80.0
+    )
+
+    with pytest.raises(TypeError, match='not numeric'):
+        dataset.percentile('version', 50)
+
+
+def test_dataset_missing_numbers_are_one_key():
+    dataset = FleetDataset(ROWS + [{'host': '192.0.2.5', 'offset': None}])
+
+    assert dataset.count_by('offset') == {None: 2, 3.0: 1, 80.0: 1, -60.0: 1}
+    groups = dataset.group_by('offset')
+    assert len(groups) == 4  # noqa: PLR2004
+    assert groups[None].hosts == ['192.0.2.3', '192.0.2.5']
+
+
+def test_fleet_dataset_from_snapshots():
+    routers = [FakeRouter(), FakeRouter()]
+    routers[1].menus['/system ntp client']['system-offset'] = '75'
+    fleet = RouterFleet(
+        {
+            'host': f'192.0.2.{index}',
+            'username': 'netmikro',
+            'password': 'nulliusinverba',
+            'transport': router,
+        }
+        for index, router in enumerate(routers, 1)
+    )
+    with fleet:
+        dataset = fleet.dataset()
+
+    assert sorted(dataset.hosts) == ['192.0.2.1', '192.0.2.2']
+    assert dataset.count_by('port') == {22.0: 2}
+    assert dataset.column('username') == ['netmikro', 'netmikro']
+    assert dataset.where('ntp_client.system_offset', '>', 50).hosts == [
+        '192.0.2.2'
+    ]
+    assert dataset.count_by('resources.version') == {'7.12 (stable)': 2}
+    assert dataset.column('ntp_client.servers')[0] == (
+        '200.160.7.186,201.49.148.135'
+    )
+
+
+def test_dataset_concat():
+    first = FleetDataset([{'host': 'a', 'cpu': 1, 'version': '7.12'}])
+    second = FleetDataset([{'host': 'b', 'cpu': 'MIPS'}])
+
+    dataset = FleetDataset.concat([first, second])
+
+    assert dataset.hosts == ['a', 'b']
+    assert dataset.column('cpu') == ['1', 'MIPS']
+    assert dataset.column('version') == ['7.12', None]
@@ -0,0 +1,104 @@
+import sqlite3
+
+import pytest
+
+from netmikro import FactCache, RouterOS
+from netmikro.facts import Fingerprint
+from netmikro.transports import FakeRouter
+from netmikro.utils import duration
+
+
+@pytest.mark.parametrize(
+    ('text', 'seconds'),
+    [
+        ('1d02:03:04', 93784),
+        ('03:04:05', 11045),
+        ('1w2d3h4m5s', 788645),
+        ('', 0),
+    ],
+)
+def test_duration(text, seconds):
+    assert duration(text) == seconds
+
+
+def connect(fake, facts):
+    return RouterOS(
+        '192.0.2.1', 'netmikro', 'secret', transport=fake, facts=facts
+    )
+
+
+def test_facts_warm_start(tmp_path):
+    fake = FakeRouter()
+    facts = FactCache(tmp_path / 'facts.db')
+    cold = connect(fake, facts)
+
+    fake.reset_stats()
+    assert cold.routerboard.serial_number == 'HE108GV1S3D'
+    assert cold.license.software_id == 'E2VM-S6B8'
+    assert cold.resources.version == '7.12 (stable)'
+    # Fingerprint, then resources with the flag, then board and license
+    assert fake.round_trips == 3  # noqa: PLR2004
+    assert len(facts) == 1
+
+    # A new process reads only the fingerprint
+    facts.close()
+    facts = FactCache(tmp_path / 'facts.db')
+    warm = connect(fake, facts)
+    fake.reset_stats()
+    assert warm.routerboard == cold.routerboard
+    assert warm.license == cold.license
+    assert warm.resources == cold.resources
+    assert fake.round_trips == 1
+
+
+def test_facts_refetched_after_upgrade():
+    fake = FakeRouter()
+    facts = FactCache()
+    assert connect(fake, facts).resources.version == '7.12 (stable)'
+
+    fake.menus['/system resource']['version'] = '7.13 (stable)'
+    fake.reset_stats()
+    assert connect(fake, facts).resources.version == '7.13 (stable)'
+    assert fake.round_trips == 3  # noqa: PLR2004
+
+
+def test_facts_fingerprint_boot_time():
+    facts = FactCache(boot_tolerance=30)
+    fingerprint = Fingerprint('7.12', 'RB951Ui-2HnD', 1000.0)
+    facts.set('192.0.2.1', 22, fingerprint, {'routerboard': None})
+
+    assert facts.get('192.0.2.1', 22, fingerprint._replace(boot_time=1010.0))
+    # Rebooted since the records were stored
+    assert (
+        facts.get('192.0.2.1', 22, fingerprint._replace(boot_time=5000.0))
+        is None
+    )
+    assert facts.get('192.0.2.2', 22, fingerprint) is None
+
+    facts.invalidate('192.0.2.1')
+    assert len(facts) == 0
+
+
+def test_facts_keyed_by_host_and_port():
+    facts = FactCache()
+    fingerprint = Fingerprint('7.12', 'RB951Ui-2HnD', 1000.0)
+    # Two routers behind the same address, one port each
+    facts.set('192.0.2.1', 2201, fingerprint, {'routerboard': None})
+    facts.set('192.0.2.1', 2202, fingerprint._replace(version='7.13'), {})
+
+    assert facts.get('192.0.2.1', 2201, fingerprint) == {'routerboard': None}
+    assert facts.get('192.0.2.1', 2202, fingerprint) is None
+    assert len(facts) == 2  # noqa: PLR2004
+
+    facts.invalidate('192.0.2.1')
+    assert len(facts) == 0
+
+
+def test_facts_drops_table_keyed_by_host(tmp_path):
+    path = tmp_path / 'facts.db'
+    with sqlite3.connect(path) as db:
+        db.execute('CREATE TABLE facts (host TEXT PRIMARY KEY)')
+        db.execute("INSERT INTO facts VALUES ('192.0.2.1')")
+    db.close()
+
+    assert len(FactCache(path)) == 0
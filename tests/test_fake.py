@@ -0,0 +1,138 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from ipaddress import IPv4Address
+
+from netmikro import RouterOS
+from netmikro.transports import FakeRouter
+
+
+def test_fake_transport_by_name():
+    router = RouterOS('192.0.2.1', 'netmikro', 'secret', transport='fake')
+    assert router.identity == 'MikroTik'
+    router.disconnect()
+    assert not router._connection.is_alive()
+
+
+def test_fake_getters(offline_router):
+    assert offline_router.identity == 'MikroTik'
+    assert offline_router.resources.architecture == 'mipsbe'
+    assert offline_router.license.level == 4  # noqa: PLR2004
+    assert offline_router.health_voltage() == 24.1  # noqa: PLR2004
+    assert offline_router.clock_gmt_offset_get() == '-03:00'
+    assert offline_router.service['www-ssl'].disabled is True
+
+
+def test_fake_batch_is_one_round_trip(offline_router, fake):
+    fake.reset_stats()
+    client = offline_router.ntp_client_get()
+    assert client.servers == [
+        IPv4Address('200.160.7.186'),
+        IPv4Address('201.49.148.135'),
+    ]
+    assert fake.round_trips == 1
+    assert fake.bytes_sent > 0
+    assert fake.bytes_received > 0
+
+
+def test_fake_set_changes_state(offline_router, fake):
+    offline_router.ntp_client_set(['192.0.2.10', '192.0.2.11'], False)
+    offline_router.note_set('Offline router', True)
+
+    client = offline_router.ntp_client_get()
+    assert client.enabled is False
+    assert client.servers == [
+        IPv4Address('192.0.2.10'),
+        IPv4Address('192.0.2.11'),
+    ]
+    assert fake.menus['/system note'] == {
+        'note': 'Offline router',
+        'show-at-login': 'true',
+    }
+    assert 'system note changed' in offline_router.history_system_get()
+
+
+def test_fake_print_formats(offline_router):
+    table = list(offline_router.iter_print('/ip service'))
+    terse = list(offline_router.iter_print('/ip service', 'terse'))
+    detail = list(offline_router.iter_print('/ip service', 'detail'))
+
+    assert table == terse == detail
+    assert table[4].flags == 'X'
+    assert table[5].values == {'name': 'api', 'port': 8728, 'address': None}
+    assert offline_router.cmd('/system identity print') == 'name: MikroTik'
+
+
+def test_fake_pipeline(offline_router, fake):
+    fake.reset_stats()
+    outputs = offline_router.cmd_pipeline(
+        '/system identity print', '/system note print'
+    )
+    assert [output.output.splitlines()[0] for output in outputs] == [
+        'name: MikroTik',
+        'note: ',
+    ]
+    assert fake.round_trips == 1
+
+
+def test_fake_errors(offline_router):
+    assert offline_router.cmd('/routing print').startswith(
+        'bad command name routing'
+    )
+    assert offline_router.cmd('return [/system identity get model]') == (
+        'input does not match any value of value-name'
+    )
+
+
+def test_fake_latency():
+    fake = FakeRouter(latency=0.02, jitter=0.005, seed=1)
+    router = RouterOS('192.0.2.1', 'netmikro', 'secret', transport=fake)
+    start = time.perf_counter()
+    router.clock_time_zone_get()
+    router.clock_dst_active_get()
+    assert time.perf_counter() - start >= 0.03  # noqa: PLR2004
+    assert fake.round_trips == 2  # noqa: PLR2004
+
+
+def test_fake_gather_runs_getters_on_parallel_channels():
+    names = [
+        'health_temperature',
+        'ntp_client_get',
+        'clock_time_zone_get',
+        'clock_gmt_offset_get',
+    ]
+    fake = FakeRouter(latency=0.1)
+    router = RouterOS(
+        '192.0.2.1', 'netmikro', 'secret', transport=fake, channels=4
+    )
+    start = time.perf_counter()
+    values = router.gather(*names, 'identity')
+    elapsed = time.perf_counter() - start
+
+    assert list(values) == [*names, 'identity']
+    assert values['ntp_client_get'].mode == 'unicast'
+    assert values['identity'] == 'MikroTik'
+    # The five commands overlap instead of taking 0.5s one after another
+    assert elapsed < 0.3  # noqa: PLR2004
+    assert fake.round_trips == 5  # noqa: PLR2004
+
+
+def test_fake_channels_only_run_reads():
+    fake = FakeRouter(latency=0.05)
+    router = RouterOS(
+        '192.0.2.1', 'netmikro', 'secret', transport=fake, channels=4
+    )
+    with ThreadPoolExecutor(2) as executor:
+        start = time.perf_counter()
+        executor.submit(router.identity_set, 'First')
+        executor.submit(router.note_set, 'Second')
+    # Changes wait for the terminal, one after the other
+    assert time.perf_counter() - start >= 0.1  # noqa: PLR2004
+    assert fake.menus['/system note']['note'] == 'Second'
+
+
+def test_fake_gather_without_channels_is_serial():
+    fake = FakeRouter(latency=0.05)
+    router = RouterOS('192.0.2.1', 'netmikro', 'secret', transport=fake)
+    start = time.perf_counter()
+    router.gather('health_temperature', 'clock_time_zone_get')
+    assert time.perf_counter() - start >= 0.1  # noqa: PLR2004
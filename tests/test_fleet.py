@@ -0,0 +1,156 @@
+import os
+import time
+
+import pytest
+from dotenv import load_dotenv
+from pydantic import ValidationError
+
+from netmikro import RouterFleet, ShardedFleet, shards
+from netmikro.transports import FakeRouter
+
+load_dotenv()
+
+
+def test_fleet_returns_error_per_router():
+    fleet = RouterFleet([
+        {
+            'host': '192.168.3.4',
+            'username': 'netmikro',
+            'password': 'nulliusinverba',
+            'ssh_port': -1,
+        },
+        {
+            'host': '192.168.3.5',
+            'username': 'netmikro',
+            'password': 'nulliusinverba',
+            'ssh_port': 80000,
+        },
+    ])
+
+    results = list(fleet.run('cmd', '/system identity print'))
+
+    assert sorted(result.host for result in results) == fleet.hosts
+    for result in results:
+        assert not result.ok
+        assert isinstance(result.error, ValidationError)
+
+
+def test_fleet_cmd(router):
+    device = {
+        'host': os.getenv('HOST_ROUTER'),
+        'username': os.getenv('USERNAME_ROUTER'),
+        'password': os.getenv('PASSWORD_ROUTER'),
+        'ssh_port': int(os.getenv('SSH_PORT')),
+        'delay': 1,
+    }
+    with RouterFleet([device]) as fleet:
+        (result,) = fleet.cmd('/system identity print')
+
+    assert result.ok
+    assert result.value == 'name: ' + os.getenv('IDENTITY')
+
+
+def test_fleet_keys_routers_by_host_port_and_username():
+    first, second = FakeRouter(), FakeRouter()
+    second.menus['/system identity']['name'] = 'Second'
+    inventory = [
+        {
+            'host': '192.0.2.1',
+            'username': 'netmikro',
+            'password': 'nulliusinverba',
+            'transport': first,
+            'api_port': 8728,
+        },
+        {
+            'host': '192.0.2.1',
+            'username': 'netmikro',
+            'password': 'nulliusinverba',
+            'transport': second,
+            'api_port': 18728,
+        },
+    ]
+
+    with RouterFleet(inventory) as fleet:
+        results = {result.key: result.value for result in fleet.run(_identity)}
+
+    assert results == {
+        ('192.0.2.1', 8728, 'netmikro'): 'MikroTik',
+        ('192.0.2.1', 18728, 'netmikro'): 'Second',
+    }
+
+
+def _identity(router):
+    return router.identity
+
+
+def test_sharded_fleet_runs_on_every_shard():
+    inventory = [
+        {
+            'host': f'192.0.2.{index}',
+            'username': 'netmikro',
+            'password': 'nulliusinverba',
+            'transport': 'fake',
+        }
+        for index in range(1, 6)
+    ] + [
+        {
+            'host': '192.0.2.9',
+            'username': 'netmikro',
+            'password': 'x',
+            'ssh_port': -1,
+        }
+    ]
+
+    with ShardedFleet(inventory, processes=2) as fleet:
+        results = list(fleet.run(_identity))
+        dataset = fleet.dataset()
+        # Stopping early leaves the workers ready for the next operation
+        next(fleet.cmd('/system identity print'))
+        (first, *_) = list(fleet.run('clock_time_zone_get'))
+
+    assert sorted(result.host for result in results) == fleet.hosts
+    assert {result.value for result in results if result.ok} == {'MikroTik'}
+    assert [result.host for result in results if not result.ok] == [
+        '192.0.2.9'
+    ]
+    assert sorted(dataset.hosts) == fleet.hosts[:-1]
+    assert dataset.count_by('resources.version') == {'7.12 (stable)': 5}
+    assert first.host in fleet.hosts
+
+
+def _stuck(router):
+    time.sleep(60)
+
+
+FAKE_INVENTORY = [
+    {
+        'host': f'192.0.2.{index}',
+        'username': 'netmikro',
+        'password': 'nulliusinverba',
+        'transport': 'fake',
+    }
+    for index in range(1, 3)
+]
+
+
+def test_sharded_fleet_one_operation_at_a_time():
+    with ShardedFleet(FAKE_INVENTORY, processes=2) as fleet:
+        results = fleet.run(_identity)
+        next(results)
+        with pytest.raises(RuntimeError, match='Another operation'):
+            next(fleet.run(_identity))
+
+        results.close()
+        assert len(list(fleet.run(_identity))) == 2  # noqa: PLR2004
+
+
+def test_sharded_fleet_close_terminates_stuck_workers(monkeypatch):
+    monkeypatch.setattr(shards, '_JOIN_TIMEOUT', 0.2)
+    fleet = ShardedFleet(FAKE_INVENTORY, processes=1)
+    process, connection = fleet._workers[0]
+    connection.send(('run', (_stuck,), {}))
+
+    started = time.monotonic()
+    fleet.close()
+    assert time.monotonic() - started < 10  # noqa: PLR2004
+    assert not process.is_alive()
@@ -0,0 +1,131 @@
+import pytest
+
+from netmikro import CommandEvent, MetricsCollector, RouterOS
+from netmikro.transports import FakeRouter
+from netmikro.utils import command_path
+
+
+@pytest.fixture
+def events():
+    return []
+
+
+@pytest.fixture
+def instrumented(events):
+    fake = FakeRouter(latency=0.01)
+    router = RouterOS(
+        '192.0.2.1',
+        'netmikro',
+        'secret',
+        transport=fake,
+        hooks=[events.append],
+    )
+    yield router
+    router.disconnect()
+
+
+def test_command_path():
+    assert command_path('/system/license/get features') == '/system license'
+    assert command_path('/ip service set api port=8728') == '/ip service'
+    assert command_path(':put 1') == ':put'
+
+
+def test_hooks_receive_connect_and_commands(instrumented, events):
+    instrumented.ntp_client_get()
+
+    connect, command = events
+    assert connect.phase == 'connect'
+    assert connect.transport == 'FakeRouter'
+    assert command.phase == 'command'
+    assert command.host == '192.0.2.1'
+    assert command.path == '/system ntp client'
+    assert command.bytes_sent == len(command.command)
+    assert command.bytes_received > 0
+    assert command.wait >= 0.01  # noqa: PLR2004
+    assert command.elapsed == pytest.approx(
+        command.wait + command.transfer + command.idle
+    )
+    assert command.error is None
+
+
+def test_hooks_receive_streams(instrumented, events):
+    rows = instrumented.iter_print('/ip service', 'terse')
+    next(rows)
+    rows.close()
+
+    assert events[-1].phase == 'stream'
+    assert events[-1].path == '/ip service'
+
+
+def test_hooks_receive_errors(instrumented, events):
+    instrumented._connection.disconnect()
+    # Reads are repeated on the new connection
+    assert instrumented.identity == 'MikroTik'
+
+    failed, reconnect, command = events[1:]
+    assert isinstance(failed.error, ConnectionError)
+    assert reconnect.phase == 'reconnect'
+    assert command.error is None
+
+
+def test_hooks_measure_each_channel_apart():
+    names = ['identity', 'note', 'clock_time_zone_get', 'ntp_server_get']
+
+    def measured(channels):
+        events = []
+        router = RouterOS(
+            '192.0.2.1',
+            'netmikro',
+            'secret',
+            transport=FakeRouter(latency=0.05),
+            hooks=[events.append],
+            channels=channels,
+            delay='auto',
+        )
+        router.gather(*names)
+        router.disconnect()
+        return {
+            event.command: (event.bytes_sent, event.bytes_received)
+            for event in events
+            if event.phase == 'command'
+        }
+
+    serial, parallel = measured(1), measured(4)
+    assert len(serial) == len(names)
+    # Each command counts its own data only, as when run one at a time
+    assert parallel == serial
+    assert all(sent == len(command) for command, (sent, _) in serial.items())
+
+
+def test_metrics_collector():
+    metrics = MetricsCollector()
+    event = CommandEvent(
+        '192.0.2.1',
+        'ssh',
+        'command',
+        '/ip service',
+        '',
+        0.5,
+        0.2,
+        0.1,
+        0.2,
+        10,
+        100,
+    )
+    metrics(event)
+    metrics(event._replace(error=OSError()))
+
+    assert metrics.summary() == {
+        ('192.0.2.1', '/ip service', 'command'): {
+            'count': 2,
+            'errors': 1,
+            'elapsed': 1.0,
+            'wait': 0.4,
+            'transfer': 0.2,
+            'idle': 0.4,
+            'bytes_sent': 20,
+            'bytes_received': 200,
+        }
+    }
+    metrics.clear()
+    assert metrics.summary() == {}
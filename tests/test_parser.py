@@ -0,0 +1,133 @@
+from netmikro.utils import PrintParser, Row, typed_value
+
+HISTORY = """\
+Flags: U - UNDOABLE
+Columns: ACTION, BY, POLICY
+  ACTION                        BY    POLICY
+U ntp settings changed          hick  write
+  ip service changed            hick  write
+"""
+
+ADDRESSES = """\
+ #   ADDRESS            NETWORK         INTERFACE
+ 0   192.168.88.1/24    192.168.88.0    bridge
+ ;;; uplink
+ 1 D 10.0.0.5/24        10.0.0.0        ether1
+"""
+
+DETAIL = """\
+Flags: X - disabled, I - invalid; D - dynamic
+ 0   address=192.168.88.1/24 network=192.168.88.0 interface=bridge
+     actual-interface=bridge
+
+ 1 X ;;; uplink
+     address=10.0.0.5/24 comment="a \\"quoted\\" word" disabled=yes
+"""
+
+RESOURCE = """\
+                   uptime: 1d2h
+                  version: 7.12 (stable)
+              free-memory: 1024
+"""
+
+
+def test_typed_value():
+    assert typed_value('1500') == 1500  # noqa: PLR2004
+    assert typed_value('yes') is True
+    assert typed_value('false') is False
+    assert typed_value('') is None
+    assert typed_value('ether1') == 'ether1'
+
+
+def test_parse_table_with_columns():
+    parser = PrintParser(HISTORY.splitlines())
+
+    assert list(parser) == [
+        Row(
+            None,
+            'U',
+            None,
+            {
+                'action': 'ntp settings changed',
+                'by': 'hick',
+                'policy': 'write',
+            },
+        ),
+        Row(
+            None,
+            '',
+            None,
+            {'action': 'ip service changed', 'by': 'hick', 'policy': 'write'},
+        ),
+    ]
+    assert parser.flags == {'U': 'UNDOABLE'}
+    assert parser.columns == ['ACTION', 'BY', 'POLICY']
+
+
+def test_parse_table_without_columns():
+    rows = list(PrintParser(ADDRESSES.splitlines()))
+
+    assert [(row.index, row.flags, row.comment) for row in rows] == [
+        (0, '', None),
+        (1, 'D', 'uplink'),
+    ]
+    assert rows[1].values == {
+        'address': '10.0.0.5/24',
+        'network': '10.0.0.0',
+        'interface': 'ether1',
+    }
+
+
+def test_parse_detail():
+    parser = PrintParser(DETAIL.splitlines())
+    rows = list(parser)
+
+    assert rows[0] == Row(
+        0,
+        '',
+        None,
+        {
+            'address': '192.168.88.1/24',
+            'network': '192.168.88.0',
+            'interface': 'bridge',
+            'actual-interface': 'bridge',
+        },
+    )
+    assert rows[1] == Row(
+        1,
+        'X',
+        'uplink',
+        {
+            'address': '10.0.0.5/24',
+            'comment': 'a "quoted" word',
+            'disabled': True,
+        },
+    )
+    assert parser.flags == {'X': 'disabled', 'I': 'invalid', 'D': 'dynamic'}
+
+
+def test_parse_terse_keeps_strings():
+    lines = ['0   name=ether1 mtu=1500', '1 X name=ether2 mtu=1500']
+    rows = list(PrintParser(lines, convert=str))
+
+    assert rows[1] == Row(1, 'X', None, {'name': 'ether2', 'mtu': '1500'})
+
+
+def test_parse_properties():
+    assert list(PrintParser(RESOURCE.splitlines())) == [
+        Row(
+            None,
+            '',
+            None,
+            {
+                'uptime': '1d2h',
+                'version': '7.12 (stable)',
+                'free-memory': 1024,
+            },
+        )
+    ]
+
+
+def test_parse_generator_in_one_pass():
+    lines = (f'{i:>5} D name=vlan{i}' for i in range(1000))
+    assert sum(1 for _ in PrintParser(lines)) == 1000  # noqa: PLR2004
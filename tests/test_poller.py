@@ -0,0 +1,143 @@
+import pytest
+
+from netmikro import HealthPoller, RouterFleet
+from netmikro.transports import FakeRouter
+from netmikro.utils import Aggregate, RingBuffer
+
+
+def test_ring_buffer_overwrites_oldest():
+    series = RingBuffer(3)
+    for timestamp, value in enumerate([5.0, 1.0, 4.0, 2.0, 3.0]):
+        series.append(value, timestamp)
+
+    assert len(series) == 3  # noqa: PLR2004
+    assert list(series) == [(2.0, 4.0), (3.0, 2.0), (4.0, 3.0)]
+    assert series.last() == (4.0, 3.0)
+    assert series.window(1.5, now=4.0).tolist() == [2.0, 3.0]
+    assert series.aggregate() == Aggregate(3, 2.0, 4.0, 3.0, 4.0)
+    assert series.aggregate(0.5, now=10.0) is None
+
+    copy = series.copy()
+    series.append(9.0, 5.0)
+    assert list(copy) == [(2.0, 4.0), (3.0, 2.0), (4.0, 3.0)]
+
+    with pytest.raises(ValueError, match='at least 1'):
+        RingBuffer(0)
+
+
+def test_health_sample_in_one_round_trip(offline_router, fake):
+    offline_router.routerboard  # noqa: B018
+    fake.reset_stats()
+    sample = offline_router.health_sample(['ether1'])
+
+    assert fake.round_trips == 1
+    assert sample == {
+        'cpu_load': 2.0,
+        'memory_used': 39.26,
+        'voltage': 24.1,
+        'temperature': 37.0,
+        'ether1.rx-byte': 0.0,
+        'ether1.tx-byte': 0.0,
+    }
+
+
+def test_health_poller_stores_rates(monkeypatch):
+    fake = FakeRouter()
+    fleet = RouterFleet([
+        {
+            'host': '192.0.2.1',
+            'username': 'netmikro',
+            'password': 'nulliusinverba',
+            'transport': fake,
+        }
+    ])
+    clock = iter([100.0, 110.0, 120.0])
+    monkeypatch.setattr('netmikro.poller.time.time', lambda: next(clock))
+
+    poller = HealthPoller(fleet, size=10, interfaces=['ether1'])
+    assert poller.poll() == []
+    fake.menus['/interface'][0]['rx-byte'] = '12500'
+    fake.menus['/system resource']['cpu-load'] = '10'
+    assert poller.poll() == []
+    fleet.disconnect()
+
+    assert poller.series('192.0.2.1', 'ether1.rx-bps').last() == (
+        110.0,
+        10000.0,
+    )
+    assert poller.aggregate('192.0.2.1', 'cpu_load') == Aggregate(
+        2, 2.0, 10.0, 6.0, 10.0
+    )
+    assert 'ether1.rx-byte' not in poller.metrics('192.0.2.1')
+    key = ('192.0.2.1', 22, 'netmikro')
+    assert poller.summary()[key, 'voltage'].count == 2  # noqa: PLR2004
+
+
+def test_health_poller_records_errors():
+    fleet = RouterFleet([
+        {
+            'host': '192.0.2.1',
+            'username': 'netmikro',
+            'password': 'nulliusinverba',
+            'transport': FakeRouter(menus={}),
+        }
+    ])
+    with HealthPoller(fleet, interval=60) as poller:
+        pass
+
+    assert ('192.0.2.1', 22, 'netmikro') in poller.errors
+    assert poller.summary() == {}
+
+
+def test_health_poller_series_is_a_copy():
+    fleet = RouterFleet([
+        {
+            'host': '192.0.2.1',
+            'username': 'netmikro',
+            'password': 'nulliusinverba',
+            'transport': FakeRouter(),
+        }
+    ])
+    poller = HealthPoller(fleet)
+    poller.poll()
+    series = poller.series('192.0.2.1', 'cpu_load')
+    errors = poller.errors
+    poller.poll()
+    fleet.disconnect()
+
+    assert len(series) == 1
+    assert len(poller.series('192.0.2.1', 'cpu_load')) == 2  # noqa: PLR2004
+    assert poller.series('192.0.2.1', 'unknown') is None
+    assert errors == {}
+    assert errors is not poller.errors
+
+
+def test_health_poller_routers_behind_one_address(monkeypatch):
+    fakes = [FakeRouter(), FakeRouter()]
+    fleet = RouterFleet([
+        {
+            'host': '192.0.2.1',
+            'username': 'netmikro',
+            'password': 'nulliusinverba',
+            'ssh_port': 2201 + index,
+            'transport': fake,
+        }
+        for index, fake in enumerate(fakes)
+    ])
+    clock = iter([100.0, 100.0, 110.0, 110.0])
+    monkeypatch.setattr('netmikro.poller.time.time', lambda: next(clock))
+
+    poller = HealthPoller(fleet, interfaces=['ether1'])
+    fakes[0].menus['/interface'][0]['rx-byte'] = '1000'
+    poller.poll()
+    fakes[0].menus['/interface'][0]['rx-byte'] = '13500'
+    fakes[1].menus['/interface'][0]['rx-byte'] = '1250'
+    poller.poll()
+    fleet.disconnect()
+
+    first, second = fleet.keys
+    assert poller.series(first, 'ether1.rx-bps').last() == (110.0, 10000.0)
+    assert poller.series(second, 'ether1.rx-bps').last() == (110.0, 1000.0)
+    assert len(poller.series(second, 'cpu_load')) == 2  # noqa: PLR2004
+    with pytest.raises(ValueError, match='host of 2 routers'):
+        poller.metrics('192.0.2.1')
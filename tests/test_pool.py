@@ -0,0 +1,113 @@
+import pytest
+
+from netmikro import ConnectionPool, RouterOS
+from netmikro.transports import register_transport
+
+
+class DummyConnection:
+    """Connection that answers every command with the number of its calls."""
+
+    opened = 0
+
+    def __init__(self, auth):
+        DummyConnection.opened += 1
+        self.alive = True
+        self.calls = 0
+
+    def send_command(self, command_string, expect_string=None, **kwargs):
+        if not self.alive:
+            raise OSError('Socket is closed')
+        self.calls += 1
+        return str(self.calls)
+
+    def send_multiline(self, commands, **kwargs):
+        return '\n'.join(self.send_command(command) for command in commands)
+
+    def is_alive(self):
+        return self.alive
+
+    def disconnect(self):
+        self.alive = False
+
+
+register_transport('dummy', DummyConnection)
+
+
+@pytest.fixture
+def pool():
+    DummyConnection.opened = 0
+    with ConnectionPool() as pool:
+        yield pool
+
+
+def connect(pool):
+    return RouterOS(
+        host='192.168.3.4',
+        username='netmikro',
+        password='nulliusinverba',
+        transport='dummy',
+        pool=pool,
+    )
+
+
+def test_pool_reuses_connection(pool):
+    first = connect(pool)
+    connection = first._connection
+    first.disconnect()
+
+    second = connect(pool)
+    assert second._connection is connection
+    assert DummyConnection.opened == 1
+
+
+def test_pool_replaces_dead_connection(pool):
+    first = connect(pool)
+    connection = first._connection
+    first.disconnect()
+    connection.alive = False
+
+    second = connect(pool)
+    assert second._connection is not connection
+    assert DummyConnection.opened == 2  # noqa: PLR2004
+
+
+def test_pool_evicts_idle_connection():
+    DummyConnection.opened = 0
+    with ConnectionPool(max_idle=0) as pool:
+        router = connect(pool)
+        connection = router._connection
+        router.disconnect()
+        pool.evict()
+
+        assert not connection.alive
+        assert connect(pool)._connection is not connection
+
+
+def test_pool_disconnect_twice_releases_once(pool):
+    router = connect(pool)
+    router.disconnect()
+    router.disconnect()
+
+    first, second = connect(pool), connect(pool)
+    assert first._connection is not second._connection
+    with pytest.raises(ConnectionError, match='closed'):
+        router.cmd('/system identity print')
+
+
+def test_reconnect_repeats_reads(pool):
+    router = connect(pool)
+    router._connection.alive = False
+
+    assert router._get('/system identity get name') == '1'
+    assert DummyConnection.opened == 2  # noqa: PLR2004
+
+
+def test_reconnect_does_not_repeat_writes(pool):
+    router = connect(pool)
+    router._connection.alive = False
+
+    # The command may have reached the router before the link dropped
+    with pytest.raises(OSError, match='closed'):
+        router.cmd('/system identity set name=Netmikro')
+    assert DummyConnection.opened == 2  # noqa: PLR2004
+    assert router.cmd('/system identity print') == '1'
@@ -0,0 +1,101 @@
+import json
+import sys
+from datetime import time
+
+import pytest
+
+from netmikro import RouterFleet, RouterOS
+from netmikro.transports import FakeRouter
+
+
+def test_snapshot_in_two_round_trips(offline_router, fake):
+    fake.reset_stats()
+    snapshot = offline_router.snapshot()
+
+    assert fake.round_trips == 2  # noqa: PLR2004
+    assert snapshot.host == '192.0.2.1'
+    assert snapshot.routerboard.model == 'RB951Ui-2HnD'
+    assert snapshot.health.voltage == 24.1  # noqa: PLR2004
+    assert snapshot.clock.time_zone == 'America/Sao_Paulo'
+    assert snapshot.ntp_server.broadcast_address is None
+
+    # The lazy attributes are loaded by the snapshot
+    assert offline_router.resources == snapshot.resources
+    assert fake.round_trips == 2  # noqa: PLR2004
+
+
+def test_snapshot_of_chr_in_one_round_trip(offline_router, fake):
+    fake.menus['/system routerboard'] = {'routerboard': 'false'}
+    fake.reset_stats()
+    snapshot = offline_router.snapshot()
+
+    assert fake.round_trips == 1
+    assert snapshot.routerboard is None
+    assert snapshot.license is None
+    assert snapshot.health is None
+
+
+def test_snapshot_with_default_ntp_client(offline_router, fake):
+    fake.menus['/system ntp client'].update({
+        'enabled': 'false',
+        'servers': '',
+        'status': 'stopped',
+        'synced-server': '',
+        'synced-stratum': '0',
+    })
+    snapshot = offline_router.snapshot()
+
+    assert snapshot.ntp_client.servers == []
+    assert snapshot.ntp_client.synced_server is None
+    assert offline_router.ntp_client_get() == snapshot.ntp_client
+
+
+def fleet(size):
+    return RouterFleet(
+        {
+            'host': f'192.0.2.{index}',
+            'username': 'netmikro',
+            'password': 'nulliusinverba',
+            'transport': FakeRouter(),
+        }
+        for index in range(1, size + 1)
+    )
+
+
+def test_fleet_write_snapshots_ndjson(tmp_path):
+    path = tmp_path / 'inventory.ndjson'
+    with fleet(3) as routers:
+        failed = routers.write_snapshots(path)
+
+    assert failed == []
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert sorted(record['host'] for record in records) == [
+        '192.0.2.1',
+        '192.0.2.2',
+        '192.0.2.3',
+    ]
+
+
+def test_fleet_write_snapshots_parquet_requires_pyarrow(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, 'pyarrow', None)
+    with fleet(1) as routers, pytest.raises(ImportError, match='pyarrow'):
+        routers.write_snapshots(tmp_path / 'inventory.parquet')
+
+
+def test_trusted_snapshot_matches_validated(fake):
+    validated = RouterOS(
+        '192.0.2.1', 'netmikro', 'nulliusinverba', transport=fake
+    )
+    trusted = RouterOS(
+        '192.0.2.1',
+        'netmikro',
+        'nulliusinverba',
+        transport=fake,
+        trusted=True,
+    )
+
+    expected = validated.snapshot().model_dump(exclude={'collected_at'})
+    snapshot = trusted.snapshot()
+    assert snapshot.model_dump(exclude={'collected_at'}) == expected
+    assert snapshot.clock.time == time(12, 0)
+    assert trusted.service == validated.service
@@ -0,0 +1,278 @@
+import itertools
+import socket
+from threading import Thread
+from types import SimpleNamespace
+
+import pytest
+from netmiko.exceptions import ReadTimeout
+from paramiko import SSHException
+
+from netmikro import CommandOutput, RouterOS
+from netmikro.modules import base
+from netmikro.modules.base import (
+    BATCH_SEPARATOR,
+    batch_script,
+    batch_values,
+    join_groups,
+)
+from netmikro.modules.system import SNAPSHOT_COMMANDS
+from netmikro.transports import ApiConnection, SSHConnection
+from netmikro.transports.api import encode_sentence
+from netmikro.utils import ChannelMeter, PrintParser, Row
+
+
+class Channel:
+    """Replaces the SSH channel of an `SSHConnection` with canned chunks."""
+
+    def __init__(self, connection, chunks):
+        self.chunks = list(chunks)
+        self.written = []
+        connection.RETURN = '\n'
+        connection.read_channel = self.read
+        connection.write_channel = self.written.append
+        connection.read_until_pattern = lambda **kwargs: ''
+
+    def read(self):
+        return self.chunks.pop(0) if self.chunks else ''
+
+
+@pytest.fixture
+def ssh():
+    return SSHConnection.__new__(SSHConnection)
+
+
+def test_ssh_iter_lines(ssh):
+    Channel(
+        ssh,
+        [
+            '',
+            '[admin@Netmikro] > /ip route pri',
+            'nt terse without-paging\n 0  ADC  dst-address=192',
+            '.168.88.0/24 gateway=bridge\n 1  AS   dst-address=0.0.0.0/0',
+            ' gateway=10.0.0.1\n[admin@Netmikro] > ',
+        ],
+    )
+
+    lines = ssh.iter_lines('/ip route print terse without-paging')
+    assert list(PrintParser(lines)) == [
+        Row(
+            0,
+            'ADC',
+            None,
+            {'dst-address': '192.168.88.0/24', 'gateway': 'bridge'},
+        ),
+        Row(
+            1, 'AS', None, {'dst-address': '0.0.0.0/0', 'gateway': '10.0.0.1'}
+        ),
+    ]
+
+
+class ExecChannel:
+    """Stands in for a paramiko exec channel."""
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.command = None
+        self.closed = False
+
+    def settimeout(self, timeout):
+        pass
+
+    def exec_command(self, command):
+        self.command = command
+
+    def recv(self, size):
+        return self.chunks.pop(0) if self.chunks else b''
+
+    def close(self):
+        self.closed = True
+
+
+def test_ssh_exec_command_uses_a_new_channel(ssh):
+    channel = ExecChannel([b'name: Netmi', b'kro\r\n'])
+    transport = SimpleNamespace(open_session=lambda timeout: channel)
+    ssh.remote_conn_pre = SimpleNamespace(get_transport=lambda: transport)
+    ssh.meter = ChannelMeter()
+
+    assert ssh.exec_command('/system identity print') == 'name: Netmikro'
+    assert channel.command == '/system identity print'
+    assert channel.closed
+    assert ssh.meter.bytes_received == 16  # noqa: PLR2004
+
+    # A meter of its own keeps the data of the channel apart
+    meter = ChannelMeter()
+    channel.chunks = [b'name: Netmikro\r\n']
+    ssh.exec_command('/system identity print', meter=meter)
+    assert meter.bytes_received == 16  # noqa: PLR2004
+    assert ssh.meter.bytes_received == 16  # noqa: PLR2004
+
+
+def test_ssh_exec_command_channel_timeout(ssh):
+    def open_session(timeout):
+        raise SSHException('Timeout opening channel.')
+
+    transport = SimpleNamespace(
+        open_session=open_session, is_active=lambda: True
+    )
+    ssh.remote_conn_pre = SimpleNamespace(get_transport=lambda: transport)
+
+    with pytest.raises(ReadTimeout, match='opening a channel'):
+        ssh.exec_command('/system identity print', meter=ChannelMeter())
+
+
+def test_ssh_send_command_skips_wrapped_echo(ssh):
+    commands = join_groups(SNAPSHOT_COMMANDS)
+    script = batch_script(commands)
+    assert len(script) > 511  # noqa: PLR2004
+    values = [str(index) for index in range(len(commands))]
+    echo = f'[admin@MikroTik] > {script}'
+    # Wrapped by a terminal 511 columns wide
+    wrapped = [echo[start : start + 511] for start in range(0, len(echo), 511)]
+
+    ssh._sentinels = itertools.count(3)
+    Channel(
+        ssh,
+        [
+            '',
+            '\n'.join(wrapped) + '\n',
+            BATCH_SEPARATOR.join(values) + '\n',
+            '[admin@MikroTik] > :put ("<net" . "mikro:end:3>")\n',
+            '<netmikro:end:3>\n[admin@MikroTik] > ',
+        ],
+    )
+
+    output = ssh.send_command(script)
+    assert batch_values(dict.fromkeys(commands, ''), output) == dict(
+        zip(commands, values)
+    )
+
+
+def test_ssh_send_command_waits_for_sentinel(ssh):
+    ssh._sentinels = itertools.count(7)
+    channel = Channel(
+        ssh,
+        [
+            '[admin@MikroTik] > /system identity set name=Core\n',
+            '[admin@Core] > :put ("<net" . "mikro:end:7>")\n',
+            '<netmikro:end:7>\n[admin@Core] > ',
+        ],
+    )
+
+    # The prompt changed with the identity, the sentinel still ends it
+    assert not ssh.send_command('/system identity set name=Core')
+    assert channel.written == [
+        '/system identity set name=Core\n:put ("<net" . "mikro:end:7>")\n'
+    ]
+
+
+def test_ssh_iter_lines_stopped_early(ssh):
+    channel = Channel(
+        ssh,
+        [
+            '',
+            '[admin@Netmikro] > /ip route print\n',
+            ' 0  ADC  dst-address=192.168.88.0/24\n',
+            ' 1  AS   dst-address=0.0.0.0/0\n',
+        ],
+    )
+
+    lines = ssh.iter_lines('/ip route print')
+    assert next(lines) == ' 0  ADC  dst-address=192.168.88.0/24'
+    lines.close()
+    assert channel.written[-1] == '\x03'
+
+
+def test_api_iter_talk_stopped_early():
+    client, server = socket.socketpair()
+    reply = [('!re', f'=name=vlan{i}') for i in range(10)] + [('!done',)]
+    replies = b''.join(encode_sentence(*sentence) for sentence in reply)
+    identity = encode_sentence('!re', '=name=Netmikro') + encode_sentence(
+        '!done'
+    )
+
+    def serve():
+        connection = ApiConnection(server)
+        connection.read_sentence()
+        server.sendall(replies)
+        connection.read_sentence()
+        server.sendall(identity)
+
+    Thread(target=serve, daemon=True).start()
+    connection = ApiConnection(client)
+
+    replies_iterator = connection.iter_talk('/interface/vlan/print')
+    assert next(replies_iterator) == {'name': 'vlan0'}
+    replies_iterator.close()
+
+    assert connection.talk('/system/identity/print') == [{'name': 'Netmikro'}]
+
+
+def test_cmd_pipeline(ssh):
+    channel = Channel(
+        ssh,
+        [
+            '',
+            '[admin@Netmikro] > /system identity print\n',
+            '[admin@Netmikro] > :put ("<net" . "mikro:0>")\nname: Netmikro\n',
+            '<netmikro:0>\n[admin@Netmikro] > ',
+            '/system note set note=test\n[admin@Netmikro] > ',
+            ':put ("<net" . "mikro:1>")\n<netmikro:1>\n[admin@Netmikro] > ',
+        ],
+    )
+    router = RouterOS(
+        '192.0.2.1', 'netmikro', 'nulliusinverba', transport=lambda auth: ssh
+    )
+
+    outputs = router.cmd_pipeline(
+        '/system identity print',
+        '/system note set note=test',
+    )
+
+    assert channel.written[-1].count('\n') == 4  # noqa: PLR2004
+    assert [output[:2] for output in outputs] == [
+        ('/system identity print', 'name: Netmikro'),
+        ('/system note set note=test', ''),
+    ]
+    assert all(isinstance(output, CommandOutput) for output in outputs)
+
+
+def test_router_cmd_pipeline(router):
+    outputs = router.cmd_pipeline(
+        '/system identity print',
+        '/system note print',
+    )
+
+    assert outputs[0].output == router.cmd('/system identity print')
+    assert outputs[1].output == router.cmd('/system note print')
+
+
+def test_router_iter_print(router):
+    rows = list(router.iter_print('/ip service', 'terse'))
+    assert {row.values['name'] for row in rows} >= {'api', 'ssh', 'www'}
+
+
+def test_router_cmd_stream(router):
+    lines = list(router.cmd_stream('/system identity print'))
+    assert lines == [router.cmd('/system identity print')]
+
+
+def test_open_stream_holds_the_connection(offline_router, monkeypatch):
+    monkeypatch.setattr(base, 'LOCK_TIMEOUT', 0.01)
+    lines = offline_router.cmd_stream('/ip service print terse')
+    next(lines)
+
+    errors = []
+
+    def read():
+        try:
+            offline_router.cmd('/system identity print')
+        except TimeoutError as error:
+            errors.append(error)
+
+    thread = Thread(target=read)
+    thread.start()
+    thread.join()
+    assert len(errors) == 1
+
+    lines.close()
+    assert offline_router.cmd('/system identity print') == 'name: MikroTik'
@@ -110,9 +110,15 @@ def test_system_note_set(router):
     test_string = 'test test'
     router.note_set(note=test_string, show_at_login=True)
     assert router._get('/system note get note') == test_string
+    assert router.note == test_string
     assert boolean(router._get('/system note get show-at-login'))
     router.note_set(note=os.getenv('NOTE'), show_at_login=False)
 
 
 def test_system_is_routerboard_false(chr_router):
     assert not chr_router.is_routerboard()
+
+
+def test_system_routerboard_none_if_not_routerboard(chr_router):
+    assert chr_router.routerboard is None
+    assert chr_router.license is None
@@ -0,0 +1,81 @@
+import pytest
+
+from netmikro import RouterOS
+from netmikro.transports import FakeConnection, FakeRouter
+from netmikro.utils import AdaptiveTiming
+
+
+class SlowRouter(FakeRouter):
+    """Simulated router whose connections record the options they get."""
+
+    def __call__(self, auth):
+        connection = RecordingConnection(self, auth.username)
+        connection.global_delay_factor = 1
+        return connection
+
+
+class RecordingConnection(FakeConnection):
+    timeout = False
+
+    def send_command(self, command_string, expect_string=None, **kwargs):
+        self.options = {'expect_string': expect_string, **kwargs}
+        if self.timeout:
+            raise TimeoutError
+        return super().send_command(command_string)
+
+
+def test_adaptive_timing_smooths_samples():
+    timing = AdaptiveTiming()
+    assert timing.read_timeout() == 10  # noqa: PLR2004
+
+    timing.observe(elapsed=5)
+    timing.observe(elapsed=5)
+    assert timing.elapsed == pytest.approx(5)
+    assert timing.read_timeout() == pytest.approx(12.5)
+
+
+def test_adaptive_timing_backoff():
+    timing = AdaptiveTiming(max_timeout=30)
+    timing.backoff()
+    assert timing.read_timeout() == 20  # noqa: PLR2004
+    timing.backoff()
+    assert timing.read_timeout() == 30  # noqa: PLR2004
+
+    timing.observe(elapsed=0.01)
+    assert timing.read_timeout() == 20  # noqa: PLR2004
+
+
+def test_auto_delay_tunes_connection():
+    router = RouterOS(
+        '192.0.2.1',
+        'netmikro',
+        'secret',
+        delay='auto',
+        transport=SlowRouter(latency=0.01),
+    )
+    connection = router._connection
+
+    # Nothing is sent when connecting
+    assert router._timing.elapsed is None
+    # Only the read timeout is tuned, the delay factor is left as it is
+    assert connection.global_delay_factor == 1
+
+    router.clock_time_zone_get()
+    assert connection.options == {
+        'expect_string': None,
+        'read_timeout': 10.0,
+    }
+
+
+def test_auto_delay_backs_off_on_timeout():
+    router = RouterOS(
+        '192.0.2.1',
+        'netmikro',
+        'secret',
+        delay='auto',
+        transport=SlowRouter(),
+    )
+    router._connection.timeout = True
+    with pytest.raises(TimeoutError):
+        router.clock_time_zone_get()
+    assert router._timing.read_timeout() == 20  # noqa: PLR2004
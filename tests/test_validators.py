@@ -1,9 +1,11 @@
+from ipaddress import IPv4Address
+
 import pytest
 from pydantic import ValidationError
 
 from netmikro import RouterOS
 from netmikro.exceptions import UndefinedBooleanValue
-from netmikro.utils import boolean
+from netmikro.utils import boolean, decimal, ip_address, ip_list, number
 
 
 def test_convert_to_boolean():
@@ -17,6 +19,23 @@ def test_convert_to_boolean():
         boolean('test')
 
 
+def test_convert_to_number():
+    assert number(' 42 ') == 42  # noqa: PLR2004
+    assert number('') == 0
+    assert decimal('24.5') == 24.5  # noqa: PLR2004
+    assert decimal('') == 0.0
+
+
+def test_convert_to_ips():
+    assert ip_list('200.160.7.186;201.49.148.135') == [
+        IPv4Address('200.160.7.186'),
+        IPv4Address('201.49.148.135'),
+    ]
+    assert ip_list('') == []
+    assert ip_address('200.160.7.186') == IPv4Address('200.160.7.186')
+    assert ip_address('') is None
+
+
 def test_create_connection_with_str_port():
     with pytest.raises(
         ValidationError,